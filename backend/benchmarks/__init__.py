@@ -0,0 +1,4 @@
+"""
+Standalone performance benchmarks, run from the backend directory, e.g.
+``python -m benchmarks.event_loop_latency``.
+"""
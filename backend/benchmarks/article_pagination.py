@@ -0,0 +1,126 @@
+"""
+Keyset vs offset pagination over a large ``articles`` collection.
+
+Seeds a throwaway database with synthetic articles (published dates with
+microsecond precision, many sharing a timestamp), then for several page
+depths times ``ArticleStore.page`` (keyset on published_date, _id) against
+the equivalent ``skip``/``limit`` query, and walks consecutive pages to
+check that no article is returned twice.
+
+Needs MONGODB_URI (and the other required settings) in the environment
+or .env. Usage (from the backend directory):
+    python -m benchmarks.article_pagination
+    python -m benchmarks.article_pagination --articles 200000 --walk 500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import database
+from services.article_store import ArticleStore
+from services.pagination import decode_cursor, encode_cursor, keyset_sort
+
+BATCH = 10_000
+
+
+async def seed(store: ArticleStore, count: int):
+    """Insert ``count`` synthetic articles through the store's document layout."""
+    collection = store._collection()
+    await collection.drop()
+    await store.ensure_indexes()
+    rng = random.Random(0)
+    start = datetime(2026, 1, 1)
+    for offset in range(0, count, BATCH):
+        docs = []
+        for i in range(offset, min(count, offset + BATCH)):
+            # Coarse timestamps so many articles tie on published_date
+            published = start + timedelta(seconds=rng.randrange(count // 4 or 1), microseconds=rng.randrange(1_000_000))
+            article = {
+                "url": f"https://example.com/{i:08d}",
+                "title": f"Article {i}",
+                "source": f"Source {i % 50}",
+                "published_date": published.isoformat() if i % 100 else None,
+            }
+            docs.append({**store._to_document(article), "_id": article["url"]})
+        await collection.insert_many(docs, ordered=False)
+    print(f"Seeded {count} articles")
+
+
+def timed(samples: List[float]) -> str:
+    return f"{statistics.median(samples):8.1f} ms"
+
+
+async def compare_depths(store: ArticleStore, count: int, limit: int, repeats: int):
+    """Time the page starting at several depths, by keyset and by offset."""
+    collection = store._collection()
+    print(f"{'depth':>10}{'keyset':>14}{'skip/limit':>14}")
+    for depth in (0, count // 100, count // 10, count // 2, count - limit):
+        after = None
+        if depth:
+            # Key of the item just before the page, found once (not timed)
+            cursor = collection.find({}, {"published_date": 1}).sort(keyset_sort("published_date")).skip(depth - 1).limit(1)
+            previous = [doc async for doc in cursor][0]
+            after = decode_cursor(encode_cursor("published_date", previous.get("published_date"), previous["_id"]), "published_date")
+        
+        keyset, offset = [], []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            page, _ = await store.page(limit=limit, after=after)
+            keyset.append((time.perf_counter() - started) * 1000)
+            
+            started = time.perf_counter()
+            skipped = [doc async for doc in collection.find().sort(keyset_sort("published_date")).skip(depth).limit(limit)]
+            offset.append((time.perf_counter() - started) * 1000)
+        
+        same = [a["url"] for a in page] == [doc["_id"] for doc in skipped]
+        print(f"{depth:>10}{timed(keyset):>14}{timed(offset):>14}{'' if same else '  (pages differ!)'}")
+
+
+async def walk(store: ArticleStore, limit: int, pages: int) -> Dict:
+    """Follow cursors (encoded and decoded, as clients do) and count repeats."""
+    seen = set()
+    repeats = 0
+    after = None
+    started = time.perf_counter()
+    for _ in range(pages):
+        articles, next_key = await store.page(limit=limit, after=after)
+        for article in articles:
+            repeats += article["url"] in seen
+            seen.add(article["url"])
+        if not next_key:
+            break
+        after = decode_cursor(encode_cursor("published_date", *next_key), "published_date")
+    return {"articles": len(seen), "repeats": repeats, "seconds": round(time.perf_counter() - started, 2)}
+
+
+async def main(args: argparse.Namespace):
+    await database.connect_to_mongodb()
+    database.db = database.client[args.database]
+    store = ArticleStore()
+    try:
+        if not args.reuse:
+            await seed(store, args.articles)
+        await compare_depths(store, args.articles, args.limit, args.repeats)
+        result = await walk(store, args.limit, args.walk)
+        status = "OK" if result["repeats"] == 0 else "FAILED"
+        print(f"Walked {result['articles']} articles in {result['seconds']}s: {result['repeats']} repeats ({status})")
+    finally:
+        if not args.keep:
+            await store._collection().drop()
+        await database.close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=1_000_000, help="articles to seed")
+    parser.add_argument("--limit", type=int, default=50, help="page size")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per depth")
+    parser.add_argument("--walk", type=int, default=200, help="consecutive pages to walk")
+    parser.add_argument("--database", default="lighthouse_bench", help="throwaway database to use")
+    parser.add_argument("--reuse", action="store_true", help="reuse an already seeded collection")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded collection afterwards")
+    asyncio.run(main(parser.parse_args()))
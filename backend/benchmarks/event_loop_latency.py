@@ -0,0 +1,185 @@
+"""
+Event-loop latency during a full ``scrape_all_sources`` run.
+
+A probe task sleeps for a short interval in a loop and records how late it
+wakes up; anything blocking the loop (a synchronous download or a feed
+parse on the loop thread) shows up as lag. By default the sources are
+synthetic feeds served from a local aiohttp server, so runs are
+repeatable; ``--live`` scrapes the configured sources instead.
+
+Usage (from the backend directory):
+    python -m benchmarks.event_loop_latency
+    python -m benchmarks.event_loop_latency --sources 40 --entries 300
+    python -m benchmarks.event_loop_latency --live
+
+Each run is measured twice: with feeds parsed in the parse executor, and
+with the parse forced onto the event loop for comparison.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from aiohttp import web
+
+from scrapers import rss_scraper
+from scrapers.executor import shutdown_parse_executor
+from scrapers.http_client import close_http_client, start_http_client
+from services.trend_scraper_service import TrendScraperService
+
+_nonce = itertools.count()
+
+
+def synthetic_feed(entries: int, paragraphs: int) -> bytes:
+    """An RSS document with ``entries`` items of ``paragraphs`` paragraphs each."""
+    # A fresh nonce per response keeps the content-hash check from skipping the parse
+    nonce = next(_nonce)
+    body = "".join(
+        f"<p>Paragraph {p} of a long article body about model releases and benchmarks.</p>"
+        for p in range(paragraphs)
+    )
+    items = "".join(
+        f"<item><title>Article {i} ({nonce})</title>"
+        f"<link>http://127.0.0.1/article/{nonce}/{i}</link>"
+        f"<pubDate>Mon, 05 Oct 2026 10:{i % 60:02d}:00 GMT</pubDate>"
+        f"<description><![CDATA[{body}]]></description>"
+        f"<category>AI</category></item>"
+        for i in range(entries)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Bench</title>'
+        f"{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+async def serve_feeds(entries: int, paragraphs: int) -> web.AppRunner:
+    """Start a local server answering every ``/feed/{n}.xml`` with a synthetic feed."""
+    async def feed(request: web.Request) -> web.Response:
+        return web.Response(body=synthetic_feed(entries, paragraphs), content_type="application/rss+xml")
+    
+    app = web.Application()
+    app.router.add_get("/feed/{n}.xml", feed)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def sources_file(port: int, count: int) -> str:
+    """Write a sources config pointing at the local feeds; returns its path."""
+    config = {
+        "sources": [{
+            "category": "Benchmark",
+            "sources": [
+                {
+                    "name": f"Bench Feed {n}",
+                    "url": f"http://127.0.0.1:{port}/",
+                    "rss_feed": f"http://127.0.0.1:{port}/feed/{n}.xml",
+                    "scrape_enabled": True,
+                    "priority": "medium",
+                }
+                for n in range(count)
+            ],
+        }],
+        "scraping_config": {
+            "max_concurrent_sources": 8,
+            "per_host_rate_limit": {"requests_per_second": 1000, "burst": 1000},
+        },
+    }
+    handle = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    with handle:
+        json.dump(config, handle)
+    return handle.name
+
+
+async def probe_lag(stop: asyncio.Event, interval: float, samples: List[float]):
+    """Record how late each ``interval`` sleep wakes up, in milliseconds."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples) or [0.0]
+    return {
+        "samples": len(samples),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def measure(service: TrendScraperService, max_articles: int, interval: float) -> Dict:
+    """Scrape all sources once while probing the loop; returns lag stats."""
+    rss_scraper._parsed_feeds.clear()
+    samples: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(stop, interval, samples))
+    started = time.perf_counter()
+    articles = await service.scrape_all_sources(max_articles_per_source=max_articles)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return {"articles": len(articles), "seconds": round(elapsed, 2), **summarize(samples)}
+
+
+async def on_loop(func, *args, **kwargs):
+    """Stand-in for ``run_in_parse_executor`` that parses on the event loop."""
+    return func(*args, **kwargs)
+
+
+async def main(args: argparse.Namespace):
+    runner = None
+    if args.live:
+        service = TrendScraperService()
+    else:
+        runner = await serve_feeds(args.entries, args.paragraphs)
+        port = runner.addresses[0][1]
+        service = TrendScraperService(sources_file=sources_file(port, args.sources))
+    service.configure_rate_limits()
+    await start_http_client()
+    
+    try:
+        idle: List[float] = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_lag(stop, args.interval, idle))
+        await asyncio.sleep(1)
+        stop.set()
+        await probe
+        results = {"idle": summarize(idle)}
+        
+        results["executor"] = await measure(service, args.entries, args.interval)
+        
+        in_executor = rss_scraper.run_in_parse_executor
+        rss_scraper.run_in_parse_executor = on_loop
+        try:
+            results["on_loop"] = await measure(service, args.entries, args.interval)
+        finally:
+            rss_scraper.run_in_parse_executor = in_executor
+    finally:
+        await close_http_client()
+        shutdown_parse_executor()
+        if runner is not None:
+            await runner.cleanup()
+    
+    print(f"{'run':<10}{'articles':>10}{'seconds':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in results.items():
+        print(
+            f"{name:<10}{stats.get('articles', '-'):>10}{stats.get('seconds', '-'):>10}"
+            f"{stats['p50_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="scrape the configured sources instead of local feeds")
+    parser.add_argument("--sources", type=int, default=24, help="number of synthetic feeds")
+    parser.add_argument("--entries", type=int, default=200, help="entries per synthetic feed (and articles kept per source)")
+    parser.add_argument("--paragraphs", type=int, default=20, help="paragraphs per synthetic entry")
+    parser.add_argument("--interval", type=float, default=0.005, help="probe sleep interval in seconds")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+"""
+Parse throughput of the HTML listing extraction per parser backend.
+
+Runs ``extract_listing`` (and the bare tree build) over saved listing
+pages with each BeautifulSoup backend and reports pages and megabytes per
+second. Pages named after a configured listing source (e.g.
+``anthropic-blog.html``) are extracted with that source's rules; other
+pages, and the synthetic page used when none are given, use generic
+``article`` rules.
+
+Usage (from the backend directory):
+    python -m benchmarks.html_parse --save pages/     # download the configured listing pages
+    python -m benchmarks.html_parse pages/*.html
+    python -m benchmarks.html_parse                   # synthetic 200-card listing page
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from scrapers.base_scraper import HTML_PARSERS, make_soup
+from scrapers.html_scraper import HTMLListingScraper, extract_listing
+
+SOURCES_FILE = Path(__file__).parent.parent / "data" / "trend_sources.json"
+GENERIC_RULES = {"item": "article", "title": "h3", "date": "time", "summary": "p"}
+
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def listing_sources() -> Dict[str, Dict]:
+    """Configured sources with listing rules, by slug of their name."""
+    with open(SOURCES_FILE) as f:
+        config = json.load(f)
+    return {
+        slug(source["name"]): source
+        for category in config.get("sources", [])
+        for source in category.get("sources", [])
+        if source.get("listing")
+    }
+
+
+def synthetic_listing(cards: int = 200) -> str:
+    """A blog listing page with ``cards`` article cards and some page chrome."""
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(40))
+    items = "".join(
+        f'<article class="card"><a href="/blog/post-{i}/"><img src="/img/{i}.png" alt="">'
+        f'<h3>Post {i}: scaling laws, evaluations and deployment notes</h3></a>'
+        f'<time datetime="2026-10-{1 + i % 28:02d}">October {1 + i % 28}, 2026</time>'
+        f'<p>Summary of post {i} with <em>inline</em> markup and <a href="/tag/{i}">a tag</a>.</p></article>'
+        for i in range(cards)
+    )
+    return f"<!doctype html><html><head><title>Blog</title></head><body><nav><ul>{nav}</ul></nav><main>{items}</main></body></html>"
+
+
+async def save_pages(directory: Path):
+    """Download the listing page of every configured listing source."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, source in listing_sources().items():
+        async with HTMLListingScraper(source["name"], source["url"], source["listing"], "LighthouseAI-Benchmark/1.0") as scraper:
+            html = await scraper.fetch_page(scraper.listing_url)
+        if html is None:
+            print(f"Failed to fetch {scraper.listing_url}")
+            continue
+        (directory / f"{name}.html").write_text(html, encoding="utf-8")
+        print(f"Saved {scraper.listing_url} ({len(html)} chars)")
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, str, Dict]]:
+    """(name, html, rules) for each page, or the synthetic page when none are given."""
+    if not paths:
+        return [("synthetic", synthetic_listing(), GENERIC_RULES)]
+    sources = listing_sources()
+    pages = []
+    for path in map(Path, paths):
+        source = sources.get(path.stem)
+        rules = source["listing"] if source else GENERIC_RULES
+        pages.append((path.stem, path.read_text(encoding="utf-8"), rules))
+    return pages
+
+
+def throughput(func, seconds: float) -> Tuple[float, int]:
+    """Calls per second of ``func`` over about ``seconds``, and the calls made."""
+    func()
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return calls / elapsed, calls
+
+
+def main(args: argparse.Namespace):
+    if args.save:
+        asyncio.run(save_pages(Path(args.save)))
+        return
+    
+    parsers = []
+    for parser in HTML_PARSERS:
+        try:
+            make_soup("<p></p>", parser)
+            parsers.append(parser)
+        except Exception:
+            print(f"Skipping {parser}: not installed")
+    
+    print(f"{'page':<24}{'parser':<14}{'items':>7}{'tree/s':>10}{'extract/s':>11}{'MB/s':>8}")
+    for name, html, rules in load_pages(args.pages):
+        megabytes = len(html.encode("utf-8")) / 1_000_000
+        for parser in parsers:
+            page_rules = dict(rules, parser=parser)
+            items = extract_listing(html, "https://example.com/", page_rules, args.max_items)
+            trees, _ = throughput(lambda: make_soup(html, parser), args.seconds)
+            extracts, _ = throughput(
+                lambda: extract_listing(html, "https://example.com/", page_rules, args.max_items),
+                args.seconds
+            )
+            print(
+                f"{name[:23]:<24}{parser:<14}{len(items):>7}{trees:>10.1f}"
+                f"{extracts:>11.1f}{extracts * megabytes:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", help="saved listing pages (HTML files)")
+    parser.add_argument("--save", metavar="DIR", help="download the configured listing pages into DIR and exit")
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent per measurement")
+    parser.add_argument("--max-items", type=int, default=50, help="items extracted per page")
+    main(parser.parse_args())
@@ -0,0 +1,114 @@
+"""
+Speed of packing articles into the trend analysis prompt budget.
+
+Builds synthetic articles (10,000 by default) with summaries of varying
+length and times ``pack_articles`` at the configured input token budget,
+as in a single-pass analysis, and the map-reduce chunk preparation over
+the whole set. Token counts use the real tokenizer when it can be loaded
+(tiktoken, which may download its BPE file on first use), and the
+characters-per-token estimate otherwise; with the tokenizer loaded the
+estimate is timed as well for comparison.
+
+Usage (from the backend directory):
+    python -m benchmarks.prompt_packing
+    python -m benchmarks.prompt_packing --articles 2000 --repeats 5
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from config import settings
+from services import prompt_packer
+from services.prompt_packer import load_encoding, pack_articles, tokenizer_name
+from services.trend_analyzer import TrendAnalyzer
+
+WORDS = (
+    "model agents inference enterprise chips regulation funding benchmark open weights "
+    "training data center reasoning safety evaluation startup robotics multimodal latency"
+).split()
+
+
+def synthetic_articles(count: int, seed: int = 0) -> List[Dict]:
+    """Articles from 40 sources over the last week, with 1 to 12 sentence summaries."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    
+    def sentence() -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 25))).capitalize() + "."
+    
+    return [
+        {
+            "title": f"{sentence()[:-1]} ({i})",
+            "url": f"https://example.com/{i}",
+            "source": f"Source {i % 40}",
+            "priority": rng.choice(["high", "medium", "low"]),
+            "published_date": (now - timedelta(hours=rng.random() * 168)).isoformat(),
+            "summary": " ".join(sentence() for _ in range(rng.randint(1, 12))),
+        }
+        for i in range(count)
+    ]
+
+
+def timed(func: Callable, repeats: int):
+    """Median milliseconds over ``repeats`` calls, and the last result."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def run(articles: List[Dict], repeats: int) -> Dict:
+    analyzer = TrendAnalyzer()
+    budget = settings.trend_input_token_budget
+    pack_ms, packing = timed(
+        lambda: pack_articles(
+            articles,
+            budget,
+            analyzer._render_article,
+            settings.trend_summary_min_tokens,
+            settings.trend_summary_max_tokens
+        ),
+        repeats
+    )
+    chunk_ms, (_, _, chunks, chunk_tokens) = timed(lambda: analyzer._prepare_chunks(articles), repeats)
+    return {
+        "tokenizer": tokenizer_name(),
+        "pack_ms": pack_ms,
+        "packed": len(packing["articles"]),
+        "tokens": packing["tokens_used"],
+        "chunk_ms": chunk_ms,
+        "chunks": len(chunks),
+        "chunk_tokens": chunk_tokens,
+    }
+
+
+def main(args: argparse.Namespace):
+    articles = synthetic_articles(args.articles)
+    load_encoding()
+    results = [run(articles, args.repeats)]
+    if prompt_packer._encoding is not None:
+        encoding, prompt_packer._encoding = prompt_packer._encoding, None
+        try:
+            results.append(run(articles, args.repeats))
+        finally:
+            prompt_packer._encoding = encoding
+    
+    print(f"{len(articles)} articles, budget {settings.trend_input_token_budget} tokens, median of {args.repeats} runs")
+    print(f"{'tokenizer':<20}{'pack ms':>10}{'packed':>8}{'tokens':>9}{'chunks ms':>11}{'chunks':>8}{'tokens':>10}")
+    for r in results:
+        print(
+            f"{r['tokenizer']:<20}{r['pack_ms']:>10.0f}{r['packed']:>8}{r['tokens']:>9}"
+            f"{r['chunk_ms']:>11.0f}{r['chunks']:>8}{r['chunk_tokens']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=10_000, help="synthetic articles to pack")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per measurement")
+    main(parser.parse_args())
@@ -0,0 +1,132 @@
+"""
+Latency of GET /api/trends served from the trend feed cache.
+
+Drives the endpoint with concurrent clients and reports p50/p99 latency
+and throughput for fresh cache hits, stale hits (served while a
+background refresh runs) and 304 Not Modified answers to a matching
+If-None-Match.
+
+By default requests go through the ASGI app in-process against a
+synthetic snapshot, so no database or server is needed. ``--url`` targets
+a running server instead; its cache freshness cannot be controlled from
+here, so only full responses and 304s are measured.
+
+Usage (from the backend directory):
+    python -m benchmarks.trend_feed
+    python -m benchmarks.trend_feed --requests 20000 --concurrency 100
+    python -m benchmarks.trend_feed --url http://localhost:8002
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from services.trend_feed import trend_feed_cache
+from services.trend_snapshots import trend_snapshots
+
+PATH = "/api/trends"
+
+
+def synthetic_trends(count: int) -> List[Dict]:
+    """Trends with text fields about as long as analyzed ones."""
+    return [
+        {
+            "title": f"Trend {i}",
+            "headline": f"Headline of trend {i} about agents, inference costs and enterprise adoption",
+            "status": "current",
+            "trendCategory": "Technology",
+            "keywords": ["agents", "inference", "enterprise", "evaluation", "open weights"],
+            "whyTrend": "Why this matters. " * 40,
+            "analysisDetail": "Detailed analysis. " * 80,
+            "additionalSources": [
+                {"title": f"Source article {j}", "url": f"https://example.com/{i}/{j}", "source": f"Source {j}"}
+                for j in range(10)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    requests: int,
+    concurrency: int,
+    expected_status: int,
+    headers: Optional[Dict] = None
+) -> Dict:
+    """Send ``requests`` GETs from ``concurrency`` workers and summarize their latency."""
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+    
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(PATH, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != expected_status:
+                raise RuntimeError(f"Expected HTTP {expected_status}, got {response.status_code}")
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "max_ms": latencies[-1],
+    }
+
+
+async def in_process(args: argparse.Namespace) -> Dict[str, Dict]:
+    from main import app
+    
+    await trend_snapshots.save(synthetic_trends(args.trends), {"top_n": args.trends})
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        etag = (await client.get(PATH)).headers["etag"]
+        
+        trend_feed_cache.fresh_seconds = 3600
+        results["hit"] = await drive(client, args.requests, args.concurrency, 200)
+        results["not_modified"] = await drive(client, args.requests, args.concurrency, 304, {"If-None-Match": etag})
+        
+        # Every entry is stale at once: served as is while one refresh rebuilds it
+        trend_feed_cache.fresh_seconds = 0
+        refreshes = trend_feed_cache.stats["refreshes"]
+        results["stale_hit"] = await drive(client, args.requests, args.concurrency, 200)
+        print(f"Background refreshes during stale run: {trend_feed_cache.stats['refreshes'] - refreshes}")
+    print(f"Cache counters: {trend_feed_cache.snapshot()}")
+    return results
+
+
+async def remote(args: argparse.Namespace) -> Dict[str, Dict]:
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30) as client:
+        etag = (await client.get(PATH)).headers["etag"]
+        results["full"] = await drive(client, args.requests, args.concurrency, 200)
+        results["not_modified"] = await drive(client, args.requests, args.concurrency, 304, {"If-None-Match": etag})
+    return results
+
+
+def main(args: argparse.Namespace):
+    results = asyncio.run(remote(args) if args.url else in_process(args))
+    print(f"{'run':<14}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in results.items():
+        print(
+            f"{name:<14}{stats['requests']:>10}{stats['per_second']:>10.0f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: in-process ASGI app)")
+    parser.add_argument("--requests", type=int, default=5000, help="requests per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--trends", type=int, default=10, help="trends in the synthetic snapshot")
+    main(parser.parse_args())
@@ -11,6 +11,56 @@ class Settings(BaseSettings):
     jwt_expires_in: int = 604800  # 7 days in seconds
     cors_origins: str = "http://localhost:3000"
     openai_api_key: str
+    openai_timeout: float = 120.0  # seconds per attempt
+    openai_max_retries: int = 2
+    openai_retry_base_delay: float = 1.0
+    
+    # Feed parsing runs off the event loop: "thread" or "process" pool
+    scraper_parse_executor: str = "thread"
+    scraper_parse_workers: int = 4
+    
+    # Shared scraper HTTP client (connection pool and timeouts, in seconds)
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 8
+    http_dns_cache_ttl: int = 300
+    http_keepalive_timeout: int = 30
+    http_connect_timeout: float = 10.0
+    http_read_timeout: float = 20.0
+    http_total_timeout: float = 30.0
+    
+    # Background per-source polling (see services/scheduler.py)
+    scrape_scheduler_enabled: bool = True
+    
+    # Trend analysis result cache (see services/trend_cache.py)
+    trend_cache_ttl_minutes: int = 360
+    trend_cache_max_entries: int = 128
+    
+    # Prompt packing for trend analysis, in tokens (see services/prompt_packer.py)
+    trend_input_token_budget: int = 24000
+    trend_summary_min_tokens: int = 40
+    trend_summary_max_tokens: int = 200
+    
+    # Local pre-clustering before trend analysis (see services/clustering.py)
+    trend_clustering_enabled: bool = True
+    trend_max_clusters: int = 40
+    
+    # Batch trend enrichment: concurrent requests and trends per request
+    trend_enrich_concurrency: int = 4
+    trend_enrich_pack_size: int = 1
+    
+    # Published trend snapshots: how many to keep, and how often (seconds)
+    # readers check the database for a newer one written by another worker
+    trend_snapshot_retention: int = 20
+    trend_snapshot_check_seconds: float = 30.0
+    
+    # Background discover jobs: worker count, waiting jobs accepted, record lifetime
+    discover_job_workers: int = 2
+    discover_job_max_pending: int = 20
+    discover_job_ttl_hours: int = 72
+    
+    # Serialized trend feed cache: seconds a copy is fresh, and feeds kept
+    trend_feed_fresh_seconds: float = 10.0
+    trend_feed_max_entries: int = 64
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,10 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from config import settings
 from database import connect_to_mongodb, close_mongodb_connection, get_database
 from routers import auth, chat, trends
+from scrapers.executor import shutdown_parse_executor
+from scrapers.http_client import start_http_client, close_http_client
+from services.article_store import article_store
+from services.job_queue import discover_jobs
+from services.prompt_packer import load_encoding
+from services.scheduler import ScrapeScheduler
+from services.trend_cache import trend_cache
+from services.trend_feed import trend_feed_cache
+from services.trend_snapshots import trend_snapshots
+from services.trend_store import trend_store
 
 
 @asynccontextmanager
@@ -12,8 +23,28 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
     await connect_to_mongodb()
+    await start_http_client()
+    trends.scraper_service.configure_rate_limits()
+    # The tokenizer may be downloaded on first load, so keep it off the loop
+    await asyncio.to_thread(load_encoding)
+    await article_store.ensure_indexes()
+    await trend_cache.ensure_indexes()
+    await trend_store.ensure_indexes()
+    await trend_snapshots.ensure_indexes()
+    await discover_jobs.ensure_indexes()
+    await trend_feed_cache.warm()
+    scheduler = None
+    if settings.scrape_scheduler_enabled:
+        scheduler = ScrapeScheduler(trends.scraper_service)
+        scheduler.start()
+    app.state.scrape_scheduler = scheduler
     yield
     # Shutdown
+    if scheduler:
+        await scheduler.stop()
+    await discover_jobs.stop()
+    await close_http_client()
+    shutdown_parse_executor()
     await close_mongodb_connection()
 
 
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, HTTPException, status
-from openai import OpenAI
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+import json
 import logging
+import time
 
 from config import settings
 from schemas.chat import ChatRequest, ChatResponse
+from services.openai_client import create_chat_completion
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -11,16 +14,6 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
-# OpenAI client will be initialized lazily
-_client = None
-
-def get_openai_client():
-    """Get or create OpenAI client instance."""
-    global _client
-    if _client is None:
-        _client = OpenAI(api_key=settings.openai_api_key)
-    return _client
-
 # System prompt for Lighthouse AI
 LIGHTHOUSE_SYSTEM_PROMPT = """You are Lighthouse AI, an expert strategic analyst specializing in AI trends, technology markets, and business intelligence. Your role is to provide:
 
@@ -46,6 +39,43 @@ Key topics you cover:
 Maintain a professional, analytical tone. Be direct and avoid unnecessary pleasantries."""
 
 
+# Completion parameters shared by the blocking and streaming endpoints
+CHAT_COMPLETION_PARAMS = {
+    "model": "gpt-4o",  # Using GPT-4o for better intelligence and reasoning
+    "temperature": 0.7,
+    "max_tokens": 1500,  # Increased for more detailed responses
+    "top_p": 1.0,
+    "frequency_penalty": 0.0,
+    "presence_penalty": 0.0
+}
+
+
+def build_messages(request: ChatRequest) -> list[dict]:
+    """Build the OpenAI messages array from a chat request."""
+    messages = [
+        {"role": "system", "content": LIGHTHOUSE_SYSTEM_PROMPT}
+    ]
+    
+    # Add conversation history
+    for msg in request.conversation_history:
+        messages.append({
+            "role": msg.role,
+            "content": msg.content
+        })
+    
+    # Add current user message
+    messages.append({
+        "role": "user",
+        "content": request.message
+    })
+    return messages
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -59,37 +89,15 @@ async def chat(request: ChatRequest):
     """
     try:
         # Build messages array for OpenAI API
-        messages = [
-            {"role": "system", "content": LIGHTHOUSE_SYSTEM_PROMPT}
-        ]
-        
-        # Add conversation history
-        for msg in request.conversation_history:
-            messages.append({
-                "role": msg.role,
-                "content": msg.content
-            })
-        
-        # Add current user message
-        messages.append({
-            "role": "user",
-            "content": request.message
-        })
+        messages = build_messages(request)
         
         # Call OpenAI API
         logger.info(f"Calling OpenAI API with {len(messages)} messages")
         
-        client = get_openai_client()
-        
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o",  # Using GPT-4o for better intelligence and reasoning
+            response = await create_chat_completion(
                 messages=messages,
-                temperature=0.7,
-                max_tokens=1500,  # Increased for more detailed responses
-                top_p=1.0,
-                frequency_penalty=0.0,
-                presence_penalty=0.0
+                **CHAT_COMPLETION_PARAMS
             )
             
             # Extract the assistant's reply
@@ -126,6 +134,75 @@ async def chat(request: ChatRequest):
         )
 
 
+@router.post("/stream")
+async def chat_stream(chat_request: ChatRequest, request: Request):
+    """
+    Streaming chat endpoint using Server-Sent Events.
+    
+    Emits ``token`` events (``{"content": "..."}``) as the model generates,
+    then a ``done`` event with timing metrics, or an ``error`` event.
+    Generation stops when the client disconnects.
+    
+    Args:
+        chat_request: ChatRequest containing the user's message and conversation history
+        
+    Returns:
+        text/event-stream response
+    """
+    messages = build_messages(chat_request)
+    logger.info(f"Streaming OpenAI response for {len(messages)} messages")
+    
+    async def event_stream():
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = 0
+        stream = None
+        disconnected = False
+        try:
+            stream = await create_chat_completion(
+                messages=messages,
+                stream=True,
+                **CHAT_COMPLETION_PARAMS
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                chunks += 1
+                yield _sse("token", {"content": content})
+                if await request.is_disconnected():
+                    disconnected = True
+                    break
+            
+            if not disconnected:
+                yield _sse("done", {
+                    "ttft_ms": round((first_token_at - started) * 1000) if first_token_at else None,
+                    "duration_ms": round((time.perf_counter() - started) * 1000)
+                })
+        except Exception as e:
+            logger.error(f"Error streaming OpenAI response: {str(e)}")
+            yield _sse("error", {"detail": f"Failed to generate response: {str(e)}"})
+        finally:
+            # Closing the stream aborts generation on OpenAI's side
+            if stream is not None:
+                await stream.close()
+            ttft = f"{(first_token_at - started) * 1000:.0f}ms" if first_token_at else "n/a"
+            logger.info(
+                f"Chat stream {'cancelled' if disconnected else 'finished'}: ttft={ttft}, "
+                f"duration={(time.perf_counter() - started) * 1000:.0f}ms, chunks={chunks}"
+            )
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/health")
 async def chat_health():
     """Health check endpoint for chat service."""
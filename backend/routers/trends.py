@@ -1,11 +1,26 @@
 """
 Trends API router with scraping and analysis endpoints.
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, status
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
 import logging
 
 from services.trend_scraper_service import TrendScraperService
+from scrapers.http_client import get_pool_stats
+from scrapers.validator_store import validator_store
+from scrapers.rate_limiter import host_rate_limiter
+from services.article_store import article_store
+from services.job_queue import QueueFullError, discover_jobs
+from services.openai_client import completion_stats
+from services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from services.single_flight import SingleFlight
+from services.trend_store import new_trend_id
+from services.trend_cache import trend_cache
+from services.trend_feed import trend_feed_cache
+from services.trend_snapshots import trend_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +29,75 @@ router = APIRouter(prefix="/api/trends", tags=["trends"])
 # Initialize scraper service
 scraper_service = TrendScraperService()
 
+# Identical concurrent discover requests share one scrape + analysis
+discover_flight = SingleFlight("discover")
+
+# Status code used when the client went away before the response (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _cancel_on_disconnect(request: Request, awaitable: Awaitable, poll_interval: float = 1.0):
+    """
+    Await work while watching the client connection.
+    
+    If the client disconnects first, the work is cancelled (aborting any
+    in-flight OpenAI call) and a 499 is raised.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("Client disconnected, cancelling request work")
+                task.cancel()
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST,
+                    detail="Client closed request"
+                )
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _run_discovery(
+    parameters: Dict,
+    on_stage: Optional[Callable[[str], Awaitable[None]]] = None
+) -> tuple[List[Dict], Optional[int]]:
+    """Discover (or maintain), optionally enrich and publish trends; returns (trends, snapshot version)."""
+    discover = scraper_service.maintain_trends if parameters["incremental"] else scraper_service.discover_and_analyze_trends
+    trends = await discover(
+        top_n=parameters["top_n"],
+        lookback_days=parameters["lookback_days"],
+        on_stage=on_stage
+    )
+    if parameters["enrich"]:
+        if on_stage:
+            await on_stage("enriching trends")
+        await scraper_service.trend_analyzer.enrich_trends(trends)
+    if on_stage:
+        await on_stage("publishing snapshot")
+    version = await trend_snapshots.save(trends, parameters)
+    return trends, version
+
+
+def _decode_cursor(cursor: Optional[str], field: str):
+    """Decode a request's cursor, or raise a 400."""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, field)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {str(e)}"
+        )
+
+
+def _next_cursor(field: str, next_key) -> Optional[str]:
+    return encode_cursor(field, *next_key) if next_key else None
+
 
 @router.get("/sources")
 async def get_sources():
@@ -38,13 +122,38 @@ async def get_sources():
 
 @router.post("/discover")
 async def discover_trends(
+    request: Request,
     top_n: Optional[int] = 10,
     lookback_days: Optional[int] = 7,
-    background_tasks: BackgroundTasks = None
+    incremental: bool = False,
+    enrich: bool = False,
+    stream: bool = False,
+    background: bool = False
 ):
     """
     Discover and analyze top AI trends from configured sources.
     
+    Concurrent requests with the same parameters are coalesced onto a
+    single in-flight discovery and all receive its result. Each run is
+    published as a snapshot served by ``GET /api/trends``.
+    
+    With ``incremental=true`` stored trends are updated in place: new
+    articles are assigned to existing trends, whose ids stay stable, and
+    the model is only called for clusters that look like new trends.
+    
+    With ``enrich=true`` the discovered trends are also enriched with
+    executive insights, concurrently and only once per trend version.
+    
+    With ``stream=true`` the response is newline-delimited JSON, one trend
+    per line, written as soon as the model finishes each trend instead of
+    after the whole analysis. Streamed requests are not coalesced.
+    
+    With ``background=true`` discovery runs as a job on a bounded worker
+    pool and the response (202) carries the job at once; poll
+    ``GET /api/trends/jobs/{id}`` for stage progress and the result.
+    Submitting while a job with the same parameters is queued or running
+    returns that job.
+    
     This endpoint:
     1. Scrapes articles from all enabled RSS sources
     2. Filters articles by date (lookback_days)
@@ -54,28 +163,91 @@ async def discover_trends(
     Args:
         top_n: Number of top trends to return (default: 10)
         lookback_days: Number of days to look back for articles (default: 7)
+        incremental: Update stored trends instead of rediscovering (default: false)
+        enrich: Add AI enrichment fields to each trend (default: false)
+        stream: Return trends as newline-delimited JSON as they are generated (default: false)
+        background: Run as a background job and return its id (default: false)
     
     Returns:
         List of discovered trends with full analysis
     """
+    parameters = {
+        "top_n": top_n,
+        "lookback_days": lookback_days,
+        "incremental": incremental,
+        "enrich": enrich
+    }
+    key = (top_n, lookback_days, incremental, enrich)
+    
+    if background:
+        async def run_job(on_stage):
+            trends, version = await discover_flight.do(key, lambda: _run_discovery(parameters, on_stage))
+            return {
+                "count": len(trends),
+                "trend_ids": [trend.get('id') for trend in trends],
+                "snapshot_version": version
+            }
+        
+        try:
+            job, attached = await discover_jobs.submit(key, parameters, run_job)
+        except QueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Discover queue is full: {str(e)}"
+            )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "job_id": job["id"],
+                "attached": attached,
+                "status_url": f"{router.prefix}/jobs/{job['id']}",
+                "job": job
+            }
+        )
+    
+    if stream:
+        logger.info(f"Starting streamed trend discovery: top_n={top_n}, lookback_days={lookback_days}, incremental={incremental}")
+        
+        async def discovered():
+            if incremental:
+                # Maintenance rarely calls the model, so there is nothing to stream
+                for trend in await scraper_service.maintain_trends(top_n=top_n, lookback_days=lookback_days):
+                    yield trend
+            else:
+                async for trend in scraper_service.stream_trends(top_n=top_n, lookback_days=lookback_days):
+                    yield trend
+        
+        async def ndjson_lines():
+            trends = []
+            async for trend in discovered():
+                if enrich:
+                    await scraper_service.trend_analyzer.enrich_trends([trend])
+                trend.setdefault('id', new_trend_id())
+                trends.append(trend)
+                yield json.dumps(trend) + "\n"
+            # Only a completed stream is published
+            await trend_snapshots.save(trends, parameters)
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
     try:
-        logger.info(f"Starting trend discovery: top_n={top_n}, lookback_days={lookback_days}")
+        logger.info(f"Starting trend discovery: top_n={top_n}, lookback_days={lookback_days}, incremental={incremental}")
         
-        # Run trend discovery
-        trends = await scraper_service.discover_and_analyze_trends(
-            top_n=top_n,
-            lookback_days=lookback_days
+        # Run trend discovery (shared with identical in-flight requests and jobs);
+        # the LLM call is cancelled once every waiting client has gone away
+        trends, _ = await _cancel_on_disconnect(
+            request,
+            discover_flight.do(key, lambda: _run_discovery(parameters))
         )
         
         return {
             "trends": trends,
             "count": len(trends),
-            "parameters": {
-                "top_n": top_n,
-                "lookback_days": lookback_days
-            }
+            "parameters": parameters
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error discovering trends: {str(e)}")
         raise HTTPException(
@@ -84,8 +256,34 @@ async def discover_trends(
         )
 
 
+@router.get("/jobs/{job_id}")
+async def get_discover_job(job_id: str):
+    """
+    Get the status of a background discover job.
+    
+    Returns the job's status (queued, running, succeeded or failed), the
+    stage it is in, per-stage timings, and once finished its result
+    (trend ids and snapshot version) or error.
+    
+    Args:
+        job_id: Job id returned by ``POST /discover?background=true``
+    """
+    job = await discover_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+    return job
+
+
 @router.post("/scrape")
-async def scrape_articles(max_articles_per_source: Optional[int] = 10):
+async def scrape_articles(
+    max_articles_per_source: Optional[int] = 10,
+    stream: bool = False,
+    only_new: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=500)
+):
     """
     Scrape articles from all enabled sources without analysis.
     
@@ -93,21 +291,46 @@ async def scrape_articles(max_articles_per_source: Optional[int] = 10):
     
     Args:
         max_articles_per_source: Maximum articles to scrape per source (default: 10)
+        stream: Return newline-delimited JSON, one article per line, as each
+            source finishes instead of a single JSON document (default: false)
+        only_new: Skip articles already ingested by an earlier scrape (default: false)
+        limit: Return only the newest ``limit`` articles plus a ``next_cursor``
+            for ``GET /api/trends/articles`` (default: all articles)
     
     Returns:
         List of scraped articles
     """
+    if stream:
+        logger.info(f"Starting streamed article scraping: max_articles_per_source={max_articles_per_source}")
+        
+        async def ndjson_lines():
+            async for article in scraper_service.stream_all_sources(
+                max_articles_per_source=max_articles_per_source,
+                only_new=only_new
+            ):
+                yield json.dumps(article) + "\n"
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
     try:
         logger.info(f"Starting article scraping: max_articles_per_source={max_articles_per_source}")
         
         articles = await scraper_service.scrape_all_sources(
-            max_articles_per_source=max_articles_per_source
+            max_articles_per_source=max_articles_per_source,
+            only_new=only_new
         )
         
+        sources_scraped = len(set(a.get('source') for a in articles))
+        next_key = None
+        if limit:
+            articles, next_key = article_store.first_page(articles, limit)
+        
         return {
             "articles": articles,
             "count": len(articles),
-            "sources_scraped": len(set(a.get('source') for a in articles))
+            "sources_scraped": sources_scraped,
+            "run_stats": scraper_service.last_run_stats,
+            "next_cursor": _next_cursor("published_date", next_key)
         }
         
     except Exception as e:
@@ -118,6 +341,40 @@ async def scrape_articles(max_articles_per_source: Optional[int] = 10):
         )
 
 
+@router.get("/stats")
+async def scraper_stats(request: Request):
+    """
+    Get scraper runtime statistics.
+    
+    Returns connection pool counters for the shared HTTP client
+    (requests, new vs. reused connections, DNS cache hits), cumulative
+    conditional-GET counters, per-host rate limiting counters, trend
+    analysis cache hit/miss ratios, discover request coalescing counters,
+    prompt token usage of the last analysis, the outcome of the last
+    incremental trend update, cumulative trend enrichment counters,
+    background discover job counters, trend feed cache counters, the
+    counters of the last scrape run, cumulative article collection, scrape
+    run and model call counts, and the per-source polling schedule.
+    """
+    scheduler = getattr(request.app.state, "scrape_scheduler", None)
+    return {
+        "scheduler": scheduler.status() if scheduler else None,
+        "http_pool": get_pool_stats(),
+        "conditional_get": validator_store.snapshot(),
+        "rate_limit": host_rate_limiter.stats,
+        "trend_cache": trend_cache.snapshot(),
+        "discover": discover_flight.snapshot(),
+        "last_analysis": scraper_service.trend_analyzer.last_run_stats,
+        "last_maintenance": scraper_service.trend_tracker.last_run_stats,
+        "enrichment": scraper_service.trend_analyzer.enrichment_stats,
+        "discover_jobs": discover_jobs.snapshot(),
+        "trend_feed": trend_feed_cache.snapshot(),
+        "last_run": scraper_service.last_run_stats,
+        "runs": scraper_service.run_counts,
+        "model_calls": completion_stats
+    }
+
+
 @router.get("/health")
 async def trends_health():
     """Health check for trends scraping service."""
@@ -135,3 +392,123 @@ async def trends_health():
             "service": "trends_scraper",
             "error": str(e)
         }
+
+
+@router.get("")
+async def list_trends(
+    request: Request,
+    status_filter: Optional[str] = Query("current", alias="status"),
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    List trends from the latest published discover snapshot.
+    
+    Served from a pre-encoded in-memory copy with a strong ETag; a request
+    whose ``If-None-Match`` matches gets a 304 with no body. A stale copy is
+    served while it is rebuilt in the background.
+    
+    Args:
+        status: Trend status to list, current or archived (default: current)
+        category: Only trends with this trendCategory
+        search: Case-insensitive text to find in the title or headline
+        limit: Maximum number of trends (default: 50)
+    
+    Returns:
+        Trends in rank order and the snapshot they come from
+    """
+    feed = await trend_feed_cache.get(
+        status=status_filter,
+        category=category,
+        search=search,
+        limit=limit
+    )
+    headers = {"ETag": feed["etag"], "Cache-Control": "no-cache"}
+    if trend_feed_cache.not_modified(request.headers.get("if-none-match"), feed):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=feed["body"], media_type="application/json", headers=headers)
+
+
+@router.get("/history")
+async def trend_history(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    category: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
+):
+    """
+    List trends from all retained snapshots, newest first.
+    
+    Pages are read by keyset on (dateAdded, _id), so a deep page costs the
+    same as the first. Pass the ``next_cursor`` of a response as ``cursor``
+    to get the next page; it is null on the last page.
+    
+    Args:
+        status: Only trends with this status
+        category: Only trends with this trendCategory
+        limit: Page size (default: 50)
+        cursor: Opaque cursor from the previous page
+    """
+    trends, next_key = await trend_snapshots.history(
+        limit=limit,
+        after=_decode_cursor(cursor, "dateAdded"),
+        status=status_filter,
+        category=category
+    )
+    return {
+        "trends": trends,
+        "count": len(trends),
+        "next_cursor": _next_cursor("dateAdded", next_key)
+    }
+
+
+@router.get("/articles")
+async def list_articles(
+    source: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None
+):
+    """
+    List stored articles, newest first.
+    
+    Pages are read by keyset on (published_date, _id), so a deep page costs
+    the same as the first. Pass the ``next_cursor`` of a response (or of
+    ``POST /scrape?limit=...``) as ``cursor`` to get the next page; it is
+    null on the last page.
+    
+    Args:
+        source: Only articles from this source
+        limit: Page size (default: 50)
+        cursor: Opaque cursor from the previous page
+    """
+    articles, next_key = await article_store.page(
+        limit=limit,
+        after=_decode_cursor(cursor, "published_date"),
+        source=source
+    )
+    return {
+        "articles": articles,
+        "count": len(articles),
+        "next_cursor": _next_cursor("published_date", next_key)
+    }
+
+
+@router.get("/{trend_id}")
+async def get_trend(trend_id: str):
+    """
+    Get a single trend of the latest published snapshot by id.
+    
+    Args:
+        trend_id: Trend id as returned by discover or the trend listing
+    
+    Returns:
+        The trend
+    """
+    trend = await trend_snapshots.get_trend(trend_id)
+    if trend is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Trend {trend_id} not found"
+        )
+    return trend
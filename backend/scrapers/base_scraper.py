@@ -2,15 +2,31 @@
 Base scraper class for web scraping functionality.
 """
 import asyncio
+import hashlib
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 import aiohttp
 from bs4 import BeautifulSoup
 
+from .http_client import get_http_session, build_timeout
+from .validator_store import validator_store
+from .rate_limiter import host_rate_limiter
+from .seen_index import seen_index
+
 logger = logging.getLogger(__name__)
 
+# BeautifulSoup tree builders; lxml is C-backed and much faster than html.parser
+HTML_PARSERS = ("lxml", "html.parser", "html5lib")
+
+
+def make_soup(html: str, parser: str = "html.parser") -> BeautifulSoup:
+    """Parse HTML with the given backend (module-level so it can run in the parse executor)."""
+    if parser not in HTML_PARSERS:
+        raise ValueError(f"Unsupported HTML parser '{parser}', expected one of {HTML_PARSERS}")
+    return BeautifulSoup(html, parser)
+
 
 class Article:
     """Represents a scraped article."""
@@ -54,66 +70,215 @@ class Article:
 class BaseScraper(ABC):
     """Base class for all web scrapers."""
     
+    # Parser backend used by parse_html; subclasses or instances may override
+    html_parser = "html.parser"
+    
     def __init__(self, source_name: str, source_url: str, user_agent: str):
         self.source_name = source_name
         self.source_url = source_url
         self.user_agent = user_agent
         self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
+        self.not_modified = False
+        # Set when any fetch failed (HTTP error, timeout, network error)
+        self.failed = False
+        # Set when a fetch failed in a way likely to pass (timeout, network
+        # error, 429 or 5xx), unlike e.g. a 404
+        self.transient_failure = False
+        # URL -> content hash of scraped articles not yet in the seen-article
+        # index; the caller marks them seen once the articles are stored
+        self.unseen: Dict[str, str] = {}
+        # URLs whose validators were recorded by this scraper
+        self.validated: List[str] = []
     
     async def __aenter__(self):
-        """Async context manager entry."""
-        self.session = aiohttp.ClientSession(
-            headers={"User-Agent": self.user_agent}
-        )
+        """Async context manager entry. Borrows the shared HTTP client if running."""
+        self.session = get_http_session()
+        if self.session is None:
+            # Standalone use (scripts): fall back to a private session
+            self.session = aiohttp.ClientSession(timeout=build_timeout())
+            self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
+        """Async context manager exit. Only closes a session this scraper created."""
+        if self.session and self._owns_session:
             await self.session.close()
+        self.session = None
+        self._owns_session = False
+    
+    def _request_kwargs(self, timeout: Optional[float]) -> Dict:
+        """Per-request options layered on top of the shared session."""
+        kwargs = {"headers": {"User-Agent": self.user_agent}}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        return kwargs
     
-    async def fetch_page(self, url: str, timeout: int = 30) -> Optional[str]:
+    async def _fetch(
+        self,
+        url: str,
+        timeout: Optional[float],
+        conditional: bool,
+        revalidate: bool = True
+    ) -> Tuple[Optional[bytes], Optional[str]]:
         """
-        Fetch a web page.
+        GET a URL, optionally as a conditional request.
+        
+        With ``conditional`` the response validators are recorded; with
+        ``revalidate`` as well, stored validators are sent and
+        ``self.not_modified`` is set when the server answered 304 or the body
+        hash matches the stored one (the body is then returned as None).
         
-        Args:
-            url: URL to fetch
-            timeout: Request timeout in seconds
-            
         Returns:
-            HTML content or None if failed
+            (body, encoding) - body is None if failed or unchanged
         """
+        self.not_modified = False
+        kwargs = self._request_kwargs(timeout)
+        validators = None
+        if conditional and revalidate:
+            validators = await validator_store.get(url)
+            kwargs["headers"].update(validator_store.conditional_headers(validators))
+            if validators:
+                validator_store.stats["conditional_requests"] += 1
+        
         try:
-            async with self.session.get(url, timeout=timeout) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
+            await host_rate_limiter.acquire(url)
+            async with self.session.get(url, **kwargs) as response:
+                if response.status == 304 and validators:
+                    self.not_modified = True
+                    validator_store.stats["not_modified"] += 1
+                    validator_store.stats["bytes_saved"] += validators.get("content_length", 0)
+                    logger.info(f"{url} not modified (304)")
+                    return None, None
+                if response.status != 200:
                     logger.warning(f"Failed to fetch {url}: HTTP {response.status}")
-                    return None
+                    self.failed = True
+                    if response.status == 429 or response.status >= 500:
+                        self.transient_failure = True
+                    return None, None
+                body = await response.read()
+                encoding = response.get_encoding()
+                if not conditional:
+                    return body, encoding
+                
+                content_hash = hashlib.sha256(body).hexdigest()
+                if validators and validators.get("content_hash") == content_hash:
+                    self.not_modified = True
+                    validator_store.stats["unchanged_content"] += 1
+                    logger.info(f"{url} unchanged (content hash match)")
+                    return None, None
+                validator_store.stats["changed"] += 1
+                await validator_store.save(
+                    url,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    content_hash=content_hash,
+                    content_length=len(body)
+                )
+                self.validated.append(url)
+                return body, encoding
         except asyncio.TimeoutError:
             logger.error(f"Timeout fetching {url}")
-            return None
+            self.failed = True
+            self.transient_failure = True
+            return None, None
         except Exception as e:
             logger.error(f"Error fetching {url}: {str(e)}")
+            self.failed = True
+            self.transient_failure = True
+            return None, None
+    
+    async def fetch_page(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        conditional: bool = False,
+        revalidate: bool = True
+    ) -> Optional[str]:
+        """
+        Fetch a web page.
+        
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds (defaults to the client timeout)
+            conditional: Record validators and send stored ones; check
+                ``self.not_modified`` to tell an unchanged page from a failure
+            revalidate: With ``conditional``, False only records validators
+            
+        Returns:
+            HTML content or None if failed or unchanged
+        """
+        body, encoding = await self._fetch(url, timeout, conditional, revalidate)
+        if body is None:
             return None
+        return body.decode(encoding or "utf-8", errors="replace")
+    
+    async def fetch_bytes(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        conditional: bool = False,
+        revalidate: bool = True
+    ) -> Optional[bytes]:
+        """
+        Fetch a resource as raw bytes (e.g. a feed to be parsed off-loop).
+        
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds (defaults to the client timeout)
+            conditional: Record validators and send stored ones; check
+                ``self.not_modified`` to tell an unchanged resource from a failure
+            revalidate: With ``conditional``, False only records validators
+            
+        Returns:
+            Response body or None if failed or unchanged
+        """
+        body, _ = await self._fetch(url, timeout, conditional, revalidate)
+        return body
     
     def parse_html(self, html: str) -> BeautifulSoup:
-        """Parse HTML content."""
-        return BeautifulSoup(html, 'html.parser')
+        """Parse HTML content with the scraper's parser backend."""
+        return make_soup(html, self.html_parser)
     
     @abstractmethod
-    async def scrape_articles(self, max_articles: int = 10) -> List[Article]:
+    async def scrape_articles(self, max_articles: int = 10, skip_seen: bool = False) -> List[Article]:
         """
         Scrape articles from the source.
         
         Args:
             max_articles: Maximum number of articles to scrape
+            skip_seen: Skip entries already in the seen-article index
             
         Returns:
             List of Article objects
         """
         pass
     
+    async def check_seen(self, hashes: Dict[str, str]) -> Set[str]:
+        """
+        Look up entries in the seen-article index.
+        
+        Nothing is marked seen here: scrapers add the entries they turn
+        into articles to ``self.unseen``, and those are marked once stored.
+        
+        Args:
+            hashes: Map of entry URL to content hash
+            
+        Returns:
+            URLs already processed with the same content
+        """
+        seen = await seen_index.find_seen(hashes)
+        seen_index.record(self.source_name, new=len(hashes) - len(seen), seen=len(seen))
+        return seen
+    
+    async def forget_validators(self):
+        """
+        Drop the validators recorded by this scraper, e.g. when its articles
+        could not be stored, so unchanged resources are parsed again next time.
+        """
+        for url in self.validated:
+            await validator_store.forget(url)
+    
     def clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         if not text:
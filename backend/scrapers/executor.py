@@ -0,0 +1,46 @@
+"""
+Executor used to run CPU-bound feed and HTML parsing off the event loop.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+
+
+def get_parse_executor() -> Executor:
+    """Get or create the shared parse executor (thread or process pool)."""
+    global _executor
+    if _executor is None:
+        workers = max(1, settings.scraper_parse_workers)
+        if settings.scraper_parse_executor == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper-parse")
+        logger.info(f"Started {settings.scraper_parse_executor} parse executor with {workers} workers")
+    return _executor
+
+
+async def run_in_parse_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking parse function in the shared executor.
+    
+    With a process pool, ``func`` and its arguments must be picklable
+    (module-level functions and plain data).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_parse_executor():
+    """Shut down the shared parse executor."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,170 @@
+"""
+Feed autodiscovery for sources that are configured with a homepage URL only.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from database import get_database
+from .base_scraper import BaseScraper, Article
+from .executor import run_in_parse_executor
+from .rss_scraper import RSSFeedScraper, is_json_feed
+
+logger = logging.getLogger(__name__)
+
+FEED_TYPES = (
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/feed+json",
+    "application/rdf+xml",
+)
+
+# Paths probed (relative to the source URL, then the site root) when the page has no <link rel="alternate">
+COMMON_FEED_PATHS = ["feed", "feed/", "rss.xml", "feed.xml", "atom.xml", "rss", "index.xml"]
+
+
+def find_feed_links(html: str, base_url: str) -> List[str]:
+    """Extract feed URLs from <link rel="alternate"> tags (runs in the parse executor)."""
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for tag in soup.find_all("link", href=True):
+        rel = [r.lower() for r in (tag.get("rel") or [])]
+        feed_type = (tag.get("type") or "").lower()
+        if "alternate" in rel and feed_type in FEED_TYPES:
+            links.append(urljoin(base_url, tag["href"]))
+    return links
+
+
+def candidate_feed_urls(source_url: str) -> List[str]:
+    """Common feed locations for a source URL, most specific first."""
+    base = source_url if source_url.endswith("/") else source_url + "/"
+    parsed = urlparse(source_url)
+    root = f"{parsed.scheme}://{parsed.netloc}/"
+    candidates = [urljoin(base, path) for path in COMMON_FEED_PATHS]
+    if base != root:
+        candidates += [urljoin(root, path) for path in COMMON_FEED_PATHS]
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(candidates))
+
+
+def looks_like_feed(body: bytes) -> bool:
+    """Cheap check that a response body is an RSS/Atom/RDF document or a JSON Feed."""
+    head = body[:2048].lstrip().lower()
+    return b"<rss" in head or b"<feed" in head or b"<rdf" in head or is_json_feed(body)
+
+
+class FeedDiscoveryCache:
+    """
+    TTL cache of discovered feed URLs per source URL.
+    
+    Negative results (no feed found) are cached too, with a shorter TTL.
+    Entries are written through to the ``discovered_feeds`` MongoDB
+    collection when the database is connected.
+    """
+    
+    collection_name = "discovered_feeds"
+    
+    def __init__(self, ttl_hours: float = 168, negative_ttl_hours: float = 24):
+        self.ttl = timedelta(hours=ttl_hours)
+        self.negative_ttl = timedelta(hours=negative_ttl_hours)
+        self._cache: Dict[str, Dict] = {}
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    def _is_fresh(self, entry: Dict) -> bool:
+        ttl = self.ttl if entry.get("feed_url") else self.negative_ttl
+        return datetime.utcnow() - entry["discovered_at"] < ttl
+    
+    async def get(self, source_url: str) -> Optional[Dict]:
+        """Get a fresh cache entry, or None if missing or expired."""
+        entry = self._cache.get(source_url)
+        if entry is None:
+            collection = self._collection()
+            if collection is not None:
+                try:
+                    entry = await collection.find_one({"_id": source_url})
+                except Exception as e:
+                    logger.warning(f"Failed to load discovered feed for {source_url}: {str(e)}")
+                if entry:
+                    self._cache[source_url] = entry
+        if entry and self._is_fresh(entry):
+            return entry
+        return None
+    
+    async def set(self, source_url: str, feed_url: Optional[str]):
+        """Cache a discovery result (``None`` when no feed was found)."""
+        entry = {
+            "_id": source_url,
+            "feed_url": feed_url,
+            "discovered_at": datetime.utcnow(),
+        }
+        self._cache[source_url] = entry
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            await collection.replace_one({"_id": source_url}, entry, upsert=True)
+        except Exception as e:
+            logger.warning(f"Failed to save discovered feed for {source_url}: {str(e)}")
+
+
+class FeedDiscoverer(BaseScraper):
+    """Finds the RSS/Atom feed of a source from its homepage URL."""
+    
+    # Seconds allowed per probed feed location
+    probe_timeout = 10
+    # Feed locations probed at once
+    probe_concurrency = 4
+    
+    async def discover(self) -> Optional[str]:
+        """
+        Discover the feed URL for the source.
+        
+        Checks <link rel="alternate"> tags on the source page first, then
+        probes common feed paths (``/feed``, ``/rss.xml``, ...). Candidates
+        are probed ``probe_concurrency`` at a time, in order, and the first
+        one (in that order) that turns out to be a feed wins.
+        
+        Returns:
+            Feed URL or None if no feed was found
+        """
+        candidates = []
+        html = await self.fetch_page(self.source_url)
+        if html:
+            candidates += await run_in_parse_executor(find_feed_links, html, self.source_url)
+        candidates += [url for url in candidate_feed_urls(self.source_url) if url not in candidates]
+        
+        for start in range(0, len(candidates), self.probe_concurrency):
+            window = candidates[start:start + self.probe_concurrency]
+            results = await asyncio.gather(*(self._probe(candidate) for candidate in window))
+            for candidate, is_feed in zip(window, results):
+                if is_feed:
+                    logger.info(f"Discovered feed for {self.source_name}: {candidate}")
+                    return candidate
+        
+        logger.info(f"No feed found for {self.source_name} ({self.source_url})")
+        return None
+    
+    async def _probe(self, url: str) -> bool:
+        """Whether a candidate URL serves a feed."""
+        body = await self.fetch_bytes(url, timeout=self.probe_timeout)
+        return bool(body) and looks_like_feed(body)
+    
+    async def scrape_articles(self, max_articles: int = 10, skip_seen: bool = False) -> List[Article]:
+        """Discover the source feed and scrape it."""
+        feed_url = await self.discover()
+        if not feed_url:
+            return []
+        async with RSSFeedScraper(self.source_name, self.source_url, feed_url, self.user_agent) as scraper:
+            articles = await scraper.scrape_articles(max_articles, skip_seen=skip_seen)
+            self.unseen.update(scraper.unseen)
+            self.validated += scraper.validated
+            return articles
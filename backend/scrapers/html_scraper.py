@@ -0,0 +1,154 @@
+"""
+HTML listing-page scraper for sources that publish no feed.
+"""
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from .base_scraper import BaseScraper, Article, make_soup
+from .executor import run_in_parse_executor
+from .seen_index import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def extract_listing(html: str, base_url: str, rules: Dict, max_items: int) -> List[Dict]:
+    """
+    Extract article links, titles and dates from a listing page.
+    
+    Runs in the parse executor, so it only takes and returns plain data.
+    
+    Args:
+        html: Listing page HTML
+        base_url: URL the page was fetched from (for resolving relative links)
+        rules: Extraction rules (``item``, ``link``, ``title``, ``date``, ``summary`` CSS selectors)
+        max_items: Maximum number of items to return
+        
+    Returns:
+        List of dicts with ``url``, ``title``, ``date`` and ``summary`` keys
+    """
+    soup = make_soup(html, rules.get('parser', 'lxml'))
+    items = []
+    seen_urls = set()
+    
+    for node in soup.select(rules['item']):
+        # The item itself may be the link (e.g. a card wrapped in <a>)
+        link = node if node.name == 'a' and node.get('href') else node.select_one(rules.get('link', 'a[href]'))
+        if link is None or not link.get('href'):
+            continue
+        url = urljoin(base_url, link['href'])
+        if url in seen_urls:
+            continue
+        
+        title_node = node.select_one(rules['title']) if rules.get('title') else None
+        title = (title_node or link).get_text(" ", strip=True)
+        if not title:
+            continue
+        
+        date = None
+        if rules.get('date'):
+            date_node = node.select_one(rules['date'])
+            if date_node is not None:
+                date = date_node.get('datetime') or date_node.get_text(" ", strip=True)
+        
+        summary = None
+        if rules.get('summary'):
+            summary_node = node.select_one(rules['summary'])
+            if summary_node is not None:
+                summary = summary_node.get_text(" ", strip=True)
+        
+        seen_urls.add(url)
+        items.append({'url': url, 'title': title, 'date': date, 'summary': summary})
+        if len(items) >= max_items:
+            break
+    
+    return items
+
+
+class HTMLListingScraper(BaseScraper):
+    """
+    Scraper for blog/news listing pages, driven by per-source rules.
+    
+    Rules come from the source's ``listing`` entry in the sources config::
+    
+        "listing": {
+            "url": "https://example.com/blog",   # optional, defaults to the source url
+            "parser": "lxml",                     # lxml | html.parser | html5lib
+            "item": "article",                    # CSS selector for each entry
+            "link": "a[href]",                    # optional, within the item
+            "title": "h3",                        # optional, defaults to the link text
+            "date": "time",                       # optional, reads datetime= or text
+            "summary": "p"                        # optional
+        }
+    """
+    
+    def __init__(self, source_name: str, source_url: str, rules: Dict, user_agent: str):
+        super().__init__(source_name, source_url, user_agent)
+        self.rules = rules
+        self.listing_url = rules.get('url', source_url)
+        self.html_parser = rules.get('parser', 'lxml')
+    
+    async def scrape_articles(self, max_articles: int = 10, skip_seen: bool = False) -> List[Article]:
+        """
+        Scrape articles from the listing page.
+        
+        Args:
+            max_articles: Maximum number of articles to scrape
+            skip_seen: Skip entries already in the seen-article index
+            
+        Returns:
+            List of Article objects
+        """
+        articles = []
+        
+        try:
+            html = await self.fetch_page(self.listing_url)
+            if html is None:
+                return articles
+            
+            rules = dict(self.rules, parser=self.html_parser)
+            items = await run_in_parse_executor(extract_listing, html, self.listing_url, rules, max_articles)
+            
+            hashes = {
+                item['url']: content_hash(item['title'], item['url'], item.get('summary') or '')
+                for item in items
+            }
+            seen = await self.check_seen(hashes)
+            
+            for item in items:
+                if skip_seen and item['url'] in seen:
+                    continue
+                article = self._build_article(item)
+                if article:
+                    articles.append(article)
+                    if item['url'] not in seen:
+                        self.unseen[item['url']] = hashes[item['url']]
+            
+            logger.info(f"Scraped {len(articles)} articles from {self.source_name} listing page")
+            
+        except Exception as e:
+            logger.error(f"Error scraping listing page {self.listing_url}: {str(e)}")
+            self.failed = True
+        
+        return articles
+    
+    def _build_article(self, item: Dict) -> Optional[Article]:
+        """Build an Article from an extracted listing item."""
+        title = self.clean_text(item.get('title', ''))
+        if not title:
+            return None
+        
+        published_date = self.extract_date(item['date']) if item.get('date') else None
+        if published_date and published_date.tzinfo:
+            # Keep naive UTC like the RSS scraper
+            published_date = published_date.replace(tzinfo=None) - published_date.utcoffset()
+        
+        summary = self.clean_text(item['summary']) if item.get('summary') else None
+        
+        return Article(
+            title=title,
+            url=item['url'],
+            source=self.source_name,
+            published_date=published_date,
+            summary=summary
+        )
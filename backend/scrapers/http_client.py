@@ -0,0 +1,114 @@
+"""
+Process-wide pooled HTTP client shared by all scrapers.
+"""
+import logging
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import aiohttp
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Global shared session, owned by the app lifespan
+_session: Optional[aiohttp.ClientSession] = None
+
+# Pool counters collected through aiohttp tracing
+_stats: Dict[str, int] = {
+    "requests": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "dns_cache_hits": 0,
+    "dns_cache_misses": 0,
+}
+
+
+async def _on_request_start(session, ctx: SimpleNamespace, params):
+    _stats["requests"] += 1
+
+
+async def _on_connection_create_end(session, ctx: SimpleNamespace, params):
+    _stats["connections_created"] += 1
+
+
+async def _on_connection_reuseconn(session, ctx: SimpleNamespace, params):
+    _stats["connections_reused"] += 1
+
+
+async def _on_dns_cache_hit(session, ctx: SimpleNamespace, params):
+    _stats["dns_cache_hits"] += 1
+
+
+async def _on_dns_cache_miss(session, ctx: SimpleNamespace, params):
+    _stats["dns_cache_misses"] += 1
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace_config.on_dns_cache_hit.append(_on_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(_on_dns_cache_miss)
+    return trace_config
+
+
+def build_timeout() -> aiohttp.ClientTimeout:
+    """Build the default client timeout from settings."""
+    return aiohttp.ClientTimeout(
+        total=settings.http_total_timeout,
+        connect=settings.http_connect_timeout,
+        sock_read=settings.http_read_timeout
+    )
+
+
+async def start_http_client():
+    """Create the shared HTTP client with keep-alive and DNS caching."""
+    global _session
+    if _session is not None and not _session.closed:
+        return
+    connector = aiohttp.TCPConnector(
+        limit=settings.http_pool_limit,
+        limit_per_host=settings.http_pool_limit_per_host,
+        ttl_dns_cache=settings.http_dns_cache_ttl,
+        use_dns_cache=True,
+        keepalive_timeout=settings.http_keepalive_timeout,
+    )
+    _session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=build_timeout(),
+        trace_configs=[_build_trace_config()],
+    )
+    logger.info("Shared scraper HTTP client started")
+
+
+async def close_http_client():
+    """Close the shared HTTP client."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+        logger.info("Shared scraper HTTP client closed")
+
+
+def get_http_session() -> Optional[aiohttp.ClientSession]:
+    """Get the shared HTTP session, or None if it has not been started."""
+    if _session is None or _session.closed:
+        return None
+    return _session
+
+
+def get_pool_stats() -> Dict:
+    """Get connection pool statistics for the shared client."""
+    stats = dict(_stats)
+    new_or_reused = stats["connections_created"] + stats["connections_reused"]
+    stats["connection_reuse_rate"] = (
+        round(stats["connections_reused"] / new_or_reused, 4) if new_or_reused else 0.0
+    )
+    stats["active"] = _session is not None and not _session.closed
+    if stats["active"]:
+        connector = _session.connector
+        stats["limit"] = connector.limit
+        stats["limit_per_host"] = connector.limit_per_host
+    return stats
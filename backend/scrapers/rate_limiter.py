@@ -0,0 +1,92 @@
+"""
+Per-host token-bucket rate limiting for scraper requests.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` requests per second with bursts up to ``burst``."""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    """
+    Rate limits requests per host.
+    
+    Hosts listed in ``hosts`` match by domain suffix, so every
+    ``*.substack.com`` publication shares the ``substack.com`` bucket.
+    Other hosts get their own bucket with the default limits.
+    """
+    
+    def __init__(self, requests_per_second: float = 2.0, burst: int = 4, hosts: Optional[Dict] = None):
+        self.configure(requests_per_second, burst, hosts)
+    
+    def configure(self, requests_per_second: float = 2.0, burst: int = 4, hosts: Optional[Dict] = None):
+        """(Re)configure limits; existing buckets are dropped."""
+        self.default_rate = requests_per_second
+        self.default_burst = burst
+        self.hosts = hosts or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats = {"requests": 0, "throttled": 0, "wait_seconds": 0.0}
+    
+    def _bucket_for(self, host: str) -> TokenBucket:
+        key, limits = host, {}
+        # Longest configured suffix wins
+        for suffix in sorted(self.hosts, key=len, reverse=True):
+            if host == suffix or host.endswith("." + suffix):
+                key, limits = suffix, self.hosts[suffix]
+                break
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(
+                limits.get("requests_per_second", self.default_rate),
+                limits.get("burst", self.default_burst)
+            )
+            self._buckets[key] = bucket
+        return bucket
+    
+    async def acquire(self, url: str):
+        """Wait for permission to send a request to the host of ``url``."""
+        host = (urlparse(url).hostname or "").lower()
+        waited = await self._bucket_for(host).acquire()
+        self.stats["requests"] += 1
+        if waited > 0:
+            self.stats["throttled"] += 1
+            self.stats["wait_seconds"] += waited
+            logger.debug(f"Rate limited {host} for {waited:.2f}s")
+
+
+# Global limiter shared by all scrapers, configured from scraping_config at startup
+host_rate_limiter = HostRateLimiter()
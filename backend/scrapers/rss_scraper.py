@@ -1,15 +1,98 @@
 """
 RSS feed scraper for blog posts and news articles.
 """
+import json
 import logging
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 import feedparser
 from datetime import datetime
+from dateutil import parser as date_parser
 
 from .base_scraper import BaseScraper, Article
+from .executor import run_in_parse_executor
+from .seen_index import content_hash
 
 logger = logging.getLogger(__name__)
 
+# Last parsed articles per feed URL, reused when the feed is unchanged.
+# Maps feed URL -> (max_articles used, articles)
+_parsed_feeds: Dict[str, Tuple[int, List[Article]]] = {}
+
+
+def _plain(value):
+    """Copy FeedParserDicts (and lists of them) into plain dicts and lists."""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def is_json_feed(body: bytes) -> bool:
+    """Whether a response body is a JSON Feed document (https://jsonfeed.org)."""
+    if not body.lstrip().startswith(b"{"):
+        return False
+    try:
+        version = json.loads(body).get("version")
+    except (ValueError, AttributeError):
+        return False
+    return isinstance(version, str) and version.startswith("https://jsonfeed.org/")
+
+
+def _utc_time_tuple(value) -> Optional[time.struct_time]:
+    """A JSON Feed RFC 3339 date as a UTC struct_time, like feedparser's ``*_parsed``."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = date_parser.isoparse(value)
+    except (ValueError, OverflowError):
+        return None
+    return parsed.utctimetuple()
+
+
+def _json_feed_entry(item: Dict) -> Dict:
+    """A JSON Feed item in the entry layout feedparser produces for RSS/Atom."""
+    entry = {
+        'title': item.get('title') or '',
+        'link': item.get('url') or item.get('external_url') or '',
+        'published_parsed': _utc_time_tuple(item.get('date_published')),
+        'updated_parsed': _utc_time_tuple(item.get('date_modified')),
+        'tags': [{'term': tag} for tag in item.get('tags') or [] if isinstance(tag, str)],
+    }
+    body = item.get('content_html') or item.get('content_text')
+    if body:
+        entry['content'] = [{'value': body}]
+    summary = item.get('summary') or item.get('content_text')
+    if summary:
+        entry['summary'] = summary
+    return entry
+
+
+def parse_feed(body: bytes) -> Dict:
+    """
+    Parse a downloaded feed document (runs in the parse executor).
+    
+    Returns plain data that can be pickled back from a process pool:
+    ``entries`` as dicts, ``bozo`` as a flag and ``bozo_exception`` as its
+    message (the exception of a malformed feed is often not picklable).
+    JSON Feeds, which feedparser does not read, are converted to the same
+    entry layout.
+    """
+    if is_json_feed(body):
+        items = json.loads(body).get('items') or []
+        return {
+            'bozo': False,
+            'bozo_exception': None,
+            'entries': [_json_feed_entry(item) for item in items if isinstance(item, dict)],
+        }
+    feed = feedparser.parse(body)
+    return {
+        'bozo': bool(feed.get('bozo')),
+        'bozo_exception': str(feed['bozo_exception']) if feed.get('bozo_exception') else None,
+        'entries': [_plain(entry) for entry in feed.get('entries', [])],
+    }
+
 
 class RSSFeedScraper(BaseScraper):
     """Scraper for RSS/Atom feeds."""
@@ -18,44 +101,96 @@ class RSSFeedScraper(BaseScraper):
         super().__init__(source_name, source_url, user_agent)
         self.rss_feed_url = rss_feed_url
     
-    async def scrape_articles(self, max_articles: int = 10) -> List[Article]:
+    async def scrape_articles(self, max_articles: int = 10, skip_seen: bool = False) -> List[Article]:
         """
         Scrape articles from RSS feed.
         
         Args:
             max_articles: Maximum number of articles to scrape
+            skip_seen: Skip entries already in the seen-article index
             
         Returns:
             List of Article objects
         """
         articles = []
         
+        # Only revalidate when an unchanged answer can be served: from memory,
+        # or trivially when only new entries are wanted
+        previous = _parsed_feeds.get(self.rss_feed_url)
+        revalidate = skip_seen or (previous is not None and previous[0] >= max_articles)
+        
         try:
-            # Fetch RSS feed
-            feed = feedparser.parse(self.rss_feed_url)
+            # Download through the async session, then parse off the event loop
+            body = await self.fetch_bytes(
+                self.rss_feed_url,
+                conditional=True,
+                revalidate=revalidate
+            )
+            if self.not_modified:
+                logger.info(f"RSS feed for {self.source_name} unchanged, skipping parse")
+                if skip_seen or previous is None:
+                    return articles
+                return previous[1][:max_articles]
+            if body is None:
+                return articles
+            # New validators were just stored, so the cached parse no longer
+            # matches them; it is replaced below once this body is parsed
+            _parsed_feeds.pop(self.rss_feed_url, None)
+            
+            feed = await run_in_parse_executor(parse_feed, body)
             
-            if feed.bozo:
-                logger.warning(f"RSS feed parsing error for {self.source_name}: {feed.bozo_exception}")
+            if feed['bozo']:
+                logger.warning(f"RSS feed parsing error for {self.source_name}: {feed['bozo_exception']}")
             
-            # Process entries
-            for entry in feed.entries[:max_articles]:
+            entries = feed['entries'][:max_articles]
+            hashes = {
+                entry.get('link'): self._entry_hash(entry)
+                for entry in entries if entry.get('link')
+            }
+            seen = await self.check_seen(hashes)
+            
+            # Process entries; seen ones are parsed too, so the cached list is
+            # complete even when only new entries are returned
+            parsed = []
+            for entry in entries:
                 try:
                     article = self._parse_entry(entry)
-                    if article:
-                        articles.append(article)
                 except Exception as e:
                     logger.error(f"Error parsing RSS entry from {self.source_name}: {str(e)}")
                     continue
+                if not article:
+                    continue
+                parsed.append(article)
+                if article.url in seen:
+                    if skip_seen:
+                        continue
+                elif article.url in hashes:
+                    self.unseen[article.url] = hashes[article.url]
+                articles.append(article)
             
-            logger.info(f"Scraped {len(articles)} articles from {self.source_name} RSS feed")
+            _parsed_feeds[self.rss_feed_url] = (max_articles, parsed)
+            logger.info(
+                f"Scraped {len(articles)} articles from {self.source_name} RSS feed "
+                f"({len(hashes) - len(seen)} new, {len(seen)} seen)"
+            )
             
         except Exception as e:
             logger.error(f"Error scraping RSS feed {self.rss_feed_url}: {str(e)}")
+            self.failed = True
         
         return articles
     
-    def _parse_entry(self, entry) -> Optional[Article]:
-        """Parse a single RSS entry into an Article."""
+    @staticmethod
+    def _entry_hash(entry: Dict) -> str:
+        """Content hash over the raw entry fields (no cleaning needed)."""
+        return content_hash(
+            entry.get('title', ''),
+            entry.get('link', ''),
+            entry.get('summary', '') or entry.get('description', '')
+        )
+    
+    def _parse_entry(self, entry: Dict) -> Optional[Article]:
+        """Parse a single RSS entry (a plain dict from ``parse_feed``) into an Article."""
         # Extract title
         title = self.clean_text(entry.get('title', ''))
         if not title:
@@ -68,41 +203,35 @@ class RSSFeedScraper(BaseScraper):
         
         # Extract published date
         published_date = None
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        if entry.get('published_parsed'):
             try:
-                published_date = datetime(*entry.published_parsed[:6])
+                published_date = datetime(*entry['published_parsed'][:6])
             except Exception:
                 pass
         
-        if not published_date and hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        if not published_date and entry.get('updated_parsed'):
             try:
-                published_date = datetime(*entry.updated_parsed[:6])
+                published_date = datetime(*entry['updated_parsed'][:6])
             except Exception:
                 pass
         
-        # Extract content/summary
+        # Extract content/summary (feedparser stores <description> as summary)
         content = None
         summary = None
         
-        if hasattr(entry, 'content') and entry.content:
-            content = self.clean_text(entry.content[0].get('value', ''))
-        elif hasattr(entry, 'description'):
-            content = self.clean_text(entry.description)
+        if entry.get('content'):
+            content = self.clean_text(entry['content'][0].get('value', ''))
+        elif 'summary' in entry:
+            content = self.clean_text(entry['summary'])
         
-        if hasattr(entry, 'summary'):
-            summary = self.clean_text(entry.summary)
+        if 'summary' in entry:
+            summary = self.clean_text(entry['summary'])
         
         # Extract tags
-        tags = []
-        if hasattr(entry, 'tags'):
-            tags = [tag.get('term', '') for tag in entry.tags if tag.get('term')]
+        tags = [tag.get('term', '') for tag in entry.get('tags') or [] if tag.get('term')]
         
         # Extract category
-        category = None
-        if hasattr(entry, 'category'):
-            category = entry.category
-        elif tags:
-            category = tags[0]
+        category = entry.get('category') or (tags[0] if tags else None)
         
         return Article(
             title=title,
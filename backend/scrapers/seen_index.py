@@ -0,0 +1,161 @@
+"""
+Persistent index of already processed article URLs and content hashes.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, Set
+
+from pymongo import UpdateOne
+
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(*parts: str) -> str:
+    """Hash the raw fields that identify an article version."""
+    return hashlib.sha1("\x1f".join(p or "" for p in parts).encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+    
+    def __init__(self, capacity: int = 1_000_000, num_hashes: int = 7):
+        # ~10 bits per item gives about 1% false positives with 7 hashes
+        self.num_bits = capacity * 10
+        self.num_hashes = num_hashes
+        self.bits = bytearray(self.num_bits // 8 + 1)
+    
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenIndex:
+    """
+    Index of processed articles keyed by URL, with their content hash.
+    
+    The ``seen_articles`` MongoDB collection (``_id`` = URL, so unique) is
+    the source of truth; a Bloom filter of ``url + hash`` keys in front of
+    it answers most "new article" checks without a database round trip.
+    Without a database connection an in-memory map is used instead.
+    """
+    
+    collection_name = "seen_articles"
+    
+    def __init__(self, capacity: int = 1_000_000):
+        self.bloom = BloomFilter(capacity)
+        self._warmed = False
+        self._local: Dict[str, str] = {}
+        # Cumulative new/seen counts per source name
+        self.stats: Dict[str, Dict[str, int]] = {}
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    @staticmethod
+    def _key(url: str, digest: str) -> str:
+        return f"{url}\x00{digest}"
+    
+    async def _warm(self, collection):
+        """Load existing index entries into the Bloom filter once."""
+        if self._warmed:
+            return
+        self._warmed = True
+        try:
+            async for doc in collection.find({}, {"content_hash": 1}):
+                self.bloom.add(self._key(doc["_id"], doc.get("content_hash", "")))
+        except Exception as e:
+            logger.warning(f"Failed to warm seen-article index: {str(e)}")
+    
+    async def find_seen(self, hashes: Dict[str, str]) -> Set[str]:
+        """
+        Find which URLs were already processed with the same content.
+        
+        Args:
+            hashes: Map of article URL to content hash
+            
+        Returns:
+            URLs whose stored hash matches (changed articles count as new)
+        """
+        collection = self._collection()
+        if collection is None:
+            return {url for url, digest in hashes.items() if self._local.get(url) == digest}
+        
+        await self._warm(collection)
+        # Bloom negatives are definitely new; only possible hits go to Mongo
+        maybe_seen = [url for url, digest in hashes.items() if self._key(url, digest) in self.bloom]
+        if not maybe_seen:
+            return set()
+        try:
+            cursor = collection.find({"_id": {"$in": maybe_seen}}, {"content_hash": 1})
+            return {doc["_id"] async for doc in cursor if doc.get("content_hash") == hashes[doc["_id"]]}
+        except Exception as e:
+            logger.warning(f"Failed to query seen-article index: {str(e)}")
+            return set()
+    
+    async def mark_seen(self, source: str, hashes: Dict[str, str]):
+        """Record articles as processed."""
+        for url, digest in hashes.items():
+            self.bloom.add(self._key(url, digest))
+        collection = self._collection()
+        if collection is None:
+            self._local.update(hashes)
+            return
+        if not hashes:
+            return
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"_id": url},
+                {
+                    "$set": {"content_hash": digest, "source": source, "last_seen": now},
+                    "$setOnInsert": {"first_seen": now},
+                },
+                upsert=True
+            )
+            for url, digest in hashes.items()
+        ]
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.warning(f"Failed to update seen-article index: {str(e)}")
+    
+    def record(self, source: str, new: int, seen: int):
+        """Add to the per-source new/seen counters."""
+        counts = self.stats.setdefault(source, {"new": 0, "seen": 0})
+        counts["new"] += new
+        counts["seen"] += seen
+    
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of the per-source counters (diff two snapshots for per-run numbers)."""
+        return {source: dict(counts) for source, counts in self.stats.items()}
+
+
+def diff_source_counts(before: Dict[str, Dict[str, int]], after: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    """Per-source new/seen counts between two snapshots."""
+    result = {}
+    for source, counts in after.items():
+        previous = before.get(source, {"new": 0, "seen": 0})
+        delta = {key: counts[key] - previous.get(key, 0) for key in counts}
+        if any(delta.values()):
+            result[source] = delta
+    return result
+
+
+# Global seen-article index
+seen_index = SeenIndex()
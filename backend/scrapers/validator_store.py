@@ -0,0 +1,110 @@
+"""
+Persistent store of HTTP cache validators (ETag, Last-Modified, content hash) per URL.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+
+class ValidatorStore:
+    """
+    Keeps conditional-GET validators per URL.
+    
+    Entries are cached in memory and written through to the
+    ``http_validators`` MongoDB collection when the database is connected,
+    so validators survive restarts.
+    """
+    
+    collection_name = "http_validators"
+    
+    def __init__(self):
+        self._cache: Dict[str, Dict] = {}
+        self.stats: Dict[str, int] = {
+            "conditional_requests": 0,
+            "not_modified": 0,
+            "unchanged_content": 0,
+            "changed": 0,
+            "bytes_saved": 0,
+        }
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    async def get(self, url: str) -> Optional[Dict]:
+        """Get stored validators for a URL."""
+        if url in self._cache:
+            return self._cache[url]
+        collection = self._collection()
+        if collection is None:
+            return None
+        try:
+            doc = await collection.find_one({"_id": url})
+        except Exception as e:
+            logger.warning(f"Failed to load validators for {url}: {str(e)}")
+            return None
+        if doc:
+            self._cache[url] = doc
+        return doc
+    
+    async def save(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_hash: str,
+        content_length: int
+    ):
+        """Store validators for a URL."""
+        doc = {
+            "_id": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+            "content_length": content_length,
+            "updated_at": datetime.utcnow(),
+        }
+        self._cache[url] = doc
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            await collection.replace_one({"_id": url}, doc, upsert=True)
+        except Exception as e:
+            logger.warning(f"Failed to save validators for {url}: {str(e)}")
+    
+    async def forget(self, url: str):
+        """Drop the validators of a URL, so the next fetch is unconditional."""
+        self._cache.pop(url, None)
+        collection = self._collection()
+        if collection is None:
+            return
+        try:
+            await collection.delete_one({"_id": url})
+        except Exception as e:
+            logger.warning(f"Failed to drop validators for {url}: {str(e)}")
+    
+    def conditional_headers(self, validators: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from stored validators."""
+        headers = {}
+        if not validators:
+            return headers
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Copy of the cumulative counters (diff two snapshots for per-run numbers)."""
+        return dict(self.stats)
+
+
+# Global validator store instance
+validator_store = ValidatorStore()
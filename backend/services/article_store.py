@@ -0,0 +1,161 @@
+"""
+Persistent store of scraped articles.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from database import get_database
+from services.pagination import keyset_filter, keyset_sort, page_in_memory, to_millis
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_iso(value) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+class ArticleStore:
+    """
+    Scraped articles keyed by URL in the ``articles`` MongoDB collection.
+    
+    Dates are stored as datetimes for indexing and returned as ISO strings,
+    matching ``Article.to_dict()``. Without a database connection articles
+    are kept in memory.
+    """
+    
+    collection_name = "articles"
+    
+    def __init__(self):
+        self._local: Dict[str, Dict] = {}
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    async def ensure_indexes(self):
+        """Create the indexes used by the read paths."""
+        collection = self._collection()
+        if collection is None:
+            return
+        await collection.create_index([("published_date", DESCENDING), ("_id", DESCENDING)])
+        await collection.create_index([("source", ASCENDING), ("published_date", DESCENDING), ("_id", DESCENDING)])
+    
+    @staticmethod
+    def _to_document(article: Dict) -> Dict:
+        # Millisecond precision, as MongoDB stores them, so in-memory and
+        # freshly scraped pages give the same cursors as stored ones
+        doc = dict(article)
+        published_date = _parse_iso(article.get("published_date"))
+        doc["published_date"] = to_millis(published_date) if published_date else None
+        doc["scraped_at"] = to_millis(_parse_iso(article.get("scraped_at")) or datetime.utcnow())
+        return doc
+    
+    @staticmethod
+    def _to_article(doc: Dict) -> Dict:
+        article = {key: value for key, value in doc.items() if key != "_id"}
+        for key in ("published_date", "scraped_at"):
+            if isinstance(article.get(key), datetime):
+                article[key] = article[key].isoformat()
+        return article
+    
+    async def save_many(self, articles: List[Dict]) -> bool:
+        """Upsert articles by URL; returns whether they were stored."""
+        articles = [a for a in articles if a.get("url")]
+        if not articles:
+            return True
+        collection = self._collection()
+        if collection is None:
+            for article in articles:
+                self._local[article["url"]] = self._to_document(article)
+            return True
+        operations = [
+            UpdateOne({"_id": article["url"]}, {"$set": self._to_document(article)}, upsert=True)
+            for article in articles
+        ]
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.warning(f"Failed to store {len(articles)} articles: {str(e)}")
+            return False
+        return True
+    
+    async def recent(self, since: datetime, limit: int = 5000) -> List[Dict]:
+        """Articles published after ``since``, newest first."""
+        collection = self._collection()
+        if collection is None:
+            docs = [d for d in self._local.values() if d.get("published_date") and d["published_date"] > since]
+            docs.sort(key=lambda d: d["published_date"], reverse=True)
+            return [self._to_article(d) for d in docs[:limit]]
+        try:
+            cursor = collection.find({"published_date": {"$gt": since}}).sort("published_date", DESCENDING).limit(limit)
+            return [self._to_article(doc) async for doc in cursor]
+        except Exception as e:
+            logger.warning(f"Failed to read stored articles: {str(e)}")
+            return []
+    
+    @classmethod
+    def first_page(cls, articles: List[Dict], limit: int) -> Tuple[List[Dict], Optional[Tuple[Any, Any]]]:
+        """
+        Order freshly scraped articles like ``page`` and keep the first ``limit``.
+        
+        Scraped articles are stored as they are scraped, so the returned key
+        continues the listing with ``page``.
+        """
+        docs = [{**cls._to_document(a), "_id": a["url"]} for a in articles if a.get("url")]
+        docs = page_in_memory(docs, "published_date", limit + 1)
+        more = len(docs) > limit
+        docs = docs[:limit]
+        next_key = (docs[-1].get("published_date"), docs[-1]["_id"]) if more else None
+        return [cls._to_article(doc) for doc in docs], next_key
+    
+    async def page(
+        self,
+        limit: int = 50,
+        after: Optional[Tuple[Any, Any]] = None,
+        source: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[Tuple[Any, Any]]]:
+        """
+        One page of articles, newest first, by keyset on (published_date, _id).
+        
+        ``after`` is the (published_date, _id) of the last article of the
+        previous page. Returns the articles and the key to continue after,
+        or None on the last page.
+        """
+        query = {"source": source} if source else {}
+        collection = self._collection()
+        if collection is None:
+            docs = [
+                {**doc, "_id": url} for url, doc in self._local.items()
+                if not source or doc.get("source") == source
+            ]
+            docs = page_in_memory(docs, "published_date", limit + 1, after)
+        else:
+            if after is not None:
+                query.update(keyset_filter("published_date", *after))
+            try:
+                cursor = collection.find(query).sort(keyset_sort("published_date")).limit(limit + 1)
+                docs = [doc async for doc in cursor]
+            except Exception as e:
+                logger.warning(f"Failed to page stored articles: {str(e)}")
+                return [], None
+        
+        more = len(docs) > limit
+        docs = docs[:limit]
+        next_key = (docs[-1].get("published_date"), docs[-1]["_id"]) if more else None
+        return [self._to_article(doc) for doc in docs], next_key
+
+
+# Global article store
+article_store = ArticleStore()
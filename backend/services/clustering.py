@@ -0,0 +1,198 @@
+"""
+Local pre-clustering of articles with sparse hashed TF-IDF vectors and spherical k-means.
+"""
+import hashlib
+import logging
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+HASH_DIM = 1 << 12
+KMEANS_ITERATIONS = 25
+TOP_TERMS = 8
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+\-]*[a-z0-9+]|[a-z0-9]")
+_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers him his how i if in into is it its itself just like make makes made many may me more most
+much must my new news no nor not now of off on once only or other our ours out over own per said same says
+she should so some such than that the their them then there these they this those through to too under
+until up use used using very via was we were what when where which while who whom why will with would
+year years you your
+""".split())
+
+
+def _tokens(article: Dict) -> List[str]:
+    """Unigram and bigram terms of an article; the title counts twice."""
+    title = article.get('title') or ''
+    summary = article.get('summary') or article.get('content') or ''
+    words = [
+        w for w in _WORD_RE.findall(f"{title} {title} {summary}".lower())
+        if w not in _STOPWORDS and len(w) > 1
+    ]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _feature(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest(), "little") % HASH_DIM
+
+
+def _term_counts(documents: List[List[str]]) -> sp.csr_matrix:
+    """Hashed term counts, one CSR row per document."""
+    rows, cols = [], []
+    for i, terms in enumerate(documents):
+        rows.extend([i] * len(terms))
+        cols.extend(_feature(t) for t in terms)
+    counts = sp.csr_matrix(
+        (np.ones(len(cols), dtype=np.float32), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(len(documents), HASH_DIM)
+    )
+    counts.sum_duplicates()
+    return counts
+
+
+def _normalize_rows(matrix: sp.csr_matrix) -> sp.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.csr_matrix(sp.diags((1 / norms).astype(np.float32)) @ matrix)
+
+
+def dense_sum(matrix: sp.csr_matrix) -> np.ndarray:
+    """Sum of the rows of a sparse matrix as a dense vector."""
+    return np.asarray(matrix.sum(axis=0), dtype=np.float32).ravel()
+
+
+def vectorize(documents: List[List[str]]) -> sp.csr_matrix:
+    """L2-normalized TF-IDF rows over hashed term features, in CSR layout."""
+    n = len(documents)
+    matrix = _term_counts(documents)
+    df = np.bincount(matrix.indices, minlength=HASH_DIM)
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    matrix.data = np.log1p(matrix.data) * idf[matrix.indices]
+    return _normalize_rows(matrix)
+
+
+def term_vectors(articles: List[Dict]) -> sp.csr_matrix:
+    """
+    L2-normalized log-TF rows over hashed term features, in CSR layout.
+    
+    Unlike ``vectorize`` there is no corpus IDF, so vectors from different
+    runs are comparable (used to match articles against stored trend centroids).
+    """
+    matrix = _term_counts([_tokens(a) for a in articles])
+    matrix.data = np.log1p(matrix.data)
+    return _normalize_rows(matrix)
+
+
+def article_terms(article: Dict) -> set:
+    """Unigram and bigram terms of an article, for keyword matching."""
+    return set(_tokens(article))
+
+
+def spherical_kmeans(matrix: sp.csr_matrix, k: int, seed: int = 0) -> np.ndarray:
+    """
+    Cluster sparse unit rows by cosine similarity; returns a label per row.
+    
+    Only the ``k`` centroids are dense; similarities are sparse-dense products.
+    """
+    n = matrix.shape[0]
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    
+    # k-means++ seeding on cosine distance
+    centroids = np.empty((k, matrix.shape[1]), dtype=np.float32)
+    centroids[0] = matrix[rng.integers(n)].toarray().ravel()
+    distance = 1 - matrix @ centroids[0]
+    for c in range(1, k):
+        weights = np.clip(distance, 0, None) ** 2
+        total = weights.sum()
+        index = rng.choice(n, p=weights / total) if total > 0 else rng.integers(n)
+        centroids[c] = matrix[index].toarray().ravel()
+        distance = np.minimum(distance, 1 - matrix @ centroids[c])
+    
+    labels = np.full(n, -1)
+    for _ in range(KMEANS_ITERATIONS):
+        new_labels = np.argmax(matrix @ centroids.T, axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        # Per-cluster row sums in one product with a cluster-membership matrix
+        membership = sp.csr_matrix(
+            (np.ones(n, dtype=np.float32), (labels, np.arange(n))),
+            shape=(k, n)
+        )
+        sums = (membership @ matrix).toarray()
+        norms = np.linalg.norm(sums, axis=1)
+        filled = norms > 0
+        # Empty clusters keep their previous centroid
+        centroids[filled] = sums[filled] / norms[filled, None]
+    return labels
+
+
+def _published(article: Dict) -> Optional[datetime]:
+    value = article.get('published_date')
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def cluster_articles(articles: List[Dict], max_clusters: int = 40) -> List[Dict]:
+    """
+    Group articles into topical clusters.
+    
+    The cluster count is about the square root of the article count, capped
+    at ``max_clusters``. Returns clusters largest first, each with:
+    
+    - ``members``: article indices, most central first
+    - ``size``, ``sources`` (publisher -> count), ``high_priority``
+    - ``cohesion``: mean cosine similarity of members to the centroid
+    - ``top_terms``: highest TF-IDF terms, ``oldest``/``newest`` dates
+    """
+    if not articles:
+        return []
+    documents = [_tokens(a) for a in articles]
+    matrix = vectorize(documents)
+    k = min(max_clusters, max(1, round(math.sqrt(len(articles)))))
+    labels = spherical_kmeans(matrix, k)
+    
+    document_frequency = Counter(term for terms in documents for term in set(terms))
+    n = len(articles)
+    clusters = []
+    for c in np.unique(labels):
+        indices = np.flatnonzero(labels == c)
+        rows = matrix[indices]
+        centroid = dense_sum(rows) / len(indices)
+        similarity = rows @ centroid / (np.linalg.norm(centroid) or 1.0)
+        order = indices[np.argsort(-similarity, kind="stable")]
+        
+        term_weights = Counter()
+        for i in indices:
+            for term, count in Counter(documents[i]).items():
+                term_weights[term] += (1 + math.log(count)) * math.log((1 + n) / (1 + document_frequency[term]))
+        dates = [d for d in (_published(articles[i]) for i in indices) if d]
+        members = [articles[i] for i in indices]
+        clusters.append({
+            'members': [int(i) for i in order],
+            'size': int(len(indices)),
+            'sources': dict(Counter(a.get('source') or 'Unknown' for a in members).most_common()),
+            'high_priority': sum(1 for a in members if a.get('priority') == 'high'),
+            'cohesion': round(float(similarity.mean()), 3),
+            'top_terms': [term for term, _ in term_weights.most_common(TOP_TERMS)],
+            'oldest': min(dates).isoformat() if dates else None,
+            'newest': max(dates).isoformat() if dates else None,
+        })
+    
+    clusters.sort(key=lambda cl: (-cl['size'], -len(cl['sources'])))
+    logger.info(f"Clustered {len(articles)} articles into {len(clusters)} clusters")
+    return clusters
@@ -0,0 +1,135 @@
+"""
+Near-duplicate article detection with MinHash signatures and LSH banding.
+"""
+import hashlib
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+SHINGLE_SIZE = 3
+MAX_SHINGLE_WORDS = 300
+_PRIME = np.uint64((1 << 31) - 1)
+
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(1, (1 << 31) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, (1 << 31) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """31-bit hashes of the word shingles of a text."""
+    words = _WORD_RE.findall(text.lower())[:MAX_SHINGLE_WORDS]
+    if len(words) >= SHINGLE_SIZE:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = set(words)
+    if not shingles:
+        return np.empty(0, dtype=np.uint64)
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") & 0x7FFFFFFF
+         for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature of a text (NUM_PERMUTATIONS values)."""
+    hashes = _shingle_hashes(text)
+    if hashes.size == 0:
+        return np.full(NUM_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    # (a * x + b) mod p for every permutation/shingle pair, then the row minimum
+    return ((_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME).min(axis=1)
+
+
+def _article_text(article: Dict) -> str:
+    summary = article.get('summary') or article.get('content') or ''
+    return f"{article.get('title', '')} {summary}"
+
+
+def _published(article: Dict) -> str:
+    published = article.get('published_date') or ''
+    if isinstance(published, datetime):
+        return published.isoformat()
+    return published or '9999'
+
+
+def dedupe_articles(articles: List[Dict], threshold: float = 0.6) -> List[Dict]:
+    """
+    Collapse near-duplicate articles into one representative each.
+    
+    Candidate pairs come from LSH buckets over MinHash signatures (linear in
+    the number of articles) and are confirmed when their estimated Jaccard
+    similarity reaches ``threshold``. The earliest-published article of a
+    cluster is kept and the others are listed under its ``duplicates`` key
+    (title, url, source, published_date), so no source reference is lost.
+    
+    Args:
+        articles: Article dictionaries
+        threshold: Minimum estimated Jaccard similarity of title + summary shingles
+        
+    Returns:
+        Representative articles, in input order
+    """
+    n = len(articles)
+    if n < 2:
+        return articles
+    
+    signatures = np.vstack([minhash_signature(_article_text(a)) for a in articles])
+    rows = NUM_PERMUTATIONS // BANDS
+    
+    parent = list(range(n))
+    
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for band in range(BANDS):
+        buckets: Dict[bytes, int] = {}
+        band_rows = signatures[:, band * rows:(band + 1) * rows]
+        for i in range(n):
+            key = band_rows[i].tobytes()
+            first = buckets.setdefault(key, i)
+            if first == i:
+                continue
+            root_i, root_first = find(i), find(first)
+            if root_i == root_first:
+                continue
+            if np.mean(signatures[i] == signatures[first]) >= threshold:
+                parent[root_i] = root_first
+    
+    clusters: Dict[int, List[int]] = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+    
+    representatives = []
+    for members in clusters.values():
+        members.sort(key=lambda i: (_published(articles[i]), -len(articles[i].get('summary') or '')))
+        keep = dict(articles[members[0]])
+        if len(members) > 1:
+            keep['duplicates'] = [
+                {
+                    'title': articles[i].get('title'),
+                    'url': articles[i].get('url'),
+                    'source': articles[i].get('source'),
+                    'published_date': articles[i].get('published_date'),
+                }
+                for i in members[1:]
+            ]
+        representatives.append((members[0], keep))
+    
+    representatives.sort(key=lambda item: item[0])
+    result = [article for _, article in representatives]
+    if len(result) < n:
+        logger.info(f"Collapsed {n} articles into {len(result)} after near-duplicate detection")
+    return result
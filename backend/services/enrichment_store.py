@@ -0,0 +1,89 @@
+"""
+Persistent store of AI enrichments per trend version.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import ReplaceOne
+
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+
+def enrichment_version(trend: Dict, model: str, prompt_version: str) -> str:
+    """Hash of the trend fields the enrichment prompt reads, plus model and prompt version."""
+    payload = json.dumps(
+        {
+            "title": trend.get("title", ""),
+            "headline": trend.get("headline", ""),
+            "whyTrend": trend.get("whyTrend", ""),
+            "model": model,
+            "prompt_version": prompt_version,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EnrichmentStore:
+    """
+    Enrichment results keyed by ``enrichment_version``.
+    
+    Entries are cached in memory and written through to the
+    ``trend_enrichments`` MongoDB collection when the database is
+    connected, so each trend version is enriched once.
+    """
+    
+    collection_name = "trend_enrichments"
+    
+    def __init__(self):
+        self._cache: Dict[str, Dict] = {}
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    async def get_many(self, versions: List[str]) -> Dict[str, Dict]:
+        """Stored enrichments for the given versions."""
+        found = {v: self._cache[v] for v in versions if v in self._cache}
+        missing = [v for v in set(versions) if v not in found]
+        collection = self._collection()
+        if not missing or collection is None:
+            return found
+        try:
+            async for doc in collection.find({"_id": {"$in": missing}}):
+                self._cache[doc["_id"]] = doc["enrichment"]
+                found[doc["_id"]] = doc["enrichment"]
+        except Exception as e:
+            logger.warning(f"Failed to load trend enrichments: {str(e)}")
+        return found
+    
+    async def save_many(self, enrichments: Dict[str, Dict]):
+        """Store enrichments by version."""
+        if not enrichments:
+            return
+        self._cache.update(enrichments)
+        collection = self._collection()
+        if collection is None:
+            return
+        now = datetime.utcnow()
+        try:
+            await collection.bulk_write(
+                [
+                    ReplaceOne({"_id": v}, {"_id": v, "enrichment": e, "created_at": now}, upsert=True)
+                    for v, e in enrichments.items()
+                ],
+                ordered=False
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store {len(enrichments)} trend enrichments: {str(e)}")
+
+
+# Global enrichment store
+enrichment_store = EnrichmentStore()
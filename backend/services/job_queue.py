@@ -0,0 +1,257 @@
+"""
+Bounded background job queue with stage progress recorded in MongoDB.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from pymongo import ASCENDING
+
+from config import settings
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Fields kept for bookkeeping but not returned to API clients
+INTERNAL_FIELDS = ("_id", "expires_at")
+FINISHED = ("succeeded", "failed")
+
+# A job body gets a callback to report each stage as it starts and returns the job result
+JobBody = Callable[[Callable[[str], Awaitable[None]]], Awaitable[Dict]]
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while too many jobs are waiting."""
+
+
+def _elapsed_ms(since: str, until: datetime) -> int:
+    return round((until - datetime.fromisoformat(since)).total_seconds() * 1000)
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a fixed number of worker tasks.
+    
+    Submitting a job with the key of a queued or running job attaches to
+    that job instead of starting another. Every state change (queued,
+    running, each stage, succeeded or failed) is written to the
+    ``jobs`` MongoDB collection, where job records expire after
+    ``ttl_hours``; recent jobs are also kept in memory, which is all there
+    is without a database connection.
+    """
+    
+    collection_name = "jobs"
+    
+    def __init__(
+        self,
+        kind: str,
+        workers: int = 2,
+        max_pending: int = 20,
+        ttl_hours: int = 72,
+        history: int = 200
+    ):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl_hours = ttl_hours
+        self.history = history
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Key -> id of the queued or running job for it
+        self._active: Dict[Hashable, str] = {}
+        # Recent jobs by id, oldest first
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.stats = {"submitted": 0, "attached": 0, "succeeded": 0, "failed": 0}
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    async def ensure_indexes(self):
+        """Create the TTL index that expires old job records."""
+        collection = self._collection()
+        if collection is None:
+            return
+        await collection.create_index("expires_at", expireAfterSeconds=0)
+        await collection.create_index([("kind", ASCENDING), ("created_at", ASCENDING)])
+    
+    @staticmethod
+    def to_job(doc: Dict) -> Dict:
+        """Public job payload of a stored document."""
+        return {key: value for key, value in doc.items() if key not in INTERNAL_FIELDS}
+    
+    async def _save(self, job: Dict):
+        collection = self._collection()
+        if collection is None:
+            return
+        doc = {**job, "_id": job["id"], "expires_at": datetime.utcnow() + timedelta(hours=self.ttl_hours)}
+        try:
+            await collection.replace_one({"_id": job["id"]}, doc, upsert=True)
+        except Exception as e:
+            logger.warning(f"Failed to record job {job['id']}: {str(e)}")
+    
+    def _remember(self, job: Dict):
+        self._jobs[job["id"]] = job
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.history:
+                break
+            if self._jobs[job_id]["status"] in FINISHED:
+                del self._jobs[job_id]
+    
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+    
+    async def submit(self, key: Hashable, parameters: Dict, body: JobBody) -> Tuple[Dict, bool]:
+        """
+        Queue a job, or attach to the queued or running job with the same key.
+        
+        Returns:
+            The job and whether it was attached to an existing one
+        
+        Raises:
+            QueueFullError: If ``max_pending`` jobs are already waiting
+        """
+        job_id = self._active.get(key)
+        if job_id is not None:
+            self.stats["attached"] += 1
+            return self.to_job(self._jobs[job_id]), True
+        
+        waiting = sum(1 for active_id in self._active.values() if self._jobs[active_id]["status"] == "queued")
+        if waiting >= self.max_pending:
+            raise QueueFullError(f"{waiting} {self.kind} jobs are already waiting")
+        
+        job = {
+            "id": f"job-{uuid.uuid4().hex[:12]}",
+            "kind": self.kind,
+            "status": "queued",
+            "parameters": parameters,
+            "stage": None,
+            "stages": [],
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "queue_ms": None,
+            "duration_ms": None,
+            "result": None,
+            "error": None,
+        }
+        self._remember(job)
+        self._active[key] = job["id"]
+        self.stats["submitted"] += 1
+        self._ensure_workers()
+        self._queue.put_nowait((key, job, body))
+        await self._save(job)
+        logger.info(f"Queued {self.kind} job {job['id']}: {parameters}")
+        return self.to_job(job), False
+    
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """A job by id, from memory or the database."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return self.to_job(job)
+        collection = self._collection()
+        if collection is None:
+            return None
+        try:
+            doc = await collection.find_one({"_id": job_id, "kind": self.kind})
+        except Exception as e:
+            logger.warning(f"Failed to read job {job_id}: {str(e)}")
+            return None
+        return self.to_job(doc) if doc else None
+    
+    async def _worker(self):
+        while True:
+            key, job, body = await self._queue.get()
+            try:
+                await self._run(job, body)
+            finally:
+                self._active.pop(key, None)
+                self._queue.task_done()
+    
+    async def _enter_stage(self, job: Dict, name: str):
+        self._end_stage(job, datetime.utcnow())
+        job["stage"] = name
+        job["stages"].append({
+            "name": name,
+            "started_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "duration_ms": None,
+        })
+        await self._save(job)
+    
+    @staticmethod
+    def _end_stage(job: Dict, now: datetime):
+        if job["stages"] and job["stages"][-1]["finished_at"] is None:
+            stage = job["stages"][-1]
+            stage["finished_at"] = now.isoformat()
+            stage["duration_ms"] = _elapsed_ms(stage["started_at"], now)
+    
+    def _finish(self, job: Dict, status: str, error: Optional[str] = None):
+        now = datetime.utcnow()
+        self._end_stage(job, now)
+        job["status"] = status
+        job["stage"] = None
+        job["error"] = error
+        job["finished_at"] = now.isoformat()
+        if job["started_at"]:
+            job["duration_ms"] = _elapsed_ms(job["started_at"], now)
+        self.stats[status] += 1
+    
+    async def _run(self, job: Dict, body: JobBody):
+        now = datetime.utcnow()
+        job["status"] = "running"
+        job["started_at"] = now.isoformat()
+        job["queue_ms"] = _elapsed_ms(job["created_at"], now)
+        await self._save(job)
+        try:
+            job["result"] = await body(lambda name: self._enter_stage(job, name))
+            self._finish(job, "succeeded")
+        except asyncio.CancelledError:
+            self._finish(job, "failed", "Interrupted by shutdown")
+            await self._save(job)
+            raise
+        except Exception as e:
+            logger.error(f"{self.kind} job {job['id']} failed: {str(e)}")
+            self._finish(job, "failed", str(e))
+        await self._save(job)
+        logger.info(f"{self.kind} job {job['id']} {job['status']} in {job['duration_ms']}ms")
+    
+    async def stop(self):
+        """Cancel running jobs and fail the ones still waiting."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            key, job, _ = self._queue.get_nowait()
+            self._finish(job, "failed", "Interrupted by shutdown")
+            self._active.pop(key, None)
+            await self._save(job)
+    
+    def snapshot(self) -> Dict:
+        """Counters plus the number of queued and running jobs."""
+        statuses = [self._jobs[job_id]["status"] for job_id in self._active.values()]
+        return {
+            **self.stats,
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "workers": self.workers,
+        }
+
+
+# Global discover job queue
+discover_jobs = JobQueue(
+    "discover",
+    workers=settings.discover_job_workers,
+    max_pending=settings.discover_job_max_pending,
+    ttl_hours=settings.discover_job_ttl_hours
+)
@@ -0,0 +1,108 @@
+"""
+Incremental JSON parsing of streamed model output.
+"""
+import json
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JsonArrayStream:
+    """
+    Yield the objects of a streamed JSON array as soon as each one closes.
+    
+    The array is either the top-level value or the value of ``array_key``
+    in a top-level object, e.g. ``{"trends": [{...}, {...}]}``. Text is fed
+    in arbitrary chunks; the parser only tracks string, escape and nesting
+    state, and hands each complete element to ``json.loads``. Anything
+    outside the document (such as a markdown code fence) is ignored. The
+    full text is kept in ``text`` so callers can fall back to parsing the
+    whole document.
+    """
+    
+    def __init__(self, array_key: str = "trends"):
+        self.array_key = array_key
+        self._chunks: List[str] = []
+        # Open containers, '{' or '['
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        # Characters of the current top-level key, while one is being read
+        self._key: Optional[List[str]] = None
+        self._expect_key = False
+        self._last_key: Optional[str] = None
+        # Nesting depth inside the target array, once it has opened
+        self._array_depth: Optional[int] = None
+        # Characters of the element being read
+        self._element: Optional[List[str]] = None
+        self.emitted = 0
+    
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._chunks)
+    
+    def feed(self, text: str) -> List[Dict]:
+        """Consume a chunk of text; returns the elements completed by it."""
+        self._chunks.append(text)
+        completed = []
+        for char in text:
+            if self._element is not None:
+                self._element.append(char)
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key is not None:
+                        self._last_key = "".join(self._key)
+                        self._key = None
+                    continue
+                if self._key is not None:
+                    self._key.append(char)
+                continue
+            
+            if char == '"':
+                self._in_string = True
+                if self._expect_key and self._stack == ["{"]:
+                    self._key = []
+                    self._expect_key = False
+            elif char == "," and self._stack == ["{"]:
+                self._expect_key = True
+            elif char in "{[":
+                depth = len(self._stack)
+                if char == "{" and self._array_depth is not None and depth == self._array_depth:
+                    self._element = ["{"]
+                elif char == "[" and self._array_depth is None and (
+                    depth == 0 or (self._stack == ["{"] and self._last_key == self.array_key)
+                ):
+                    self._array_depth = depth + 1
+                self._stack.append(char)
+                self._expect_key = self._stack == ["{"]
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                depth = len(self._stack)
+                if char == "}" and self._element is not None and depth == self._array_depth:
+                    element = self._finish_element()
+                    if element is not None:
+                        completed.append(element)
+                elif char == "]" and self._array_depth is not None and depth == self._array_depth - 1:
+                    self._array_depth = None
+        return completed
+    
+    def _finish_element(self) -> Optional[Dict]:
+        raw = "".join(self._element)
+        self._element = None
+        try:
+            element = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed streamed element: {str(e)}")
+            return None
+        self.emitted += 1
+        return element
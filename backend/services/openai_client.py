@@ -0,0 +1,72 @@
+"""
+Shared async OpenAI client with per-call timeouts and jittered retries.
+"""
+import asyncio
+import logging
+import random
+from typing import Optional
+
+import openai
+from openai import AsyncOpenAI
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+_client: Optional[AsyncOpenAI] = None
+
+# Cumulative chat completion counters: calls made and attempts sent (with retries)
+completion_stats = {"calls": 0, "attempts": 0}
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get or create the async OpenAI client (retries are handled by create_chat_completion)."""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.openai_timeout,
+            max_retries=0
+        )
+    return _client
+
+
+async def create_chat_completion(timeout: Optional[float] = None, **kwargs):
+    """
+    Create a chat completion with bounded retries and full-jitter backoff.
+    
+    Cancelling the awaiting task aborts the in-flight HTTP request.
+    
+    Args:
+        timeout: Per-attempt timeout in seconds (defaults to OPENAI_TIMEOUT)
+        **kwargs: Arguments for ``chat.completions.create``
+        
+    Returns:
+        The completion response
+    """
+    client = get_async_openai_client()
+    completion_stats["calls"] += 1
+    attempts = settings.openai_max_retries + 1
+    for attempt in range(attempts):
+        completion_stats["attempts"] += 1
+        try:
+            return await client.chat.completions.create(
+                timeout=timeout or settings.openai_timeout,
+                **kwargs
+            )
+        except RETRYABLE_ERRORS as e:
+            if attempt == attempts - 1:
+                raise
+            delay = random.uniform(0, settings.openai_retry_base_delay * (2 ** attempt))
+            logger.warning(
+                f"OpenAI call failed ({type(e).__name__}), retry {attempt + 1}/{attempts - 1} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
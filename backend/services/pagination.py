@@ -0,0 +1,85 @@
+"""
+Opaque cursors and keyset queries for newest-first listings.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def to_millis(value: datetime) -> datetime:
+    """
+    Truncate a datetime to the millisecond precision MongoDB stores.
+    
+    Keys compared against stored documents must be truncated the same way,
+    or a ``$lt`` on a microsecond value matches the boundary item again.
+    """
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def encode_cursor(field: str, value: Any, last_id: Any) -> str:
+    """Opaque cursor pointing after the item with sort key ``value`` and id ``last_id``."""
+    if isinstance(value, datetime):
+        value = {"$date": to_millis(value).isoformat()}
+    payload = json.dumps({"f": field, "v": value, "id": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, field: str) -> Tuple[Any, Any]:
+    """
+    Sort key and id encoded in a cursor for ``field``.
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed or belongs to another listing
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value = payload["v"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["$date"])
+        if payload["f"] != field:
+            raise InvalidCursorError(f"Cursor is not for a {field} listing")
+        return value, payload["id"]
+    except InvalidCursorError:
+        raise
+    except Exception:
+        raise InvalidCursorError("Malformed cursor")
+
+
+def keyset_filter(field: str, value: Any, last_id: Any) -> Dict:
+    """
+    Query for the items after (``value``, ``last_id``) in (field, _id) descending order.
+    
+    Missing or null sort keys order last, so a page ending on a dated item
+    continues into the undated ones.
+    """
+    if value is None:
+        return {field: None, "_id": {"$lt": last_id}}
+    return {"$or": [
+        {field: {"$lt": value}},
+        {field: value, "_id": {"$lt": last_id}},
+        {field: None},
+    ]}
+
+
+def keyset_sort(field: str) -> List[Tuple[str, int]]:
+    """Sort matching ``keyset_filter``: newest first, ties by descending id."""
+    return [(field, -1), ("_id", -1)]
+
+
+def page_in_memory(docs: List[Dict], field: str, limit: int, after: Optional[Tuple[Any, Any]] = None) -> List[Dict]:
+    """Same ordering and cursor semantics as the MongoDB queries, for in-memory fallbacks."""
+    dated = sorted((d for d in docs if d.get(field) is not None), key=lambda d: (d[field], d["_id"]), reverse=True)
+    undated = sorted((d for d in docs if d.get(field) is None), key=lambda d: d["_id"], reverse=True)
+    ordered = dated + undated
+    if after is not None:
+        value, last_id = after
+        if value is None:
+            ordered = [d for d in undated if d["_id"] < last_id]
+        else:
+            ordered = [d for d in dated if (d[field], d["_id"]) < (value, last_id)] + undated
+    return ordered[:limit]
@@ -0,0 +1,190 @@
+"""
+Token-aware packing of articles into an LLM prompt budget.
+"""
+import logging
+import re
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Ranking weight of the source ``priority`` field
+PRIORITY_WEIGHT = {'high': 1.0, 'medium': 0.7, 'low': 0.4}
+# Recency weight halves every this many hours
+RECENCY_HALF_LIFE_HOURS = 48.0
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Tokenizer used for counting, set by load_encoding(); None means estimate
+_encoding = None
+
+
+def load_encoding():
+    """
+    Load the tokenizer used by count_tokens.
+    
+    The first load may download the BPE file, so this is blocking: call it
+    once at startup, off the event loop. Until it has run, or if it fails,
+    token counts are estimated.
+    """
+    global _encoding
+    if _encoding is not None or tiktoken is None:
+        return
+    try:
+        _encoding = tiktoken.get_encoding("o200k_base")
+        logger.info(f"Loaded tokenizer {_encoding.name}")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating token counts: {str(e)}")
+
+
+def _get_encoding():
+    """The loaded tokenizer, or None to fall back to the estimate."""
+    return _encoding
+
+
+def tokenizer_name() -> str:
+    """Name of the tokenizer used by count_tokens."""
+    encoding = _get_encoding()
+    return encoding.name if encoding is not None else "estimate"
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate about 4 characters per token."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Trim text to at most ``max_tokens``, cutting at a sentence boundary.
+    
+    Falls back to a word boundary when the first sentence alone is too long.
+    """
+    text = ' '.join(str(text).split())
+    if max_tokens <= 0 or not text:
+        return ''
+    if count_tokens(text) <= max_tokens:
+        return text
+    
+    kept = []
+    used = 0
+    for sentence in _SENTENCE_END.split(text):
+        tokens = count_tokens(sentence) + (1 if kept else 0)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return ' '.join(kept)
+    
+    # First sentence doesn't fit: keep whole words that do
+    words = text.split(' ')
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(' '.join(words[:mid]) + '...') <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return ' '.join(words[:low]) + '...' if low else ''
+
+
+def _published(article: Dict) -> Optional[datetime]:
+    value = article.get('published') or article.get('pubDate') or article.get('published_date')
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def rank_articles(articles: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+    """Order articles by source priority weight times recency decay, best first."""
+    now = now or datetime.utcnow()
+    
+    def score(article: Dict) -> float:
+        weight = PRIORITY_WEIGHT.get(article.get('priority'), PRIORITY_WEIGHT['medium'])
+        published = _published(article)
+        if published is None:
+            return weight * 0.5 ** 2  # treat undated articles as two half-lives old
+        age_hours = max(0.0, (now - published).total_seconds() / 3600)
+        return weight * 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+    
+    return sorted(articles, key=score, reverse=True)
+
+
+def _summary(article: Dict) -> str:
+    return str(article.get('summary') or article.get('content') or '')
+
+
+def pack_articles(
+    articles: List[Dict],
+    budget_tokens: int,
+    render: Callable[[int, Dict], str],
+    min_summary_tokens: int = 40,
+    max_summary_tokens: int = 200
+) -> Dict:
+    """
+    Fill a prompt token budget with the best-ranked articles.
+    
+    Articles are ranked by recency and source priority. Every article that
+    fits first gets a summary trimmed to ``min_summary_tokens``; leftover
+    budget then grows summaries up to ``max_summary_tokens`` in rank order.
+    ``render(n, article)`` formats one prompt entry for article number n.
+    
+    Returns a dict with the rendered ``entries``, the packed ``articles``
+    (copies carrying the trimmed summary), ``tokens_used`` and ``dropped``.
+    """
+    packed: List[Dict] = []
+    originals: List[str] = []
+    entries: List[str] = []
+    costs: List[int] = []
+    used = 0
+    
+    for article in rank_articles(articles):
+        candidate = dict(article, summary=trim_to_tokens(_summary(article), min_summary_tokens))
+        entry = render(len(packed) + 1, candidate)
+        cost = count_tokens(entry)
+        if used + cost > budget_tokens:
+            continue
+        packed.append(candidate)
+        originals.append(_summary(article))
+        entries.append(entry)
+        costs.append(cost)
+        used += cost
+    
+    # Spend what's left on longer summaries for the highest-ranked articles
+    for i, article in enumerate(packed):
+        remaining = budget_tokens - used
+        if remaining <= 0:
+            break
+        current = count_tokens(article['summary']) if article['summary'] else 0
+        target = min(max_summary_tokens, current + remaining)
+        if target <= current:
+            continue
+        longer = dict(article, summary=trim_to_tokens(originals[i], target))
+        entry = render(i + 1, longer)
+        cost = count_tokens(entry)
+        if cost <= costs[i] or used - costs[i] + cost > budget_tokens:
+            continue
+        packed[i] = longer
+        entries[i] = entry
+        used += cost - costs[i]
+        costs[i] = cost
+    
+    return {
+        "entries": entries,
+        "articles": packed,
+        "tokens_used": used,
+        "dropped": len(articles) - len(packed),
+    }
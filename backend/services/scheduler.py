@@ -0,0 +1,154 @@
+"""
+In-process scheduler that polls each source on its own interval.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+
+from scrapers.seen_index import seen_index
+
+logger = logging.getLogger(__name__)
+
+# scraping_config.frequency -> base polling interval in seconds
+FREQUENCY_SECONDS = {"hourly": 3600, "daily": 86400, "weekly": 604800}
+
+# Higher priority sources are polled more often than the base frequency
+PRIORITY_FACTOR = {"high": 0.25, "medium": 0.5, "low": 1.0}
+
+MIN_INTERVAL = 15 * 60
+MAX_BACKOFF = 7 * 24 * 3600
+
+
+class SourceSchedule:
+    """Polling state for one source."""
+    
+    def __init__(self, source: Dict, base_interval: float):
+        self.source = source
+        self.base_interval = base_interval
+        self.interval = base_interval
+        self.failures = 0
+        self.new_per_poll: Optional[float] = None  # moving average of new entries per poll
+        self.running = False
+        # Stagger the first round so startup does not poll everything at once
+        self.next_run = time.monotonic() + random.uniform(0, min(300, base_interval))
+
+
+class ScrapeScheduler:
+    """
+    Polls every enabled source on its own interval and persists the results.
+    
+    The interval starts from ``scraping_config.frequency`` scaled by source
+    ``priority`` and adapts to the observed post rate: sources that keep
+    producing many new entries are polled more often, quiet ones less.
+    Failing sources back off exponentially, and every delay is jittered.
+    Polls only ingest new entries; the service persists them to the
+    article store, where API requests read them.
+    """
+    
+    def __init__(self, service, jitter: float = 0.1):
+        self.service = service
+        self.jitter = jitter
+        scraping_config = service.sources_config.get('scraping_config', {})
+        self.max_articles = scraping_config.get('max_articles_per_source', 10)
+        base = FREQUENCY_SECONDS.get(scraping_config.get('frequency', 'daily'), FREQUENCY_SECONDS['daily'])
+        self.schedules: List[SourceSchedule] = [
+            SourceSchedule(
+                source,
+                max(MIN_INTERVAL, base * PRIORITY_FACTOR.get(source['priority'], PRIORITY_FACTOR['medium']))
+            )
+            for source in service.sources()
+        ]
+        self._task: Optional[asyncio.Task] = None
+        self._polls: set = set()
+    
+    def start(self):
+        """Start the scheduling loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Scrape scheduler started for {len(self.schedules)} sources")
+    
+    async def stop(self):
+        """Stop the loop and cancel polls in flight."""
+        tasks = list(self._polls)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Scrape scheduler stopped")
+    
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            for schedule in self.schedules:
+                if not schedule.running and schedule.next_run <= now:
+                    schedule.running = True
+                    task = asyncio.create_task(self._poll(schedule))
+                    self._polls.add(task)
+                    task.add_done_callback(self._polls.discard)
+            
+            pending = [s.next_run for s in self.schedules if not s.running]
+            sleep_for = min(pending) - time.monotonic() if pending else 60
+            await asyncio.sleep(min(max(sleep_for, 1), 60))
+    
+    async def _poll(self, schedule: SourceSchedule):
+        name = schedule.source['name']
+        new_before = seen_index.stats.get(name, {}).get('new', 0)
+        ok = False
+        try:
+            await self.service.scrape_source(name, self.max_articles, only_new=True)
+            ok = self.service.source_status.get(name, {}).get('ok', False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Scheduled scrape of {name} failed: {str(e)}")
+        finally:
+            schedule.running = False
+        
+        new_entries = seen_index.stats.get(name, {}).get('new', 0) - new_before
+        self._reschedule(schedule, ok, new_entries)
+    
+    def _reschedule(self, schedule: SourceSchedule, ok: bool, new_entries: int):
+        """Compute the next poll time from the poll outcome."""
+        if ok:
+            schedule.failures = 0
+            if schedule.new_per_poll is None:
+                schedule.new_per_poll = float(new_entries)
+            else:
+                schedule.new_per_poll = 0.7 * schedule.new_per_poll + 0.3 * new_entries
+            
+            if schedule.new_per_poll >= self.max_articles / 2:
+                # Many new entries per poll: we are likely missing some
+                schedule.interval = max(MIN_INTERVAL, schedule.interval / 2)
+            elif schedule.new_per_poll < 0.5:
+                schedule.interval = min(schedule.base_interval * 2, schedule.interval * 1.5)
+            delay = schedule.interval
+        else:
+            schedule.failures += 1
+            delay = min(MAX_BACKOFF, schedule.interval * (2 ** schedule.failures))
+        
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        schedule.next_run = time.monotonic() + delay
+        logger.info(
+            f"Next poll of {schedule.source['name']} in {delay / 60:.0f} min "
+            f"({new_entries} new, {schedule.failures} consecutive failures)"
+        )
+    
+    def status(self) -> List[Dict]:
+        """Per-source scheduling state."""
+        now = time.monotonic()
+        return [
+            {
+                'name': s.source['name'],
+                'priority': s.source['priority'],
+                'interval_seconds': round(s.interval),
+                'next_run_in_seconds': max(0, round(s.next_run - now)),
+                'consecutive_failures': s.failures,
+                'new_per_poll': round(s.new_per_poll, 2) if s.new_per_poll is not None else None,
+                'running': s.running,
+            }
+            for s in self.schedules
+        ]
@@ -0,0 +1,64 @@
+"""
+Coalesce identical concurrent calls onto one in-flight computation.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Shares the result of one in-flight call among all callers with the same key.
+    
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same task. A caller that is cancelled (e.g. its client
+    disconnected) stops waiting without affecting the others, and the work
+    itself is cancelled only once no caller is waiting for it.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "computations": 0,
+            "coalesced": 0,
+        }
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]):
+        """Run ``func()`` for ``key`` unless an identical call is already running."""
+        self.stats["requests"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["computations"] += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.stats["coalesced"] += 1
+            logger.info(f"{self.name}: joining in-flight call for {key}")
+        
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    logger.info(f"{self.name}: no callers left, cancelling call for {key}")
+                    task.cancel()
+                    self._forget(key, task)
+            raise
+    
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+    
+    def snapshot(self) -> Dict:
+        """Counters plus the number of calls currently in flight."""
+        return {**self.stats, "in_flight": len(self._inflight)}
@@ -1,34 +1,145 @@
 """
 AI-powered trend analysis service using OpenAI.
 """
+import asyncio
 import json
 import logging
-from typing import List, Dict, Optional
+import time
+from typing import AsyncIterator, List, Dict, Optional
 from datetime import datetime
-from openai import OpenAI
-
 from config import settings
+from scrapers.executor import run_in_parse_executor
+from services.clustering import cluster_articles
+from services.enrichment_store import enrichment_store, enrichment_version
+from services.json_stream import JsonArrayStream
+from services.openai_client import create_chat_completion
+from services.pagination import to_millis
+from services.prompt_packer import count_tokens, pack_articles, rank_articles, tokenizer_name, trim_to_tokens
+from services.trend_cache import analysis_cache_key, trend_cache
+from services.trend_scoring import score_trends
 
 logger = logging.getLogger(__name__)
 
+# Bump when prompts or output post-processing change so cached results are not reused
+PROMPT_VERSION = "5"
+
+TREND_SYSTEM_PROMPT = """You are an expert AI trend analyst for Lighthouse, a strategic intelligence platform.
+Your role is to analyze recent articles and identify the most significant AI trends that executives and decision-makers need to know about.
+
+For each trend you identify, provide:
+1. A clear, compelling headline (10-15 words)
+2. Keywords: 5-8 key terms that define this trend (e.g., "LLM", "fine-tuning", "enterprise adoption")
+3. Executive Summary: 3-4 bullet points explaining why this trend matters
+4. Comprehensive Analysis: 3-4 paragraphs providing deep strategic insights
+5. Consulting Leverage: Detailed, actionable recommendations for how consultancies can capitalize on this trend (4-6 specific action items)
+6. The trend category (e.g., "Model Development", "Enterprise Adoption", "Regulation", "Infrastructure", "Market Dynamics")
+7. Time horizon (Immediate: 0-6 months, Near-term: 6-18 months, Long-term: 18+ months)
+8. Confidence score (1-10) based on signal strength
+9. Strategic impact (business implications)
+10. Key risk factors
+11. Source article numbers that support this trend (reference the article numbers from the input)
+
+Focus on trends that are:
+- Actionable for business leaders
+- Backed by multiple signals/sources
+- Represent meaningful shifts (not just incremental updates)
+- Have clear strategic or financial implications"""
+
+# Output structure requested from the model; {article_ref_field} names the support field
+TREND_JSON_STRUCTURE = """{
+  "trends": [
+    {
+      "headline": "Clear, compelling headline (max 15 words)",
+      "title": "Formal trend title",
+      "keywords": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"],
+      "trendCategory": "Category name",
+      "justificationSummary": "• Bullet point 1\n• Bullet point 2\n• Bullet point 3",
+      "whyTrend": "One sentence on why this matters",
+      "howConsultanciesLeverage": "Detailed actionable recommendations:\n1. Specific action item with clear steps\n2. Another concrete recommendation\n3. Third actionable strategy\n4. Fourth tactical approach\n5. Fifth implementation step\n6. Sixth opportunity to capitalize on",
+      "analysisDetail": "Comprehensive 2-3 paragraph analysis with strategic insights. Keep concise.",
+      "timeHorizon": "Immediate|Near-term|Long-term",
+      "confidenceScore": 8,
+      "strategicImpact": "Business implications (2-3 sentences max)",
+      "riskGovernance": "Key risk factors (2-3 sentences max)",
+      "affectedVerticals": ["Healthcare", "Finance", "etc"],
+      "{article_ref_field}": [1, 3, 5]
+    }
+  ]
+}"""
+
+# Bump when the enrichment prompts change so stored enrichments are redone
+ENRICH_PROMPT_VERSION = "1"
+ENRICHMENT_KEYS = (
+    'howConsultanciesLeverage',
+    'analysisDetail',
+    'marketValidation',
+    'financialSignal',
+    'competitiveIntelligence',
+    'actionGuidance',
+)
+ENRICH_SYSTEM_PROMPT = "You are a strategic AI analyst providing executive-level insights."
+
+CANDIDATE_SYSTEM_PROMPT = """You are an expert AI trend analyst for Lighthouse, a strategic intelligence platform.
+You read one batch of recent articles at a time and extract candidate AI trends: meaningful shifts that executives and decision-makers need to know about, backed by the articles in the batch."""
+
 
 class TrendAnalyzer:
     """Analyzes articles and identifies AI trends using OpenAI."""
     
+    model = "gpt-4o-mini"
+    
+    # Per-call timeouts in seconds
+    trends_timeout = 180.0
+    enrich_timeout = 60.0
+    
+    # Input tokens per map chunk and number of chunks in flight
+    map_chunk_tokens = 12000
+    map_concurrency = 4
+    
+    # Pre-clustering: minimum article count, representatives shown per
+    # cluster (with their summary length in tokens) and sources kept per trend
+    cluster_min_articles = 30
+    cluster_representatives = 3
+    cluster_summary_tokens = 60
+    max_sources_per_trend = 20
+    
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        # Prompt packing figures of the last analysis run
+        self.last_run_stats: Dict = {}
+        # Cumulative batch enrichment counters
+        self.enrichment_stats: Dict[str, int] = {
+            "trends": 0,
+            "stored": 0,
+            "enriched": 0,
+            "failed": 0,
+            "requests": 0,
+        }
     
     async def analyze_articles_for_trends(
         self,
         articles: List[Dict],
-        top_n: int = 10
+        top_n: int = 10,
+        use_cache: bool = True
     ) -> List[Dict]:
         """
         Analyze a batch of articles and identify top AI trends.
         
+        Larger batches are first grouped locally into topical clusters; only
+        cluster statistics and representative articles are sent to the model,
+        and each trend's sources come from the members of the clusters it
+        draws on. Otherwise articles are ranked by recency and source priority
+        and packed into the input token budget with summaries trimmed at
+        sentence boundaries. If every article (or every cluster) fits it is
+        analyzed in a single prompt; otherwise the full set is split into
+        token-bounded chunks, candidate trends are extracted from each chunk
+        concurrently, and a reduce pass merges them into the top trends.
+        Results are cached by a hash of the article set, top_n, model and
+        prompt version.
+        
         Args:
             articles: List of article dictionaries
             top_n: Number of top trends to return
+            use_cache: Return a cached result for the same inputs if present
             
         Returns:
             List of trend dictionaries
@@ -37,79 +148,227 @@ class TrendAnalyzer:
             logger.warning("No articles provided for trend analysis")
             return []
         
+        clustered, cache_key = self._analysis_key(articles, top_n)
+        if use_cache:
+            cached = await trend_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Trend cache hit for {len(articles)} articles (top_n={top_n})")
+                return cached
+        
         try:
-            # Prepare article summaries for analysis and get source references
-            article_summaries_str, source_references = self._prepare_article_summaries(articles)
-            
-            # Call OpenAI to analyze trends
-            trends = await self._call_openai_for_trends(article_summaries_str, top_n, source_references)
+            plan = await self._plan_analysis(articles, top_n, clustered)
+            if plan is None:
+                return []
+            trends = self._resolve_trends(plan, await self._complete_trends(plan['prompt'], plan['stage']))
             
             logger.info(f"Identified {len(trends)} trends from {len(articles)} articles")
+            # Empty results usually mean a failed call; don't pin them in the cache
+            if trends:
+                await trend_cache.set(cache_key, trends)
             return trends
             
         except Exception as e:
             logger.error(f"Error analyzing trends: {str(e)}")
             return []
     
-    def _prepare_article_summaries(self, articles: List[Dict]) -> tuple[str, List[Dict]]:
-        """Prepare article summaries for OpenAI analysis and return source references."""
-        summaries = []
-        source_references = []
+    async def stream_articles_for_trends(
+        self,
+        articles: List[Dict],
+        top_n: int = 10,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict]:
+        """
+        Analyze articles like ``analyze_articles_for_trends``, yielding trends as they are written.
         
-        for i, article in enumerate(articles[:50], 1):  # Limit to 50 articles to avoid token limits
-            title = article.get('title', 'Untitled')
-            source = article.get('source', 'Unknown')
-            url = article.get('url', article.get('link', ''))
-            published = article.get('published') or article.get('pubDate') or article.get('published_date') or ''
-            if hasattr(published, 'isoformat'):
-                published = published.isoformat()
-            raw_summary = article.get('summary') or article.get('content') or ''
-            summary = (str(raw_summary))[:500]  # Limit length
-            
-            # Use [Article N] format instead of "N." to avoid confusion with bullet points
-            summaries.append(f"[Article {i}] Source: {source}\nTitle: {title}\nURL: {url}\nSummary: {summary}\n")
+        The model's output is read as a token stream and parsed
+        incrementally; each trend is mapped to its sources, scored and
+        yielded as soon as its JSON object closes. A cached result is
+        yielded at once. The complete result is cached when the stream
+        finishes.
+        
+        Args:
+            articles: List of article dictionaries
+            top_n: Number of top trends to return
+            use_cache: Yield a cached result for the same inputs if present
             
-            # Store source reference
-            source_references.append({
-                'id': f'source-{i}',
-                'title': title,
-                'url': url,
-                'publisher': source,
-                'date': published
-            })
-        
-        return "\n".join(summaries), source_references
-    
-    async def _call_openai_for_trends(
+        Yields:
+            Trend dictionaries, in the order the model writes them
+        """
+        if not articles:
+            logger.warning("No articles provided for trend analysis")
+            return
+        
+        clustered, cache_key = self._analysis_key(articles, top_n)
+        if use_cache:
+            cached = await trend_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Trend cache hit for {len(articles)} articles (top_n={top_n})")
+                for trend in cached:
+                    yield trend
+                return
+        
+        try:
+            plan = await self._plan_analysis(articles, top_n, clustered)
+        except Exception as e:
+            logger.error(f"Error analyzing trends: {str(e)}")
+            return
+        if plan is None:
+            return
+        
+        started = time.monotonic()
+        trends = []
+        streamed = self._stream_trends(plan['prompt'], plan['stage'])
+        try:
+            async for trend in streamed:
+                trend = self._resolve_trends(plan, [trend])[0]
+                if not trends:
+                    self.last_run_stats['first_trend_ms'] = round((time.monotonic() - started) * 1000)
+                trends.append(trend)
+                yield trend
+        finally:
+            # Stop generation right away if the consumer goes away
+            await streamed.aclose()
+        self.last_run_stats['stream_ms'] = round((time.monotonic() - started) * 1000)
+        
+        logger.info(
+            f"Streamed {len(trends)} trends from {len(articles)} articles "
+            f"(first after {self.last_run_stats.get('first_trend_ms')}ms, all after {self.last_run_stats['stream_ms']}ms)"
+        )
+        if trends:
+            await trend_cache.set(cache_key, trends)
+    
+    def _analysis_key(self, articles: List[Dict], top_n: int) -> tuple[bool, str]:
+        """Whether the articles are analyzed as clusters, and the cache key of the analysis."""
+        clustered = settings.trend_clustering_enabled and len(articles) >= self.cluster_min_articles
+        prompt_version = f"{PROMPT_VERSION}-{'clustered' if clustered else 'articles'}"
+        return clustered, analysis_cache_key(articles, top_n, self.model, prompt_version)
+    
+    async def _plan_analysis(self, articles: List[Dict], top_n: int, clustered: bool) -> Optional[Dict]:
+        """
+        Prepare the final trend-writing prompt for a set of articles.
+        
+        Clustering and the map stage of map-reduce run here; only the last
+        model call is left to the caller, so it can be awaited whole or
+        streamed.
+        
+        Returns a plan with the ``prompt`` and ``stage`` name, the
+        ``references`` and ``articles`` trend sources are numbered against,
+        and an optional ``resolve`` callable that turns the model's cluster or
+        candidate ids into ``sourceArticleNumbers``; None if there is nothing
+        to analyze.
+        """
+        if clustered:
+            return await self._cluster_plan(articles, top_n)
+        
+        # Prepare article summaries for analysis and get source references;
+        # token counting is CPU-bound, so it runs in a worker thread
+        article_summaries_str, source_references, packing = await asyncio.to_thread(
+            self._prepare_article_summaries, articles
+        )
+        if packing['dropped']:
+            return await self._map_reduce_plan(articles, top_n)
+        
+        self._note_packing('single_pass', len(articles), len(source_references), packing['tokens_used'], 1)
+        return self._single_pass_plan(article_summaries_str, top_n, source_references, packing['articles'])
+    
+    def _resolve_trends(self, plan: Dict, trends: List[Dict]) -> List[Dict]:
+        """Map trends written for a plan to their source articles and finalize them."""
+        resolve = plan.get('resolve')
+        if resolve:
+            for trend in trends:
+                resolve(trend)
+        return self._finalize_trends(trends, plan['references'], plan['articles'])
+    
+    def _render_article(self, i: int, article: Dict) -> str:
+        """Render one article as a prompt entry; the summary is used as given."""
+        title = article.get('title', 'Untitled')
+        source = article.get('source', 'Unknown')
+        url = article.get('url', article.get('link', ''))
+        summary = article.get('summary') or ''
+        duplicates = article.get('duplicates', [])
+        
+        # Use [Article N] format instead of "N." to avoid confusion with bullet points
+        entry = f"[Article {i}] Source: {source}\nTitle: {title}\nURL: {url}\nSummary: {summary}\n"
+        if duplicates:
+            also_reported = ", ".join(sorted({d.get('source') or 'Unknown' for d in duplicates}))
+            entry += f"Also reported by: {also_reported}\n"
+        return entry
+    
+    def source_reference(self, i: int, article: Dict) -> Dict:
+        """Build the source reference for article number i."""
+        title = article.get('title', 'Untitled')
+        source = article.get('source', 'Unknown')
+        url = article.get('url', article.get('link', ''))
+        published = article.get('published') or article.get('pubDate') or article.get('published_date') or ''
+        if hasattr(published, 'isoformat'):
+            published = published.isoformat()
+        duplicates = article.get('duplicates', [])
+        
+        # Syndicated copies travel with the reference
+        return {
+            'id': f'source-{i}',
+            'title': title,
+            'url': url,
+            'publisher': source,
+            'date': published,
+            'duplicates': [
+                {
+                    'id': f'source-{i}-{j}',
+                    'title': d.get('title', 'Untitled'),
+                    'url': d.get('url', ''),
+                    'publisher': d.get('source', 'Unknown'),
+                    'date': d.get('published_date') or ''
+                }
+                for j, d in enumerate(duplicates, 1)
+            ]
+        }
+    
+    def _prepare_article_summaries(self, articles: List[Dict]) -> tuple[str, List[Dict], Dict]:
+        """
+        Pack article summaries into the input token budget.
+        
+        Returns the prompt text, the source references of the packed
+        articles and the packing result (tokens used, articles dropped).
+        """
+        packing = pack_articles(
+            articles,
+            settings.trend_input_token_budget,
+            self._render_article,
+            min_summary_tokens=settings.trend_summary_min_tokens,
+            max_summary_tokens=settings.trend_summary_max_tokens
+        )
+        source_references = [
+            self.source_reference(i, article)
+            for i, article in enumerate(packing['articles'], 1)
+        ]
+        return "\n".join(packing['entries']), source_references, packing
+    
+    def _note_packing(self, mode: str, articles: int, packed: int, tokens: int, prompts: int):
+        """Record and log the article tokens sent in this run."""
+        self.last_run_stats = {
+            'mode': mode,
+            'articles': articles,
+            'articles_sent': packed,
+            'input_tokens': tokens,
+            'budget_tokens': settings.trend_input_token_budget,
+            'prompts': prompts,
+            'tokenizer': tokenizer_name(),
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        logger.info(
+            f"Packed {packed}/{articles} articles into {tokens} tokens "
+            f"across {prompts} prompt(s) ({mode}, tokenizer={self.last_run_stats['tokenizer']})"
+        )
+    
+    def _single_pass_plan(
         self,
         article_summaries_str: str,
         top_n: int,
-        source_references: List[Dict]
-    ) -> List[Dict]:
-        """Call OpenAI API to identify trends from articles."""
-        
-        system_prompt = """You are an expert AI trend analyst for Lighthouse, a strategic intelligence platform.
-Your role is to analyze recent articles and identify the most significant AI trends that executives and decision-makers need to know about.
-
-For each trend you identify, provide:
-1. A clear, compelling headline (10-15 words)
-2. Keywords: 5-8 key terms that define this trend (e.g., "LLM", "fine-tuning", "enterprise adoption")
-3. Executive Summary: 3-4 bullet points explaining why this trend matters
-4. Comprehensive Analysis: 3-4 paragraphs providing deep strategic insights
-5. Consulting Leverage: Detailed, actionable recommendations for how consultancies can capitalize on this trend (4-6 specific action items)
-6. The trend category (e.g., "Model Development", "Enterprise Adoption", "Regulation", "Infrastructure", "Market Dynamics")
-7. Time horizon (Immediate: 0-6 months, Near-term: 6-18 months, Long-term: 18+ months)
-8. Confidence score (1-10) based on signal strength
-9. Strategic impact (business implications)
-10. Key risk factors
-11. Source article numbers that support this trend (reference the article numbers from the input)
-
-Focus on trends that are:
-- Actionable for business leaders
-- Backed by multiple signals/sources
-- Represent meaningful shifts (not just incremental updates)
-- Have clear strategic or financial implications"""
-
+        source_references: List[Dict],
+        articles: List[Dict]
+    ) -> Dict:
+        """Plan a single prompt over all articles (numbered as in ``articles``)."""
+        json_structure = TREND_JSON_STRUCTURE.replace("{article_ref_field}", "sourceArticleNumbers")
         user_prompt = f"""Analyze these recent articles and identify the top {top_n} AI trends:
 
 {article_summaries_str}
@@ -119,127 +378,465 @@ For each trend, note which article numbers support your analysis (e.g., 1, 3, 5)
 IMPORTANT: Do NOT include article numbers, citations, or numbered lists in the text fields (headline, justificationSummary, analysisDetail, etc.). Write clean, professional content without reference numbers.
 
 Return a JSON object with a "trends" key containing an array of trend objects. Use this exact structure:
+{json_structure}
+
+IMPORTANT: Keep analysisDetail, strategicImpact, and riskGovernance concise to avoid token limits. Return ONLY valid JSON."""
+
+        return {
+            'prompt': user_prompt,
+            'stage': "analyzing articles",
+            'references': source_references,
+            'articles': articles,
+        }
+    
+    async def _map_reduce_plan(self, articles: List[Dict], top_n: int) -> Optional[Dict]:
+        """Extract candidate trends per chunk concurrently, then plan the prompt that merges and ranks them."""
+        ranked, source_references, chunks, tokens = await asyncio.to_thread(self._prepare_chunks, articles)
+        self._note_packing('map_reduce', len(articles), len(source_references), tokens, len(chunks))
+        semaphore = asyncio.Semaphore(self.map_concurrency)
+        
+        async def run_chunk(chunk: List[str]) -> List[Dict]:
+            async with semaphore:
+                return await self._extract_candidates("\n".join(chunk), top_n, len(source_references))
+        
+        results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        candidates = [candidate for result in results for candidate in result]
+        logger.info(
+            f"Map stage: {len(candidates)} candidate trends from {len(articles)} articles "
+            f"in {len(chunks)} chunks"
+        )
+        if not candidates:
+            return None
+        
+        return self._reduce_plan(candidates, top_n, source_references, ranked)
+    
+    def _prepare_chunks(self, articles: List[Dict]) -> tuple[List[Dict], List[Dict], List[List[str]], int]:
+        """
+        Rank and render every article for the map stage and group the
+        entries into chunks.
+        
+        Returns the ranked articles, their source references, the chunks
+        and the total entry tokens.
+        """
+        ranked = rank_articles(articles)
+        entries = []
+        source_references = []
+        for i, article in enumerate(ranked, 1):
+            summary = article.get('summary') or article.get('content') or ''
+            trimmed = dict(article, summary=trim_to_tokens(summary, settings.trend_summary_max_tokens))
+            entries.append(self._render_article(i, trimmed))
+            source_references.append(self.source_reference(i, trimmed))
+        chunks, tokens = self._chunk_entries(entries)
+        return ranked, source_references, chunks, tokens
+    
+    def _chunk_entries(self, entries: List[str]) -> tuple[List[List[str]], int]:
+        """Group prompt entries into chunks that fit the per-chunk token budget."""
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        total_tokens = 0
+        for entry in entries:
+            tokens = count_tokens(entry)
+            if current and current_tokens + tokens > self.map_chunk_tokens:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(entry)
+            current_tokens += tokens
+            total_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks, total_tokens
+    
+    async def _extract_candidates(self, chunk_str: str, top_n: int, article_count: int) -> List[Dict]:
+        """Map step: extract candidate trends from one chunk of articles.
+        
+        A failed chunk yields no candidates rather than failing the whole run.
+        """
+        user_prompt = f"""Identify up to {top_n} candidate AI trends in these articles:
+
+{chunk_str}
+
+For each candidate, list the article numbers that support it (e.g., 1, 3, 5) in the sourceArticleNumbers field.
+
+Return a JSON object with a "candidates" key containing an array of objects with this structure:
 {{
-  "trends": [
+  "candidates": [
     {{
       "headline": "Clear, compelling headline (max 15 words)",
-      "title": "Formal trend title",
-      "keywords": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"],
+      "keywords": ["keyword1", "keyword2", "keyword3"],
       "trendCategory": "Category name",
-      "justificationSummary": "• Bullet point 1\\n• Bullet point 2\\n• Bullet point 3",
-      "whyTrend": "One sentence on why this matters",
-      "howConsultanciesLeverage": "Detailed actionable recommendations:\\n1. Specific action item with clear steps\\n2. Another concrete recommendation\\n3. Third actionable strategy\\n4. Fourth tactical approach\\n5. Fifth implementation step\\n6. Sixth opportunity to capitalize on",
-      "analysisDetail": "Comprehensive 2-3 paragraph analysis with strategic insights. Keep concise.",
-      "timeHorizon": "Immediate|Near-term|Long-term",
-      "confidenceScore": 8,
-      "strategicImpact": "Business implications (2-3 sentences max)",
-      "riskGovernance": "Key risk factors (2-3 sentences max)",
-      "affectedVerticals": ["Healthcare", "Finance", "etc"],
+      "summary": "Two or three sentences on what is happening and why it matters",
       "sourceArticleNumbers": [1, 3, 5]
     }}
   ]
 }}
 
+Return ONLY valid JSON."""
+
+        try:
+            response = await create_chat_completion(
+                timeout=self.trends_timeout,
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": CANDIDATE_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.3,
+                max_tokens=3000,
+                response_format={"type": "json_object"}
+            )
+            content = self._response_content(response)
+            if not content:
+                return []
+            parsed = json.loads(self._strip_code_fence(content))
+        except Exception as e:
+            logger.error(f"Error extracting candidate trends from chunk: {str(e)}")
+            return []
+        
+        candidates = parsed.get('candidates', []) if isinstance(parsed, dict) else parsed
+        if not isinstance(candidates, list):
+            return []
+        valid = []
+        for candidate in candidates:
+            if not isinstance(candidate, dict) or not candidate.get('headline'):
+                continue
+            candidate['sourceArticleNumbers'] = self._valid_numbers(
+                candidate.get('sourceArticleNumbers', []), article_count
+            )
+            valid.append(candidate)
+        return valid
+    
+    def _reduce_plan(
+        self,
+        candidates: List[Dict],
+        top_n: int,
+        source_references: List[Dict],
+        articles: List[Dict]
+    ) -> Dict:
+        """Reduce step: plan the prompt that merges overlapping candidates into the top trends."""
+        lines = []
+        for c, candidate in enumerate(candidates, 1):
+            keywords = ", ".join(str(k) for k in candidate.get('keywords', []))
+            lines.append(
+                f"[Candidate {c}] {candidate.get('headline', '')}\n"
+                f"Category: {candidate.get('trendCategory', '')}\n"
+                f"Keywords: {keywords}\n"
+                f"Supporting articles: {len(candidate['sourceArticleNumbers'])}\n"
+                f"Summary: {candidate.get('summary', '')}\n"
+            )
+        candidates_str = "\n".join(lines)
+        json_structure = TREND_JSON_STRUCTURE.replace("{article_ref_field}", "candidateIds")
+        user_prompt = f"""These candidate trends were extracted from separate batches of recent articles. Several may describe the same underlying trend.
+
+{candidates_str}
+
+Merge candidates that describe the same trend, then identify the top {top_n} AI trends overall, favouring trends backed by more supporting articles and more candidates. For each trend, list the candidate numbers it combines (e.g., 1, 4, 9) in the candidateIds field.
+
+IMPORTANT: Do NOT include candidate numbers, citations, or numbered lists in the text fields (headline, justificationSummary, analysisDetail, etc.). Write clean, professional content without reference numbers.
+
+Return a JSON object with a "trends" key containing an array of trend objects. Use this exact structure:
+{json_structure}
+
 IMPORTANT: Keep analysisDetail, strategicImpact, and riskGovernance concise to avoid token limits. Return ONLY valid JSON."""
 
+        # Translate candidate ids back to the global article numbers they cite
+        def resolve(trend: Dict):
+            article_numbers = []
+            for candidate_id in self._valid_numbers(trend.pop('candidateIds', []), len(candidates)):
+                for article_num in candidates[candidate_id - 1]['sourceArticleNumbers']:
+                    if article_num not in article_numbers:
+                        article_numbers.append(article_num)
+            trend['sourceArticleNumbers'] = article_numbers
+        
+        return {
+            'prompt': user_prompt,
+            'stage': "reducing candidate trends",
+            'references': source_references,
+            'articles': articles,
+            'resolve': resolve,
+        }
+    
+    def _pack_clusters(self, clusters: List[Dict], articles: List[Dict]) -> tuple[List[str], List[Dict], int]:
+        """Render clusters, largest first, until the input token budget is used."""
+        entries = []
+        packed_clusters = []
+        tokens_used = 0
+        for cluster in clusters:
+            entry = self._render_cluster(len(packed_clusters) + 1, cluster, articles)
+            tokens = count_tokens(entry)
+            if tokens_used + tokens > settings.trend_input_token_budget:
+                break
+            entries.append(entry)
+            packed_clusters.append(cluster)
+            tokens_used += tokens
+        return entries, packed_clusters, tokens_used
+    
+    async def _cluster_plan(self, articles: List[Dict], top_n: int) -> Optional[Dict]:
+        """
+        Plan the analysis of locally clustered articles.
+        
+        The prompt carries per-cluster statistics and a few representative
+        articles. Trend sources are the most central members of the clusters
+        the model cites. If the clusters do not all fit the input token
+        budget, the articles are analyzed by map-reduce instead.
+        """
+        clusters = await run_in_parse_executor(cluster_articles, articles, settings.trend_max_clusters)
+        source_references = [self.source_reference(i, a) for i, a in enumerate(articles, 1)]
+        
+        entries, packed_clusters, tokens_used = await asyncio.to_thread(self._pack_clusters, clusters, articles)
+        if len(packed_clusters) < len(clusters):
+            # Clusters left out would be invisible to the model; read every
+            # article through map-reduce instead
+            logger.info(
+                f"{len(packed_clusters)}/{len(clusters)} clusters fit the input budget, "
+                f"falling back to map-reduce"
+            )
+            return await self._map_reduce_plan(articles, top_n)
+        if not packed_clusters:
+            return None
+        represented = sum(min(c['size'], self.cluster_representatives) for c in packed_clusters)
+        self._note_packing('clustered', len(articles), represented, tokens_used, 1)
+        
+        clusters_str = "\n".join(entries)
+        json_structure = TREND_JSON_STRUCTURE.replace("{article_ref_field}", "clusterIds")
+        user_prompt = f"""Recent articles have been grouped into topical clusters. Each cluster lists how many articles and sources cover it, when they were published, its key terms and a few representative articles:
+
+{clusters_str}
+
+Identify the top {top_n} AI trends, favouring clusters with more articles, more distinct sources and high-priority sources. A trend may combine several related clusters. For each trend, list the cluster numbers it draws on (e.g., 1, 4) in the clusterIds field.
+
+IMPORTANT: Do NOT include cluster numbers, citations, or numbered lists in the text fields (headline, justificationSummary, analysisDetail, etc.). Write clean, professional content without reference numbers.
+
+Return a JSON object with a "trends" key containing an array of trend objects. Use this exact structure:
+{json_structure}
+
+IMPORTANT: Keep analysisDetail, strategicImpact, and riskGovernance concise to avoid token limits. Return ONLY valid JSON."""
+
+        # Sources come from cluster membership, most central articles first
+        def resolve(trend: Dict):
+            member_lists = [
+                packed_clusters[cluster_id - 1]['members']
+                for cluster_id in self._valid_numbers(trend.pop('clusterIds', []), len(packed_clusters))
+            ]
+            article_numbers = []
+            for rank in range(max((len(m) for m in member_lists), default=0)):
+                for members in member_lists:
+                    if rank < len(members) and len(article_numbers) < self.max_sources_per_trend:
+                        article_numbers.append(members[rank] + 1)
+            trend['sourceArticleNumbers'] = article_numbers
+        
+        return {
+            'prompt': user_prompt,
+            'stage': "analyzing article clusters",
+            'references': source_references,
+            'articles': articles,
+            'resolve': resolve,
+        }
+    
+    def _render_cluster(self, c: int, cluster: Dict, articles: List[Dict]) -> str:
+        """Render one cluster's statistics and representative articles."""
+        sources = ", ".join(f"{name} {count}" for name, count in list(cluster['sources'].items())[:6])
+        lines = [
+            f"[Cluster {c}] {cluster['size']} articles from {len(cluster['sources'])} sources ({sources}); "
+            f"{cluster['high_priority']} from high-priority sources"
+        ]
+        if cluster['oldest']:
+            lines.append(f"Published: {cluster['oldest'][:10]} to {cluster['newest'][:10]}")
+        lines.append(f"Key terms: {', '.join(cluster['top_terms'])}")
+        lines.append("Representative articles:")
+        for index in cluster['members'][:self.cluster_representatives]:
+            article = articles[index]
+            summary = trim_to_tokens(article.get('summary') or article.get('content') or '', self.cluster_summary_tokens)
+            lines.append(f"- {article.get('title', 'Untitled')} ({article.get('source', 'Unknown')}): {summary}")
+        return "\n".join(lines) + "\n"
+    
+    async def _complete_trends(self, user_prompt: str, stage: str) -> List[Dict]:
+        """Run a trend-writing prompt and parse the returned trends."""
+        content = ""
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = await create_chat_completion(
+                timeout=self.trends_timeout,
+                model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": TREND_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.7,
-                max_tokens=8000,  # Increased to handle longer responses
-                response_format={"type": "json_object"}  # Force JSON output
+                max_tokens=8000,
+                response_format={"type": "json_object"}
             )
-            
-            # Parse response
-            if not response.choices:
-                logger.error("OpenAI returned no choices")
-                return []
-            msg = response.choices[0].message
-            content = (msg.content or "").strip()
+            content = self._response_content(response)
             if not content:
-                logger.error("OpenAI returned empty content")
                 return []
-            
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
-            
-            parsed = json.loads(content)
-            # Handle both array format and object with "trends" key
-            if isinstance(parsed, list):
-                trends = parsed
-            elif isinstance(parsed, dict):
-                trends = parsed.get('trends', [parsed])
-            else:
-                trends = []
-            
-            # Enrich trends with metadata and source references
-            for trend in trends:
-                trend['dateAdded'] = datetime.utcnow().isoformat()
-                trend['status'] = 'current'
-                trend['author'] = 'Lighthouse AI Analyzer'
-                
-                # Map source article numbers to actual source references
-                source_article_numbers = trend.get('sourceArticleNumbers', [])
-                additional_sources = []
-                primary_source_url = 'https://lighthouse.ai/trends'
-                
-                for article_num in source_article_numbers:
-                    if 0 < article_num <= len(source_references):
-                        source_ref = source_references[article_num - 1]
-                        additional_sources.append(source_ref)
-                        # Use first source as primary
-                        if not primary_source_url or primary_source_url == 'https://lighthouse.ai/trends':
-                            primary_source_url = source_ref.get('url', 'https://lighthouse.ai/trends')
-                
-                trend['sourceUrl'] = primary_source_url
-                trend['additionalSources'] = additional_sources
-                
-                # Set default values for missing fields
-                trend.setdefault('keywords', [])
-                trend.setdefault('justificationSummary', trend.get('whyTrend', ''))
-                # Only set default if not provided by AI
-                if not trend.get('howConsultanciesLeverage'):
-                    trend['howConsultanciesLeverage'] = 'Consultancies can provide strategic advisory and implementation services to help organizations capitalize on this trend.'
-                trend.setdefault('analysisDetail', trend.get('strategicImpact', ''))
-                newline_char = '\n'
-                article_count = len(article_summaries_str.split(newline_char))
-                trend.setdefault('confidenceReasoning', f"Based on analysis of {article_count} recent articles from {len(additional_sources)} sources")
-                trend.setdefault('marketValidation', 'Multiple sources confirm this trend')
-                trend.setdefault('financialSignal', 'Significant market activity observed')
-                trend.setdefault('competitiveIntelligence', 'Multiple players active in this space')
-                trend.setdefault('trendMomentum', 'Accelerating')
-                trend.setdefault('actionGuidance', 'Monitor closely and assess strategic implications')
-                
-                # Set heatmap scores
-                trend.setdefault('heatMapScores', {
-                    'capabilityMaturity': 7,
-                    'capitalBacking': 7,
-                    'enterpriseAdoption': 6,
-                    'regulatoryFriction': 5,
-                    'competitiveIntensity': 8
-                })
-                
-                # Remove temporary field
-                trend.pop('sourceArticleNumbers', None)
-            
-            return trends
-            
+            return self._parse_trends(json.loads(self._strip_code_fence(content)))
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse OpenAI response as JSON: {str(e)}")
+            logger.error(f"Failed to parse OpenAI response as JSON while {stage}: {str(e)}")
             logger.error(f"Response content: {content}")
             return []
         except Exception as e:
-            logger.error(f"Error calling OpenAI for trend analysis: {str(e)}")
+            logger.error(f"Error {stage}: {str(e)}")
             return []
     
+    async def _stream_trends(self, user_prompt: str, stage: str) -> AsyncIterator[Dict]:
+        """Run a trend-writing prompt as a token stream, yielding each trend object once it closes."""
+        parser = JsonArrayStream("trends")
+        stream = None
+        try:
+            stream = await create_chat_completion(
+                timeout=self.trends_timeout,
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": TREND_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.7,
+                max_tokens=8000,
+                response_format={"type": "json_object"},
+                stream=True
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                for trend in parser.feed(content):
+                    if isinstance(trend, dict):
+                        yield trend
+            
+            # Output in another shape (e.g. a single trend object) is parsed whole
+            content = parser.text.strip()
+            if not parser.emitted and content:
+                for trend in self._parse_trends(json.loads(self._strip_code_fence(content))):
+                    if isinstance(trend, dict):
+                        yield trend
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse streamed OpenAI response as JSON while {stage}: {str(e)}")
+            logger.error(f"Response content: {parser.text}")
+        except Exception as e:
+            logger.error(f"Error {stage} (streamed): {str(e)}")
+        finally:
+            # Closing the stream aborts generation on OpenAI's side
+            if stream is not None:
+                await stream.close()
+    
+    @staticmethod
+    def _valid_numbers(values, upper: int) -> List[int]:
+        """Keep integer references in 1..upper, dropping anything the model invented."""
+        if not isinstance(values, list):
+            return []
+        numbers = []
+        for value in values:
+            try:
+                number = int(value)
+            except (TypeError, ValueError):
+                continue
+            if 0 < number <= upper and number not in numbers:
+                numbers.append(number)
+        return numbers
+    
+    @staticmethod
+    def _response_content(response) -> str:
+        """Return the stripped message content of a chat completion, or ''."""
+        if not response.choices:
+            logger.error("OpenAI returned no choices")
+            return ""
+        content = (response.choices[0].message.content or "").strip()
+        if not content:
+            logger.error("OpenAI returned empty content")
+        return content
+    
+    @staticmethod
+    def _strip_code_fence(content: str) -> str:
+        """Remove markdown code blocks if present."""
+        if content.startswith("```"):
+            content = content.split("```")[1]
+            if content.startswith("json"):
+                content = content[4:]
+            content = content.strip()
+        return content
+    
+    @staticmethod
+    def _parse_trends(parsed) -> List[Dict]:
+        """Handle both array format and object with "trends" key."""
+        if isinstance(parsed, list):
+            return parsed
+        if isinstance(parsed, dict):
+            return parsed.get('trends', [parsed])
+        return []
+    
+    def _finalize_trends(
+        self,
+        trends: List[Dict],
+        source_references: List[Dict],
+        articles: List[Dict]
+    ) -> List[Dict]:
+        """
+        Enrich trends with metadata, map article numbers to sources and fill defaults.
+        
+        Heat-map scores, momentum and confidence reasoning are computed from
+        the supporting articles (``articles[n - 1]`` for article number n).
+        """
+        for trend in trends:
+            # Millisecond precision, as stored, so it is unchanged once reloaded
+            trend['dateAdded'] = to_millis(datetime.utcnow()).isoformat()
+            trend['status'] = 'current'
+            trend['author'] = 'Lighthouse AI Analyzer'
+            
+            # Set default values for missing fields
+            trend.setdefault('keywords', [])
+            trend.setdefault('justificationSummary', trend.get('whyTrend', ''))
+            # Only set default if not provided by AI
+            if not trend.get('howConsultanciesLeverage'):
+                trend['howConsultanciesLeverage'] = 'Consultancies can provide strategic advisory and implementation services to help organizations capitalize on this trend.'
+            trend.setdefault('analysisDetail', trend.get('strategicImpact', ''))
+            trend.setdefault('marketValidation', 'Multiple sources confirm this trend')
+            trend.setdefault('financialSignal', 'Significant market activity observed')
+            trend.setdefault('competitiveIntelligence', 'Multiple players active in this space')
+            trend.setdefault('actionGuidance', 'Monitor closely and assess strategic implications')
+        
+        return self.attach_sources(trends, source_references, articles)
+    
+    def attach_sources(
+        self,
+        trends: List[Dict],
+        source_references: List[Dict],
+        articles: List[Dict],
+        max_sources: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Map each trend's ``sourceArticleNumbers`` to sources and compute its scores.
+        
+        Scores use every supporting article; ``max_sources`` only limits how
+        many of them are listed in ``additionalSources``.
+        """
+        supporting = []
+        for trend in trends:
+            # Map source article numbers to actual source references
+            source_article_numbers = trend.pop('sourceArticleNumbers', [])
+            additional_sources = []
+            primary_source_url = 'https://lighthouse.ai/trends'
+            
+            article_numbers = self._valid_numbers(source_article_numbers, len(source_references))
+            supporting.append([n - 1 for n in article_numbers])
+            for article_num in article_numbers[:max_sources]:
+                source_ref = dict(source_references[article_num - 1])
+                duplicates = source_ref.pop('duplicates', [])
+                additional_sources.append(source_ref)
+                additional_sources.extend(duplicates)
+                # Use first source as primary
+                if primary_source_url == 'https://lighthouse.ai/trends':
+                    primary_source_url = source_ref.get('url') or 'https://lighthouse.ai/trends'
+            
+            trend['sourceUrl'] = primary_source_url
+            trend['additionalSources'] = additional_sources
+        
+        # Heat-map scores, momentum and confidence reasoning from article signals
+        for trend, signals in zip(trends, score_trends(articles, supporting)):
+            trend.update(signals)
+        
+        return trends
+    
     async def enrich_trend_with_ai(self, trend: Dict) -> Dict:
         """
         Enrich a single trend with additional AI-generated insights.
@@ -251,7 +848,108 @@ IMPORTANT: Keep analysisDetail, strategicImpact, and riskGovernance concise to a
             Enriched trend dictionary
         """
         try:
-            prompt = f"""Analyze this AI trend and provide strategic insights:
+            enrichment = await self._request_enrichment(trend)
+            trend.update(enrichment)
+            return trend
+            
+        except Exception as e:
+            logger.error(f"Error enriching trend with AI: {str(e)}")
+            return trend
+    
+    async def enrich_trends(
+        self,
+        trends: List[Dict],
+        pack_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Enrich many trends concurrently, in place.
+        
+        Enrichments are stored per trend version (a hash of the fields the
+        prompt reads), so a trend is only sent to the model once. Pending
+        trends are grouped ``pack_size`` to a request and at most
+        ``concurrency`` requests run at a time. A trend whose packed request
+        fails or comes back incomplete is retried on its own; a trend that
+        still fails keeps its fields unchanged.
+        
+        Args:
+            trends: Trend dictionaries to enrich
+            pack_size: Trends per request (default: settings.trend_enrich_pack_size)
+            concurrency: Concurrent requests (default: settings.trend_enrich_concurrency)
+            
+        Returns:
+            Counters for this call: trends, stored, enriched, failed, requests
+        """
+        pack_size = max(1, pack_size or settings.trend_enrich_pack_size)
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.trend_enrich_concurrency))
+        stats = {"trends": len(trends), "stored": 0, "enriched": 0, "failed": 0, "requests": 0}
+        
+        versions = [enrichment_version(t, self.model, ENRICH_PROMPT_VERSION) for t in trends]
+        stored = await enrichment_store.get_many(versions)
+        pending = []
+        for trend, version in zip(trends, versions):
+            if version in stored:
+                trend.update(stored[version])
+                stats["stored"] += 1
+            else:
+                pending.append(trend)
+        
+        async def run_single(trend: Dict) -> Optional[Dict]:
+            async with semaphore:
+                stats["requests"] += 1
+                try:
+                    return await self._request_enrichment(trend)
+                except Exception as e:
+                    logger.error(f"Error enriching trend '{trend.get('title', '')}': {str(e)}")
+                    return None
+        
+        async def run_batch(batch: List[Dict]) -> List[Optional[Dict]]:
+            if len(batch) == 1:
+                return [await run_single(batch[0])]
+            async with semaphore:
+                stats["requests"] += 1
+                try:
+                    results = await self._request_enrichments(batch)
+                except Exception as e:
+                    logger.error(f"Error enriching {len(batch)} trends in one request: {str(e)}")
+                    results = [None] * len(batch)
+            # Retry what the packed request missed, one trend per request
+            retried = await asyncio.gather(*(
+                run_single(trend) for trend, result in zip(batch, results) if result is None
+            ))
+            retried_iter = iter(retried)
+            return [result if result is not None else next(retried_iter) for result in results]
+        
+        batches = [pending[i:i + pack_size] for i in range(0, len(pending), pack_size)]
+        results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+        
+        fresh = {}
+        for batch, batch_results in zip(batches, results):
+            for trend, enrichment in zip(batch, batch_results):
+                if enrichment is None:
+                    stats["failed"] += 1
+                    continue
+                fresh[enrichment_version(trend, self.model, ENRICH_PROMPT_VERSION)] = enrichment
+                trend.update(enrichment)
+                stats["enriched"] += 1
+        await enrichment_store.save_many(fresh)
+        
+        for key, value in stats.items():
+            self.enrichment_stats[key] += value
+        logger.info(f"Enriched trends: {stats}")
+        return stats
+    
+    @staticmethod
+    def _clean_enrichment(data) -> Optional[Dict]:
+        """Keep the expected string fields; None if nothing usable came back."""
+        if not isinstance(data, dict):
+            return None
+        enrichment = {key: data[key] for key in ENRICHMENT_KEYS if isinstance(data.get(key), str) and data[key].strip()}
+        return enrichment or None
+    
+    async def _request_enrichment(self, trend: Dict) -> Dict:
+        """Ask the model for the enrichment fields of one trend."""
+        prompt = f"""Analyze this AI trend and provide strategic insights:
 
 Trend: {trend.get('title', '')}
 Summary: {trend.get('whyTrend', '')}
@@ -266,30 +964,61 @@ Provide:
 
 Format as JSON with keys: howConsultanciesLeverage, analysisDetail, marketValidation, financialSignal, competitiveIntelligence, actionGuidance"""
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a strategic AI analyst providing executive-level insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=800
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Parse JSON response
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
-            
-            enrichment = json.loads(content)
-            trend.update(enrichment)
-            
-            return trend
-            
-        except Exception as e:
-            logger.error(f"Error enriching trend with AI: {str(e)}")
-            return trend
+        response = await create_chat_completion(
+            timeout=self.enrich_timeout,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": ENRICH_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=800,
+            response_format={"type": "json_object"}
+        )
+        
+        content = self._response_content(response)
+        enrichment = self._clean_enrichment(json.loads(self._strip_code_fence(content)))
+        if enrichment is None:
+            raise ValueError("response has none of the enrichment fields")
+        return enrichment
+    
+    async def _request_enrichments(self, trends: List[Dict]) -> List[Optional[Dict]]:
+        """Ask for the enrichment fields of several trends in one structured request."""
+        listing = "\n".join(
+            f"[Trend {i}] {trend.get('title', '')}\nSummary: {trend.get('whyTrend', '')}\n"
+            for i, trend in enumerate(trends, 1)
+        )
+        prompt = f"""Analyze each of these AI trends and provide strategic insights:
+
+{listing}
+For each trend provide:
+1. How consultancies can leverage this (2-3 sentences)
+2. Detailed analysis (3-4 sentences)
+3. Market validation signals (2-3 sentences)
+4. Financial implications (2-3 sentences)
+5. Competitive intelligence (2-3 sentences)
+6. Actionable guidance for executives (2-3 sentences)
+
+Return a JSON object with an "enrichments" key containing one object per trend, with keys: trend (the trend number), howConsultanciesLeverage, analysisDetail, marketValidation, financialSignal, competitiveIntelligence, actionGuidance"""
+
+        response = await create_chat_completion(
+            timeout=self.enrich_timeout * len(trends),
+            model=self.model,
+            messages=[
+                {"role": "system", "content": ENRICH_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=800 * len(trends),
+            response_format={"type": "json_object"}
+        )
+        
+        content = self._response_content(response)
+        parsed = json.loads(self._strip_code_fence(content))
+        items = parsed.get('enrichments', []) if isinstance(parsed, dict) else parsed
+        results: List[Optional[Dict]] = [None] * len(trends)
+        for item in items if isinstance(items, list) else []:
+            numbers = self._valid_numbers([item.get('trend')] if isinstance(item, dict) else [], len(trends))
+            if numbers:
+                results[numbers[0] - 1] = self._clean_enrichment(item)
+        return results
@@ -0,0 +1,151 @@
+"""
+Content-addressed cache of trend analysis results.
+"""
+import copy
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING
+
+from config import settings
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_article(article: Dict) -> Tuple:
+    """The fields of an article that feed the analysis prompt."""
+    published = article.get('published') or article.get('pubDate') or article.get('published_date') or ''
+    if hasattr(published, 'isoformat'):
+        published = published.isoformat()
+    summary = article.get('summary') or article.get('content') or ''
+    duplicates = sorted((d.get('url') or '') for d in article.get('duplicates', []))
+    return (
+        (article.get('url') or article.get('link') or '').strip(),
+        (article.get('title') or '').strip(),
+        (article.get('source') or '').strip(),
+        article.get('priority') or '',
+        str(published),
+        str(summary).strip(),
+        duplicates,
+    )
+
+
+def analysis_cache_key(articles: List[Dict], top_n: int, model: str, prompt_version: str) -> str:
+    """
+    Hash the normalized article set and analysis parameters.
+
+    Articles are sorted so the same set in a different order maps to the
+    same key.
+    """
+    normalized = sorted(_normalize_article(a) for a in articles)
+    payload = json.dumps(
+        {"articles": normalized, "top_n": top_n, "model": model, "prompt_version": prompt_version},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TrendCache:
+    """
+    TTL cache of analysis results keyed by ``analysis_cache_key``.
+    
+    An in-memory LRU sits in front of the ``trend_cache`` MongoDB
+    collection, which expires entries with a TTL index. Without a database
+    connection only the in-memory layer is used.
+    """
+    
+    collection_name = "trend_cache"
+    
+    def __init__(self, ttl_seconds: int = 6 * 3600, max_entries: int = 128):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, Tuple[datetime, List[Dict]]]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "store_hits": 0,
+            "misses": 0,
+        }
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    async def ensure_indexes(self):
+        """Let MongoDB drop entries once they expire."""
+        collection = self._collection()
+        if collection is None:
+            return
+        await collection.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+    
+    def _remember(self, key: str, expires_at: datetime, trends: List[Dict]):
+        self._lru[key] = (expires_at, trends)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+    
+    async def get(self, key: str) -> Optional[List[Dict]]:
+        """Cached trends for a key, or None if missing or expired."""
+        now = datetime.utcnow()
+        entry = self._lru.get(key)
+        if entry:
+            expires_at, trends = entry
+            if expires_at > now:
+                self._lru.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return copy.deepcopy(trends)
+            del self._lru[key]
+    
+        collection = self._collection()
+        if collection is not None:
+            try:
+                doc = await collection.find_one({"_id": key, "expires_at": {"$gt": now}})
+            except Exception as e:
+                logger.warning(f"Failed to read trend cache: {str(e)}")
+                doc = None
+            if doc:
+                self._remember(key, doc["expires_at"], doc["trends"])
+                self.stats["store_hits"] += 1
+                return copy.deepcopy(doc["trends"])
+    
+        self.stats["misses"] += 1
+        return None
+    
+    async def set(self, key: str, trends: List[Dict]):
+        """Store trends under a key for ``ttl_seconds``."""
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        trends = copy.deepcopy(trends)
+        self._remember(key, expires_at, trends)
+        collection = self._collection()
+        if collection is None:
+            return
+        doc = {"_id": key, "trends": trends, "created_at": datetime.utcnow(), "expires_at": expires_at}
+        try:
+            await collection.replace_one({"_id": key}, doc, upsert=True)
+        except Exception as e:
+            logger.warning(f"Failed to write trend cache: {str(e)}")
+    
+    def snapshot(self) -> Dict:
+        """Hit/miss counters and ratios."""
+        hits = self.stats["memory_hits"] + self.stats["store_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._lru),
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_hit_ratio": round(self.stats["memory_hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Global trend analysis cache
+trend_cache = TrendCache(
+    ttl_seconds=settings.trend_cache_ttl_minutes * 60,
+    max_entries=settings.trend_cache_max_entries,
+)
@@ -0,0 +1,155 @@
+"""
+Process-local stale-while-revalidate cache of the serialized trend feed.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from config import settings
+from services.trend_snapshots import trend_snapshots
+
+logger = logging.getLogger(__name__)
+
+# Query of the default top-ten feed: (status, category, search, limit)
+DEFAULT_FEED = ("current", None, None, 50)
+
+
+async def build_trend_feed(status: Optional[str], category: Optional[str], search: Optional[str], limit: int) -> Dict:
+    """The ``GET /api/trends`` payload for a query, from the latest snapshot."""
+    snapshot, trends = await trend_snapshots.list_trends(
+        status=status,
+        category=category,
+        search=search,
+        limit=limit
+    )
+    return {
+        "trends": trends,
+        "count": len(trends),
+        "snapshot": {
+            "version": snapshot["version"],
+            "created_at": snapshot["created_at"],
+            "parameters": snapshot["parameters"]
+        } if snapshot else None
+    }
+
+
+class TrendFeedCache:
+    """
+    Serialized trend feeds, pre-encoded with a strong ETag.
+    
+    Each entry holds the JSON body as bytes and an ETag derived from those
+    bytes, so identical feeds get identical ETags in every process. An
+    entry is stale once it is older than ``fresh_seconds`` or a newer
+    snapshot has been published in this process; stale entries are still
+    served while a single background refresh per query rebuilds them.
+    Only a query that was never built waits for the build.
+    """
+    
+    def __init__(self, fresh_seconds: float = 10.0, max_entries: int = 64):
+        self.fresh_seconds = fresh_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "not_modified": 0, "refreshes": 0}
+    
+    @staticmethod
+    def _key(status: Optional[str], category: Optional[str], search: Optional[str], limit: int) -> tuple:
+        search = search.strip().lower() if search else None
+        return (status or None, category or None, search or None, limit)
+    
+    async def _build(self, key: tuple) -> Dict:
+        # Read the version first so a snapshot published mid-build marks the entry stale
+        version = trend_snapshots.version
+        payload = await build_trend_feed(*key)
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        entry = {
+            "body": body,
+            "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            "version": payload["snapshot"]["version"] if payload["snapshot"] else version,
+            "built_at": time.monotonic(),
+        }
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+    
+    async def _refresh(self, key: tuple):
+        try:
+            await self._build(key)
+            self.stats["refreshes"] += 1
+        except Exception as e:
+            logger.warning(f"Failed to refresh trend feed {key}: {str(e)}")
+        finally:
+            self._refreshing.pop(key, None)
+    
+    async def get(
+        self,
+        status: Optional[str] = "current",
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict:
+        """Cached feed entry (``body``, ``etag``) for a query, refreshed in the background when stale."""
+        key = self._key(status, category, search, limit)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return await self._build(key)
+        
+        self._entries.move_to_end(key)
+        stale = (
+            time.monotonic() - entry["built_at"] > self.fresh_seconds
+            or entry["version"] != trend_snapshots.version
+        )
+        if stale:
+            self.stats["stale_hits"] += 1
+            if key not in self._refreshing:
+                self._refreshing[key] = asyncio.create_task(self._refresh(key))
+        else:
+            self.stats["hits"] += 1
+        return entry
+    
+    @staticmethod
+    def matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Whether an If-None-Match header value matches the ETag."""
+        if not if_none_match:
+            return False
+        # If-None-Match uses weak comparison, so W/ validators match too
+        candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+    
+    def not_modified(self, if_none_match: Optional[str], entry: Dict) -> bool:
+        """Whether a request with this If-None-Match header gets a 304 for the entry; counted in stats."""
+        if not self.matches(if_none_match, entry["etag"]):
+            return False
+        self.stats["not_modified"] += 1
+        return True
+    
+    async def warm(self):
+        """Build the default feed, e.g. at startup."""
+        try:
+            await self._build(self._key(*DEFAULT_FEED))
+        except Exception as e:
+            logger.warning(f"Failed to warm the trend feed cache: {str(e)}")
+    
+    def snapshot(self) -> Dict:
+        """Counters plus entry and refresh counts."""
+        served = self.stats["hits"] + self.stats["stale_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "refreshing": len(self._refreshing),
+            "hit_ratio": round((self.stats["hits"] + self.stats["stale_hits"]) / served, 3) if served else 0.0,
+        }
+
+
+# Global trend feed cache
+trend_feed_cache = TrendFeedCache(
+    fresh_seconds=settings.trend_feed_fresh_seconds,
+    max_entries=settings.trend_feed_max_entries
+)
@@ -0,0 +1,150 @@
+"""
+Heat-map, momentum and confidence signals computed from the articles behind each trend.
+"""
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.prompt_packer import PRIORITY_WEIGHT, RECENCY_HALF_LIFE_HOURS
+
+# Rolling windows (hours) for article counts
+WINDOWS_HOURS = np.array([24.0, 72.0, 168.0])
+# Momentum compares the article rate of the last 3 days with the 4 days before
+RECENT_HOURS = 72.0
+PRIOR_HOURS = 96.0
+ACCELERATING_RATIO = 1.25
+# Undated articles are treated as this old
+UNDATED_AGE_HOURS = 168.0
+
+# Evidence terms (regex alternations) per heat-map dimension;
+# competitiveIntensity comes from source diversity instead
+LEXICONS = {
+    'capabilityMaturity': r"launch\w*|releas\w*|generally available|production|benchmark\w*|state[- ]of[- ]the[- ]art|ship\w*|roll\w* out|rollout",
+    'capitalBacking': r"funding|raises?|raised|series [a-f]|valuation\w*|invest\w*|billion|acqui\w*|ipo|venture",
+    'enterpriseAdoption': r"enterprise\w*|customers?|deploy\w*|adopt\w*|partner\w*|pilot\w*|contracts?|businesses",
+    'regulatoryFriction': r"regulat\w*|laws?|lawsuits?|legislat\w*|complian\w*|bans?|banned|antitrust|copyright|court|fines?|privacy|ai act",
+}
+DIMENSIONS = list(LEXICONS)
+# All lexicons in one pattern so each article is scanned once
+_LEXICON_RE = re.compile(r"\b(?:" + "|".join(f"(?P<{name}>{terms})" for name, terms in LEXICONS.items()) + r")\b")
+
+
+def _age_hours(value, now: datetime) -> float:
+    if isinstance(value, datetime):
+        published = value.replace(tzinfo=None)
+    else:
+        try:
+            published = datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            return UNDATED_AGE_HOURS
+    return max(0.0, (now - published).total_seconds() / 3600)
+
+
+def _plural(count: int, word: str) -> str:
+    return f"{count} {word}" if count == 1 else f"{count} {word}s"
+
+
+def _to_score(fraction: np.ndarray) -> np.ndarray:
+    """Map 0..1 to integer scores 1..10."""
+    return np.clip(np.rint(1 + 9 * fraction), 1, 10).astype(int)
+
+
+def score_trends(
+    articles: List[Dict],
+    supporting: List[List[int]],
+    now: Optional[datetime] = None
+) -> List[Dict]:
+    """
+    Compute ``heatMapScores``, ``trendMomentum`` and ``confidenceReasoning``.
+    
+    ``supporting[t]`` holds the indices into ``articles`` backing trend t.
+    Syndicated copies listed under an article's ``duplicates`` count as
+    coverage from their own publisher. All trends are scored at once over a
+    padded trend x article matrix.
+    """
+    now = now or datetime.utcnow()
+    
+    # One row per supporting article or syndicated copy
+    rows = []
+    row_owner = []
+    for index in sorted({i for indices in supporting for i in indices}):
+        article = articles[index]
+        text = f"{article.get('title', '')} {article.get('summary') or article.get('content') or ''}".lower()
+        rows.append((article.get('source') or 'Unknown', article.get('priority'), article.get('published_date'), text))
+        row_owner.append(index)
+        for duplicate in article.get('duplicates', []):
+            rows.append((duplicate.get('source') or 'Unknown', None, duplicate.get('published_date'), text))
+            row_owner.append(index)
+    
+    publishers = {}
+    publisher_id = np.array([publishers.setdefault(r[0], len(publishers)) for r in rows] + [-1])
+    weight = np.array([PRIORITY_WEIGHT.get(r[1], PRIORITY_WEIGHT['medium']) for r in rows] + [0.0])
+    high = np.array([r[1] == 'high' for r in rows] + [False])
+    age = np.array([_age_hours(r[2], now) for r in rows] + [np.inf])
+    hits = np.zeros((len(rows) + 1, len(DIMENSIONS)))
+    matched_cache: Dict[str, set] = {}
+    for row, r in enumerate(rows):
+        matched = matched_cache.get(r[3])
+        if matched is None:
+            matched = matched_cache[r[3]] = {m.lastgroup for m in _LEXICON_RE.finditer(r[3])}
+        hits[row] = [d in matched for d in DIMENSIONS]
+    
+    # Padded trend x row index matrix; the extra last row is an empty pad
+    rows_of_article: Dict[int, List[int]] = {}
+    for row, owner in enumerate(row_owner):
+        rows_of_article.setdefault(owner, []).append(row)
+    trend_rows = [[row for i in indices for row in rows_of_article.get(i, [])] for indices in supporting]
+    width = max((len(r) for r in trend_rows), default=0) or 1
+    pad = len(rows)
+    matrix = np.full((len(supporting), width), pad)
+    for t, r in enumerate(trend_rows):
+        matrix[t, :len(r)] = r
+    valid = matrix != pad
+    
+    a = age[matrix]
+    decay = np.where(valid, 0.5 ** (np.where(valid, a, 0) / RECENCY_HALF_LIFE_HOURS), 0.0)
+    mass = decay * weight[matrix]
+    total_mass = mass.sum(axis=1)
+    
+    counts = (valid[:, :, None] & (a[:, :, None] <= WINDOWS_HOURS)).sum(axis=1)
+    total = valid.sum(axis=1)
+    recent = (valid & (a <= RECENT_HOURS)).sum(axis=1)
+    prior = (valid & (a > RECENT_HOURS) & (a <= RECENT_HOURS + PRIOR_HOURS)).sum(axis=1)
+    ratio = (recent / (RECENT_HOURS / 24) + 0.25) / (prior / (PRIOR_HOURS / 24) + 0.25)
+    
+    ids = np.sort(publisher_id[matrix], axis=1)
+    first = np.ones_like(ids, dtype=bool)
+    first[:, 1:] = ids[:, 1:] != ids[:, :-1]
+    distinct = (first & (ids >= 0)).sum(axis=1)
+    high_count = high[matrix].sum(axis=1)
+    
+    # Lexicon dimensions: share of weighted coverage, discounted when evidence is thin
+    evidence = np.einsum('tm,tmd->td', mass, hits[matrix])
+    share = evidence / np.maximum(total_mass, 1e-9)[:, None]
+    lexicon_scores = _to_score(share * (1 - np.exp(-evidence / 1.5)))
+    competitive_scores = _to_score(1 - np.exp(-distinct / 5))
+    
+    early = (total < 3) | (distinct < 2)
+    momentum = np.where(early, 'Early Signal', np.where(ratio >= ACCELERATING_RATIO, 'Accelerating', 'Mainstream Adoption'))
+    
+    results = []
+    for t in range(len(supporting)):
+        scores = {d: int(lexicon_scores[t, j]) for j, d in enumerate(DIMENSIONS)}
+        scores['competitiveIntensity'] = int(competitive_scores[t])
+        if total[t]:
+            reasoning = (
+                f"{_plural(int(total[t]), 'supporting article')} from {_plural(int(distinct[t]), 'source')} "
+                f"({int(high_count[t])} from high-priority sources); "
+                f"{int(counts[t, 0])} in the last 24 hours, {int(counts[t, 1])} in 3 days, {int(counts[t, 2])} in 7 days. "
+                f"Coverage rate over the last 3 days is {ratio[t]:.1f}x the prior 4 days."
+            )
+        else:
+            reasoning = "No supporting articles could be matched to this trend"
+        results.append({
+            'heatMapScores': scores,
+            'trendMomentum': str(momentum[t]),
+            'confidenceReasoning': reasoning,
+        })
+    return results
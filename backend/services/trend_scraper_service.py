@@ -5,14 +5,27 @@ import json
 import logging
 import asyncio
 from pathlib import Path
-from typing import List, Dict
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
+from scrapers.base_scraper import BaseScraper
 from scrapers.rss_scraper import RSSFeedScraper
+from scrapers.feed_discovery import FeedDiscoverer, FeedDiscoveryCache
+from scrapers.html_scraper import HTMLListingScraper
+from scrapers.validator_store import validator_store
+from scrapers.rate_limiter import host_rate_limiter
+from scrapers.seen_index import seen_index, diff_source_counts
 from services.trend_analyzer import TrendAnalyzer
+from services.trend_tracker import TrendTracker
+from services.dedup import dedupe_articles
+from services.article_store import article_store
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Sort order for the source ``priority`` field
+PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
 
 class TrendScraperService:
     """Orchestrates web scraping and trend analysis."""
@@ -21,6 +34,22 @@ class TrendScraperService:
         self.sources_file = Path(__file__).parent.parent / sources_file
         self.sources_config = self._load_sources()
         self.trend_analyzer = TrendAnalyzer()
+        self.trend_tracker = TrendTracker(self.trend_analyzer)
+        scraping_config = self.sources_config.get('scraping_config', {})
+        self.user_agent = scraping_config.get('user_agent', 'LighthouseAI-TrendBot/1.0')
+        self.feed_discovery_cache = FeedDiscoveryCache(
+            ttl_hours=scraping_config.get('feed_discovery_ttl_hours', 168),
+            negative_ttl_hours=scraping_config.get('feed_discovery_negative_ttl_hours', 24)
+        )
+        self.last_run_stats: Dict = {}
+        # Cumulative counts of article collections for analysis and of full
+        # scrape runs; a collection scrapes inline unless the scheduler has
+        # stored articles
+        self.run_counts: Dict[str, int] = {"article_loads": 0, "scrapes": 0}
+        # Outcome of the latest scrape per source name (used for scheduler backoff)
+        self.source_status: Dict[str, Dict] = {}
+        # Global cap on sources scraped at once, shared by all runs and the scheduler
+        self.source_semaphore = asyncio.Semaphore(scraping_config.get('max_concurrent_sources', 8))
     
     def _load_sources(self) -> Dict:
         """Load sources configuration from JSON file."""
@@ -31,102 +60,305 @@ class TrendScraperService:
             logger.error(f"Error loading sources config: {str(e)}")
             return {"sources": [], "scraping_config": {}}
     
-    async def scrape_all_sources(self, max_articles_per_source: int = 10) -> List[Dict]:
+    def configure_rate_limits(self):
         """
-        Scrape articles from all enabled sources.
-        
-        Args:
-            max_articles_per_source: Maximum articles to scrape per source
-            
-        Returns:
-            List of article dictionaries
+        Apply ``scraping_config.per_host_rate_limit`` to the process-wide
+        per-host limiter. Called once at startup, since it resets the buckets
+        every scraper shares.
         """
-        all_articles = []
-        scraping_config = self.sources_config.get('scraping_config', {})
-        user_agent = scraping_config.get('user_agent', 'LighthouseAI-TrendBot/1.0')
+        rate_limit = self.sources_config.get('scraping_config', {}).get('per_host_rate_limit', {})
+        host_rate_limiter.configure(
+            requests_per_second=rate_limit.get('requests_per_second', 2.0),
+            burst=rate_limit.get('burst', 4),
+            hosts=rate_limit.get('hosts', {})
+        )
+    
+    def sources(self) -> List[Dict]:
+        """
+        Collect all enabled sources, highest priority first.
         
-        # Collect all sources with RSS feeds
-        rss_sources = []
+        Sources without an RSS feed use their listing rules if configured,
+        otherwise go through feed discovery.
+        """
+        sources = []
         for category_data in self.sources_config.get('sources', []):
             for source in category_data.get('sources', []):
-                if source.get('scrape_enabled') and source.get('rss_feed'):
-                    rss_sources.append({
+                if source.get('scrape_enabled'):
+                    sources.append({
                         'name': source['name'],
                         'url': source['url'],
-                        'rss_feed': source['rss_feed'],
+                        'rss_feed': source.get('rss_feed'),
+                        'listing': source.get('listing'),
                         'priority': source.get('priority', 'medium')
                     })
+        # Stable sort keeps config order within a priority level
+        sources.sort(key=lambda s: PRIORITY_RANK.get(s['priority'], PRIORITY_RANK['medium']))
+        return sources
+    
+    async def _scrape_source(
+        self,
+        source: Dict,
+        user_agent: str,
+        max_articles: int,
+        only_new: bool = False
+    ) -> List[Dict]:
+        """
+        Scrape one source once a slot under the global concurrency cap is free.
+        
+        Scraped articles are persisted to the article store, and only then
+        marked in the seen-article index, so entries that fail to parse or
+        store are picked up again on the next run.
+        """
+        async with self.source_semaphore:
+            if source['listing'] and not source['rss_feed']:
+                articles, scraper = await self._scrape_listing_source(
+                    source['name'],
+                    source['url'],
+                    source['listing'],
+                    user_agent,
+                    max_articles,
+                    only_new
+                )
+            else:
+                articles, scraper = await self._scrape_rss_source(
+                    source['name'],
+                    source['url'],
+                    source['rss_feed'],
+                    user_agent,
+                    max_articles,
+                    only_new
+                )
+        if await article_store.save_many(articles):
+            if scraper is not None:
+                await seen_index.mark_seen(source['name'], scraper.unseen)
+        elif scraper is not None:
+            # Retry the entries next time even if the feed is unchanged
+            await scraper.forget_validators()
+        return articles
+    
+    async def scrape_source(self, name: str, max_articles: int = 10, only_new: bool = False) -> List[Dict]:
+        """
+        Scrape one enabled source by name, e.g. for a scheduled poll.
+        
+        Articles are persisted like in a full run, and the outcome is
+        recorded in ``source_status``.
+        
+        Args:
+            name: Source name as configured
+            max_articles: Maximum articles to scrape
+            only_new: Skip articles already in the seen-article index
+            
+        Returns:
+            List of article dictionaries
+            
+        Raises:
+            KeyError: If no enabled source has that name
+        """
+        source = next((s for s in self.sources() if s['name'] == name), None)
+        if source is None:
+            raise KeyError(f"No enabled source named '{name}'")
+        return await self._scrape_source(source, self.user_agent, max_articles, only_new)
+    
+    def _note_source_result(self, name: str, ok: bool, article_count: int = 0):
+        """Record the outcome of scraping a source."""
+        self.source_status[name] = {
+            'ok': ok,
+            'articles': article_count,
+            'checked_at': datetime.utcnow().isoformat()
+        }
+    
+    async def stream_all_sources(
+        self,
+        max_articles_per_source: int = 10,
+        only_new: bool = False
+    ) -> AsyncIterator[Dict]:
+        """
+        Scrape all enabled sources, yielding articles as each source finishes.
         
-        logger.info(f"Scraping {len(rss_sources)} RSS sources...")
-        
-        # Scrape sources concurrently
-        tasks = []
-        for source in rss_sources:
-            task = self._scrape_rss_source(
-                source['name'],
-                source['url'],
-                source['rss_feed'],
-                user_agent,
-                max_articles_per_source
+        Sources are started in priority order with at most
+        ``scraping_config.max_concurrent_sources`` in flight; requests are
+        additionally rate limited per host. Closing the generator early
+        cancels the sources still pending.
+        
+        Args:
+            max_articles_per_source: Maximum articles to scrape per source
+            only_new: Skip articles already in the seen-article index
+            
+        Yields:
+            Article dictionaries
+        """
+        self.run_counts["scrapes"] += 1
+        stats_before = validator_store.snapshot()
+        seen_before = seen_index.snapshot()
+        
+        sources = self.sources()
+        discovery_count = sum(1 for s in sources if not s['rss_feed'] and not s['listing'])
+        logger.info(f"Scraping {len(sources)} sources ({discovery_count} via feed discovery)...")
+        
+        # Scrape sources concurrently, bounded by the global cap
+        tasks = [
+            asyncio.ensure_future(
+                self._scrape_source(source, self.user_agent, max_articles_per_source, only_new)
             )
-            tasks.append(task)
+            for source in sources
+        ]
         
-        # Wait for all scraping tasks
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        article_count = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    articles = await next_done
+                except Exception as e:
+                    logger.error(f"Scraping task failed: {str(e)}")
+                    continue
+                for article in articles:
+                    article_count += 1
+                    yield article
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
         
-        # Collect articles
-        for result in results:
-            if isinstance(result, list):
-                all_articles.extend(result)
-            elif isinstance(result, Exception):
-                logger.error(f"Scraping task failed: {str(result)}")
+        self._record_run_stats(len(sources), article_count, stats_before, seen_before)
+    
+    async def scrape_all_sources(
+        self,
+        max_articles_per_source: int = 10,
+        only_new: bool = False
+    ) -> List[Dict]:
+        """
+        Scrape articles from all enabled sources.
         
-        logger.info(f"Total articles scraped: {len(all_articles)}")
-        return all_articles
+        Args:
+            max_articles_per_source: Maximum articles to scrape per source
+            only_new: Skip articles already in the seen-article index
+            
+        Returns:
+            List of article dictionaries
+        """
+        return [
+            article
+            async for article in self.stream_all_sources(max_articles_per_source, only_new)
+        ]
+    
+    def _record_run_stats(
+        self,
+        source_count: int,
+        article_count: int,
+        stats_before: Dict,
+        seen_before: Dict
+    ):
+        """Store per-run counters for the scrape that just finished."""
+        stats_after = validator_store.snapshot()
+        per_source = diff_source_counts(seen_before, seen_index.snapshot())
+        self.last_run_stats = {
+            "sources": source_count,
+            "articles": article_count,
+            "feeds_skipped": (stats_after["not_modified"] - stats_before["not_modified"])
+            + (stats_after["unchanged_content"] - stats_before["unchanged_content"]),
+            "not_modified": stats_after["not_modified"] - stats_before["not_modified"],
+            "unchanged_content": stats_after["unchanged_content"] - stats_before["unchanged_content"],
+            "bytes_saved": stats_after["bytes_saved"] - stats_before["bytes_saved"],
+            "new_entries": sum(counts["new"] for counts in per_source.values()),
+            "seen_entries": sum(counts["seen"] for counts in per_source.values()),
+            "per_source": per_source,
+        }
+        
+        logger.info(
+            f"Total articles scraped: {article_count} "
+            f"({self.last_run_stats['feeds_skipped']} unchanged feeds skipped, "
+            f"{self.last_run_stats['bytes_saved']} bytes saved)"
+        )
+    
+    async def _resolve_feed(self, name: str, url: str, user_agent: str) -> Optional[str]:
+        """Find the feed URL of a source without a configured one, using the discovery cache."""
+        cached = await self.feed_discovery_cache.get(url)
+        if cached is not None:
+            return cached.get('feed_url')
+        
+        async with FeedDiscoverer(name, url, user_agent) as discoverer:
+            feed_url = await discoverer.discover()
+        if feed_url is None and discoverer.transient_failure:
+            # Probes that 404 are a clean "no feed"; a timeout or outage is
+            # not, so retry on the next run instead of caching the miss
+            logger.warning(f"Feed discovery for {name} hit transient errors, not caching the miss")
+            return None
+        await self.feed_discovery_cache.set(url, feed_url)
+        return feed_url
     
     async def _scrape_rss_source(
         self,
         name: str,
         url: str,
-        rss_feed: str,
+        rss_feed: Optional[str],
         user_agent: str,
-        max_articles: int
-    ) -> List[Dict]:
-        """Scrape a single RSS source."""
+        max_articles: int,
+        only_new: bool = False
+    ) -> Tuple[List[Dict], Optional[BaseScraper]]:
+        """
+        Scrape a single RSS source, discovering its feed first if none is configured.
+        
+        Returns the articles and the scraper, for its ``unseen`` entries and
+        recorded validators (None if the source failed before scraping).
+        """
         try:
+            if not rss_feed:
+                rss_feed = await self._resolve_feed(name, url, user_agent)
+                if not rss_feed:
+                    self._note_source_result(name, ok=False)
+                    return [], None
             async with RSSFeedScraper(name, url, rss_feed, user_agent) as scraper:
-                articles = await scraper.scrape_articles(max_articles)
-                return [article.to_dict() for article in articles]
+                articles = await scraper.scrape_articles(max_articles, skip_seen=only_new)
+                self._note_source_result(name, ok=not scraper.failed, article_count=len(articles))
+                return [article.to_dict() for article in articles], scraper
         except Exception as e:
             logger.error(f"Error scraping {name}: {str(e)}")
-            return []
+            self._note_source_result(name, ok=False)
+            return [], None
     
-    async def discover_and_analyze_trends(
+    async def _scrape_listing_source(
         self,
-        top_n: int = 10,
-        lookback_days: int = 7
-    ) -> List[Dict]:
+        name: str,
+        url: str,
+        rules: Dict,
+        user_agent: str,
+        max_articles: int,
+        only_new: bool = False
+    ) -> Tuple[List[Dict], Optional[BaseScraper]]:
         """
-        Discover and analyze top AI trends from scraped articles.
+        Scrape a single source from its HTML listing page.
         
-        Args:
-            top_n: Number of top trends to return
-            lookback_days: Number of days to look back for articles
-            
-        Returns:
-            List of trend dictionaries
+        Returns the articles and the scraper, for its ``unseen`` entries and
+        recorded validators (None if the source failed before scraping).
         """
-        logger.info(f"Starting trend discovery (top {top_n}, lookback {lookback_days} days)...")
+        try:
+            async with HTMLListingScraper(name, url, rules, user_agent) as scraper:
+                articles = await scraper.scrape_articles(max_articles, skip_seen=only_new)
+                self._note_source_result(name, ok=not scraper.failed, article_count=len(articles))
+                return [article.to_dict() for article in articles], scraper
+        except Exception as e:
+            logger.error(f"Error scraping {name}: {str(e)}")
+            self._note_source_result(name, ok=False)
+            return [], None
+    
+    async def _recent_articles(self, lookback_days: int) -> List[Dict]:
+        """Deduplicated, priority-tagged articles from the lookback window."""
+        self.run_counts["article_loads"] += 1
+        cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
         
-        # Scrape articles from all sources
-        articles = await self.scrape_all_sources()
+        # Read articles pre-scraped by the scheduler; scrape inline otherwise
+        articles = []
+        if settings.scrape_scheduler_enabled:
+            articles = await article_store.recent(cutoff_date)
+            logger.info(f"Loaded {len(articles)} pre-scraped articles")
+        if not articles:
+            articles = await self.scrape_all_sources()
         
         if not articles:
             logger.warning("No articles scraped, cannot analyze trends")
             return []
         
         # Filter articles by date
-        cutoff_date = datetime.utcnow() - timedelta(days=lookback_days)
         recent_articles = [
             article for article in articles
             if article.get('published_date') and 
@@ -137,7 +369,44 @@ class TrendScraperService:
             logger.warning(f"No articles found within {lookback_days} days")
             recent_articles = articles[:50]  # Use most recent 50 if date filtering fails
         
+        # Collapse syndicated copies so they don't crowd out distinct stories
+        recent_articles = dedupe_articles(recent_articles)
+        
+        # Tag articles with their source priority for prompt packing
+        priorities = {source['name']: source['priority'] for source in self.sources()}
+        for article in recent_articles:
+            article.setdefault('priority', priorities.get(article.get('source'), 'medium'))
+        
+        return recent_articles
+    
+    async def discover_and_analyze_trends(
+        self,
+        top_n: int = 10,
+        lookback_days: int = 7,
+        on_stage: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> List[Dict]:
+        """
+        Discover and analyze top AI trends from scraped articles.
+        
+        Args:
+            top_n: Number of top trends to return
+            lookback_days: Number of days to look back for articles
+            on_stage: Awaited with the name of each stage as it starts
+            
+        Returns:
+            List of trend dictionaries
+        """
+        logger.info(f"Starting trend discovery (top {top_n}, lookback {lookback_days} days)...")
+        
+        if on_stage:
+            await on_stage("collecting articles")
+        recent_articles = await self._recent_articles(lookback_days)
+        if not recent_articles:
+            return []
+        
         logger.info(f"Analyzing {len(recent_articles)} recent articles...")
+        if on_stage:
+            await on_stage("analyzing trends")
         
         # Analyze articles for trends using AI
         trends = await self.trend_analyzer.analyze_articles_for_trends(
@@ -148,6 +417,66 @@ class TrendScraperService:
         logger.info(f"Discovered {len(trends)} trends")
         return trends
     
+    async def stream_trends(
+        self,
+        top_n: int = 10,
+        lookback_days: int = 7
+    ) -> AsyncIterator[Dict]:
+        """
+        Discover trends like ``discover_and_analyze_trends``, yielding each
+        trend as soon as the model has finished writing it.
+        
+        Args:
+            top_n: Number of top trends to return
+            lookback_days: Number of days to look back for articles
+            
+        Yields:
+            Trend dictionaries
+        """
+        logger.info(f"Starting streamed trend discovery (top {top_n}, lookback {lookback_days} days)...")
+        
+        recent_articles = await self._recent_articles(lookback_days)
+        if not recent_articles:
+            return
+        
+        logger.info(f"Analyzing {len(recent_articles)} recent articles...")
+        async for trend in self.trend_analyzer.stream_articles_for_trends(recent_articles, top_n=top_n):
+            yield trend
+    
+    async def maintain_trends(
+        self,
+        top_n: int = 10,
+        lookback_days: int = 7,
+        on_stage: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> List[Dict]:
+        """
+        Update stored trends with new articles instead of rediscovering them.
+        
+        New articles join existing trends where they match; the model is
+        only asked about unassigned clusters that look like new trends.
+        
+        Args:
+            top_n: Number of top trends to return
+            lookback_days: Number of days to look back for articles
+            on_stage: Awaited with the name of each stage as it starts
+            
+        Returns:
+            List of current trend dictionaries with stable ids
+        """
+        logger.info(f"Starting incremental trend update (top {top_n}, lookback {lookback_days} days)...")
+        
+        if on_stage:
+            await on_stage("collecting articles")
+        recent_articles = await self._recent_articles(lookback_days)
+        if not recent_articles:
+            return []
+        
+        if on_stage:
+            await on_stage("updating trends")
+        trends = await self.trend_tracker.update(recent_articles, top_n=top_n)
+        logger.info(f"Maintained {len(trends)} current trends")
+        return trends
+    
     def get_sources_summary(self) -> Dict:
         """Get summary of configured sources."""
         total_sources = 0
@@ -0,0 +1,276 @@
+"""
+Versioned snapshots of discovered trends, served to the read API.
+"""
+import copy
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+
+from config import settings
+from database import get_database
+from services.pagination import keyset_filter, keyset_sort, page_in_memory, to_millis
+from services.trend_store import new_trend_id
+
+logger = logging.getLogger(__name__)
+
+# Snapshot bookkeeping fields not returned to API clients
+INTERNAL_FIELDS = ("_id", "snapshotVersion", "rank")
+
+
+def _added_at(value) -> Optional[datetime]:
+    """A trend's ``dateAdded`` as a millisecond datetime, as stored and used in cursors."""
+    if isinstance(value, datetime):
+        return to_millis(value)
+    try:
+        return to_millis(datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None))
+    except ValueError:
+        return None
+
+
+class TrendSnapshotStore:
+    """
+    Each discover run stored as a versioned snapshot.
+    
+    Trend documents go to the ``trends`` collection tagged with their
+    ``snapshotVersion`` and ``rank``; the snapshot record in
+    ``trend_snapshots`` is written last, so readers only see complete
+    snapshots. The latest snapshot is held in memory for the read API and
+    re-checked against the database at most every ``check_interval``
+    seconds, which picks up snapshots written by other workers. Snapshots
+    beyond the newest ``retention`` are deleted.
+    """
+    
+    collection_name = "trends"
+    snapshots_collection_name = "trend_snapshots"
+    
+    def __init__(self, retention: int = 20, check_interval: float = 30.0):
+        self.retention = retention
+        self.check_interval = check_interval
+        self._latest: Optional[Dict] = None
+        self._checked_at = 0.0
+    
+    def _collection(self, name: Optional[str] = None):
+        try:
+            return get_database()[name or self.collection_name]
+        except RuntimeError:
+            return None
+    
+    async def ensure_indexes(self):
+        """Create the indexes used by the read paths."""
+        collection = self._collection()
+        if collection is None:
+            return
+        await collection.create_index([("snapshotVersion", ASCENDING), ("rank", ASCENDING)])
+        await collection.create_index([("dateAdded", DESCENDING), ("_id", DESCENDING)])
+        await collection.create_index([("status", ASCENDING), ("dateAdded", DESCENDING), ("_id", DESCENDING)])
+        await collection.create_index([("trendCategory", ASCENDING), ("dateAdded", DESCENDING), ("_id", DESCENDING)])
+    
+    @staticmethod
+    def _to_document(trend: Dict, version: int, rank: int) -> Dict:
+        # dateAdded is stored as a datetime so history pages by time rather
+        # than by string comparison of ISO strings
+        return {
+            **trend,
+            '_id': f"{version}-{trend['id']}",
+            'snapshotVersion': version,
+            'rank': rank,
+            'dateAdded': _added_at(trend.get('dateAdded')),
+        }
+    
+    @staticmethod
+    def to_trend(doc: Dict) -> Dict:
+        """Public trend payload of a stored document."""
+        trend = {key: value for key, value in doc.items() if key not in INTERNAL_FIELDS}
+        if isinstance(trend.get('dateAdded'), datetime):
+            trend['dateAdded'] = trend['dateAdded'].isoformat()
+        return trend
+    
+    def _set_latest(self, snapshot: Dict, trends: List[Dict]):
+        self._latest = {
+            'version': snapshot['_id'],
+            'created_at': snapshot['created_at'].isoformat(),
+            'parameters': snapshot.get('parameters', {}),
+            'count': len(trends),
+            'trends': trends,
+            'by_id': {trend['id']: trend for trend in trends},
+        }
+    
+    async def save(self, trends: List[Dict], parameters: Optional[Dict] = None) -> Optional[int]:
+        """
+        Store trends as a new snapshot and make it the latest.
+        
+        Trends without an ``id`` are given one, in place, so the ids in the
+        discover response match the read API. The snapshot only becomes the
+        latest once it is persisted; if the database write fails, readers
+        keep the previous snapshot.
+        
+        Returns:
+            The snapshot version, or None if there was nothing to store or
+            it could not be persisted
+        """
+        if not trends:
+            return None
+        for trend in trends:
+            if not trend.get('id'):
+                trend['id'] = new_trend_id()
+        
+        latest_version = self._latest['version'] if self._latest else 0
+        version = max(int(time.time() * 1000), latest_version + 1)
+        snapshot = {
+            '_id': version,
+            # As stored, so the feed is identical once reloaded from the database
+            'created_at': to_millis(datetime.utcnow()),
+            'count': len(trends),
+            'parameters': parameters or {},
+        }
+        trends = copy.deepcopy(trends)
+        
+        collection = self._collection()
+        if collection is not None:
+            try:
+                await collection.insert_many(
+                    [self._to_document(trend, version, rank) for rank, trend in enumerate(trends)],
+                    ordered=False
+                )
+                await self._collection(self.snapshots_collection_name).insert_one(snapshot)
+            except Exception as e:
+                logger.error(f"Failed to store trend snapshot {version}, keeping the previous one: {str(e)}")
+                await self._discard(version)
+                return None
+        
+        self._set_latest(snapshot, trends)
+        self._checked_at = time.monotonic()
+        logger.info(f"Published trend snapshot {version} with {len(trends)} trends")
+        
+        if collection is not None:
+            try:
+                await self._prune()
+            except Exception as e:
+                logger.warning(f"Failed to prune trend snapshots: {str(e)}")
+        return version
+    
+    async def _discard(self, version: int):
+        """Delete whatever was written of a snapshot that failed to store."""
+        try:
+            await self._collection().delete_many({'snapshotVersion': version})
+        except Exception as e:
+            logger.warning(f"Failed to clean up trend snapshot {version}: {str(e)}")
+    
+    async def _prune(self):
+        """Delete snapshots older than the newest ``retention``."""
+        snapshots = self._collection(self.snapshots_collection_name)
+        expired = [
+            doc['_id'] async for doc in
+            snapshots.find({}, {'_id': 1}).sort('_id', DESCENDING).skip(self.retention)
+        ]
+        if expired:
+            await self._collection().delete_many({'snapshotVersion': {'$in': expired}})
+            await snapshots.delete_many({'_id': {'$in': expired}})
+    
+    @property
+    def version(self) -> Optional[int]:
+        """Version of the latest snapshot known to this process, without a database check."""
+        return self._latest['version'] if self._latest else None
+    
+    async def latest(self) -> Optional[Dict]:
+        """
+        The latest snapshot: ``version``, ``created_at``, ``parameters``,
+        ``count``, ``trends`` (in rank order) and ``by_id``.
+        """
+        collection = self._collection()
+        if collection is None or time.monotonic() - self._checked_at < self.check_interval:
+            return self._latest
+        self._checked_at = time.monotonic()
+        try:
+            snapshot = await self._collection(self.snapshots_collection_name).find_one(sort=[('_id', DESCENDING)])
+            if snapshot and (self._latest is None or snapshot['_id'] != self._latest['version']):
+                docs = collection.find({'snapshotVersion': snapshot['_id']}).sort('rank', ASCENDING)
+                self._set_latest(snapshot, [self.to_trend(doc) async for doc in docs])
+        except Exception as e:
+            logger.warning(f"Failed to load the latest trend snapshot: {str(e)}")
+        return self._latest
+    
+    async def list_trends(
+        self,
+        status: Optional[str] = 'current',
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 50
+    ) -> tuple[Optional[Dict], List[Dict]]:
+        """Filtered trends of the latest snapshot; returns (snapshot, trends)."""
+        snapshot = await self.latest()
+        if snapshot is None:
+            return None, []
+        needle = search.lower() if search else None
+        trends = [
+            trend for trend in snapshot['trends']
+            if (not status or trend.get('status') == status)
+            and (not category or trend.get('trendCategory') == category)
+            and (
+                not needle
+                or needle in (trend.get('title') or '').lower()
+                or needle in (trend.get('headline') or '').lower()
+            )
+        ]
+        return snapshot, trends[:limit]
+    
+    async def history(
+        self,
+        limit: int = 50,
+        after: Optional[Tuple[Any, Any]] = None,
+        status: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[Tuple[Any, Any]]]:
+        """
+        One page of trends from all retained snapshots, newest first, by
+        keyset on (dateAdded, _id).
+        
+        ``after`` is the (dateAdded, _id) of the last trend of the previous
+        page. Returns the trends, each with its ``snapshotVersion``, and the
+        key to continue after, or None on the last page.
+        """
+        query = {}
+        if status:
+            query["status"] = status
+        if category:
+            query["trendCategory"] = category
+        collection = self._collection()
+        if collection is None:
+            trends = self._latest['trends'] if self._latest else []
+            docs = [
+                self._to_document(trend, self._latest['version'], rank)
+                for rank, trend in enumerate(trends)
+                if all(trend.get(key) == value for key, value in query.items())
+            ]
+            docs = page_in_memory(docs, "dateAdded", limit + 1, after)
+        else:
+            if after is not None:
+                query.update(keyset_filter("dateAdded", *after))
+            try:
+                cursor = collection.find(query).sort(keyset_sort("dateAdded")).limit(limit + 1)
+                docs = [doc async for doc in cursor]
+            except Exception as e:
+                logger.warning(f"Failed to page stored trends: {str(e)}")
+                return [], None
+        
+        more = len(docs) > limit
+        docs = docs[:limit]
+        next_key = (docs[-1].get("dateAdded"), docs[-1]["_id"]) if more else None
+        return [{**self.to_trend(doc), 'snapshotVersion': doc['snapshotVersion']} for doc in docs], next_key
+    
+    async def get_trend(self, trend_id: str) -> Optional[Dict]:
+        """A trend of the latest snapshot by id."""
+        snapshot = await self.latest()
+        if snapshot is None:
+            return None
+        return snapshot['by_id'].get(trend_id)
+
+
+# Global trend snapshot store
+trend_snapshots = TrendSnapshotStore(
+    retention=settings.trend_snapshot_retention,
+    check_interval=settings.trend_snapshot_check_seconds
+)
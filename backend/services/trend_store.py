@@ -0,0 +1,88 @@
+"""
+Persistent store of maintained trends.
+"""
+import logging
+import uuid
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, ReplaceOne
+
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+# Fields kept for incremental maintenance but not returned to API clients
+INTERNAL_FIELDS = ("_id", "centroid", "articleUrls")
+
+
+def new_trend_id() -> str:
+    """Generate a trend id."""
+    return f"trend-{uuid.uuid4().hex[:12]}"
+
+
+class TrendStore:
+    """
+    Maintained trends keyed by stable trend id in the ``tracked_trends``
+    MongoDB collection; published snapshots live in ``trends``.
+    
+    Besides the trend payload each document keeps the URLs of its member
+    articles and a sparse term centroid used to assign new articles.
+    Without a database connection trends are kept in memory.
+    """
+    
+    collection_name = "tracked_trends"
+    
+    def __init__(self):
+        self._local: Dict[str, Dict] = {}
+    
+    def _collection(self):
+        try:
+            return get_database()[self.collection_name]
+        except RuntimeError:
+            return None
+    
+    async def ensure_indexes(self):
+        """Create the indexes used by the read paths."""
+        collection = self._collection()
+        if collection is None:
+            return
+        await collection.create_index([("status", ASCENDING), ("dateAdded", DESCENDING)])
+    
+    @staticmethod
+    def to_trend(doc: Dict) -> Dict:
+        """Public trend payload of a stored document."""
+        trend = {key: value for key, value in doc.items() if key not in INTERNAL_FIELDS}
+        trend["id"] = doc["_id"]
+        return trend
+    
+    async def current(self) -> List[Dict]:
+        """All stored documents with status ``current``."""
+        collection = self._collection()
+        if collection is None:
+            return [dict(d) for d in self._local.values() if d.get("status") == "current"]
+        try:
+            return [doc async for doc in collection.find({"status": "current"})]
+        except Exception as e:
+            logger.warning(f"Failed to read stored trends: {str(e)}")
+            return []
+    
+    async def save_many(self, docs: List[Dict]):
+        """Upsert trend documents by id."""
+        if not docs:
+            return
+        collection = self._collection()
+        if collection is None:
+            for doc in docs:
+                self._local[doc["_id"]] = dict(doc)
+            return
+        try:
+            await collection.bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+                ordered=False
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store {len(docs)} trends: {str(e)}")
+
+
+# Global trend store
+trend_store = TrendStore()
@@ -0,0 +1,212 @@
+"""
+Incremental maintenance of persisted trends.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from scrapers.executor import run_in_parse_executor
+from services.clustering import HASH_DIM, article_terms, cluster_articles, dense_sum, term_vectors
+from services.trend_analyzer import TrendAnalyzer
+from services.trend_store import TrendStore, new_trend_id, trend_store
+
+logger = logging.getLogger(__name__)
+
+
+def _dense(centroid: Optional[Dict]) -> np.ndarray:
+    vector = np.zeros(HASH_DIM, dtype=np.float32)
+    if centroid:
+        vector[np.asarray(centroid['indices'], dtype=np.int64)] = centroid['weights']
+    return vector
+
+
+class TrendTracker:
+    """
+    Keeps stored trends up to date instead of rediscovering them every run.
+    
+    Articles not yet attached to a trend are matched against each current
+    trend by cosine similarity to its term centroid blended with keyword
+    overlap. Matched articles join the trend, whose sources and computed
+    scores are refreshed. The remaining articles are clustered, and only
+    clusters that look like new trends (enough articles from more than one
+    source) go to the model, in a single analysis call. Trends keep their
+    id across runs; trends with no articles left in the lookback window
+    are archived.
+    """
+    
+    # Assignment score = centroid_weight * cosine + (1 - centroid_weight) * keyword overlap
+    centroid_weight = 0.7
+    assign_threshold = 0.3
+    # An unassigned cluster counts as a candidate new trend at this size and source count
+    new_trend_min_articles = 3
+    new_trend_min_sources = 2
+    # Non-zero terms kept per stored centroid
+    centroid_terms = 256
+    
+    def __init__(self, analyzer: TrendAnalyzer, store: TrendStore = trend_store):
+        self.analyzer = analyzer
+        self.store = store
+        self.last_run_stats: Dict = {}
+        # Updates read, modify and write the whole trend set, so they run one at a time
+        self._lock = asyncio.Lock()
+    
+    def _sparse(self, vector: np.ndarray) -> Dict:
+        """Keep the strongest terms of a centroid, renormalized."""
+        top = np.argsort(-vector)[:self.centroid_terms]
+        top = top[vector[top] > 0]
+        weights = vector[top]
+        norm = np.linalg.norm(weights) or 1.0
+        return {'indices': top.tolist(), 'weights': (weights / norm).tolist()}
+    
+    def _assign(self, docs: List[Dict], articles: List[Dict]) -> np.ndarray:
+        """Index of the best matching trend per article, or -1."""
+        if not docs or not articles:
+            return np.full(len(articles), -1)
+        similarity = term_vectors(articles) @ np.stack([_dense(d.get('centroid')) for d in docs]).T
+        
+        terms = [article_terms(a) for a in articles]
+        keyword_sets = [
+            [k.lower() for k in d.get('keywords', []) if isinstance(k, str) and k.strip()]
+            for d in docs
+        ]
+        overlap = np.array([
+            [
+                sum(1 for k in keywords if k in article or all(w in article for w in k.split())) / len(keywords)
+                if keywords else 0.0
+                for keywords in keyword_sets
+            ]
+            for article in terms
+        ])
+        score = self.centroid_weight * similarity + (1 - self.centroid_weight) * overlap
+        best = score.argmax(axis=1)
+        return np.where(score[np.arange(len(articles)), best] >= self.assign_threshold, best, -1)
+    
+    async def _create_trends(self, articles: List[Dict], top_n: int) -> tuple[List[Dict], int]:
+        """Analyze unassigned clusters that look like new trends; returns (docs, analysis calls)."""
+        if len(articles) < self.new_trend_min_articles:
+            return [], 0
+        clusters = await run_in_parse_executor(cluster_articles, articles)
+        candidates = [
+            c for c in clusters
+            if c['size'] >= self.new_trend_min_articles and len(c['sources']) >= self.new_trend_min_sources
+        ]
+        if not candidates:
+            return [], 0
+        
+        candidate_articles = [articles[i] for c in candidates for i in c['members']]
+        trends = await self.analyzer.analyze_articles_for_trends(
+            candidate_articles,
+            top_n=min(top_n, len(candidates))
+        )
+        
+        docs = []
+        now = datetime.utcnow().isoformat()
+        cluster_urls = [{articles[i]['url'] for i in c['members']} for c in candidates]
+        for trend in trends:
+            source_urls = {s.get('url') for s in trend.get('additionalSources', [])}
+            # Members: the candidate cluster the trend draws on most, plus its cited articles
+            best = max(range(len(candidates)), key=lambda c: len(cluster_urls[c] & source_urls))
+            members = cluster_urls[best] | (source_urls & {a['url'] for a in candidate_articles})
+            trend.pop('id', None)
+            docs.append({
+                **trend,
+                '_id': new_trend_id(),
+                'lastUpdated': now,
+                'articleUrls': sorted(members),
+            })
+        return docs, 1
+    
+    async def update(self, articles: List[Dict], top_n: int = 10) -> List[Dict]:
+        """
+        Fold new articles into stored trends and return the top current trends.
+        
+        Args:
+            articles: Recent articles (the lookback window), deduplicated
+            top_n: Number of trends to return (and most new trends to create)
+        
+        Returns:
+            Current trends with stable ``id`` fields, most supported first
+        """
+        async with self._lock:
+            return await self._update(articles, top_n)
+    
+    async def _update(self, articles: List[Dict], top_n: int) -> List[Dict]:
+        started = time.monotonic()
+        articles = [a for a in articles if a.get('url')]
+        by_url = {a['url']: a for a in articles}
+        docs = await self.store.current()
+        known = {url for doc in docs for url in doc.get('articleUrls', [])}
+        new_articles = [a for a in articles if a['url'] not in known]
+        
+        assignment = self._assign(docs, new_articles)
+        vectors = term_vectors(new_articles) if len(new_articles) else None
+        now = datetime.utcnow().isoformat()
+        updated = set()
+        for t, doc in enumerate(docs):
+            joined = np.flatnonzero(assignment == t)
+            if not len(joined):
+                continue
+            count = max(1, len(doc.get('articleUrls', [])))
+            centroid = _dense(doc.get('centroid')) * count + dense_sum(vectors[joined])
+            doc['centroid'] = self._sparse(centroid)
+            doc['articleUrls'] = sorted(set(doc.get('articleUrls', [])) | {new_articles[i]['url'] for i in joined})
+            doc['lastUpdated'] = now
+            updated.add(doc['_id'])
+        
+        unassigned = [a for a, t in zip(new_articles, assignment) if t < 0]
+        created, analysis_calls = await self._create_trends(unassigned, top_n)
+        for doc in created:
+            members = [by_url[url] for url in doc['articleUrls']]
+            doc['centroid'] = self._sparse(dense_sum(term_vectors(members)) / len(members))
+        
+        # Refresh sources and scores from the members still inside the window
+        live, live_members, archived = [], [], 0
+        for doc in docs + created:
+            members = sorted(
+                (by_url[url] for url in doc['articleUrls'] if url in by_url),
+                key=lambda a: a.get('published_date') or '',
+                reverse=True
+            )
+            if not members:
+                doc['status'] = 'archived'
+                doc['lastUpdated'] = now
+                archived += 1
+                continue
+            doc['articleUrls'] = [a['url'] for a in members]
+            doc['articleCount'] = len(members)
+            live.append(doc)
+            live_members.append(members)
+        
+        # Number all supporting articles once so every trend is scored in one pass
+        supporting_articles = []
+        for doc, members in zip(live, live_members):
+            start = len(supporting_articles) + 1
+            doc['sourceArticleNumbers'] = list(range(start, start + len(members)))
+            supporting_articles.extend(members)
+        references = [self.analyzer.source_reference(i, a) for i, a in enumerate(supporting_articles, 1)]
+        self.analyzer.attach_sources(
+            live, references, supporting_articles,
+            max_sources=self.analyzer.max_sources_per_trend
+        )
+        
+        await self.store.save_many(docs + created)
+        
+        live.sort(key=lambda d: d['articleCount'], reverse=True)
+        self.last_run_stats = {
+            'existing_trends': len(docs),
+            'new_articles': len(new_articles),
+            'assigned': int((assignment >= 0).sum()),
+            'unassigned': len(unassigned),
+            'updated_trends': len(updated),
+            'created_trends': len(created),
+            'archived_trends': archived,
+            'analysis_calls': analysis_calls,
+            'duration_ms': round((time.monotonic() - started) * 1000),
+            'timestamp': now,
+        }
+        logger.info(f"Incremental trend update: {self.last_run_stats}")
+        return [self.store.to_trend(doc) for doc in live[:top_n]]
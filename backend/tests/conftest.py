@@ -0,0 +1,9 @@
+"""
+Shared test setup: required settings get placeholder values, so the
+tests run without a .env; no test connects to MongoDB or OpenAI.
+"""
+import os
+
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
@@ -0,0 +1,51 @@
+"""
+Tests for feed discovery caching.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import socket
+
+from aiohttp import web
+
+from services.trend_scraper_service import TrendScraperService
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def homepage(request: web.Request) -> web.Response:
+    return web.Response(text="<html><body>No feed</body></html>", content_type="text/html")
+
+
+def test_no_feed_found_is_cached():
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", homepage)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        port = free_port()
+        await web.TCPSite(runner, "127.0.0.1", port).start()
+        try:
+            service = TrendScraperService()
+            url = f"http://127.0.0.1:{port}/"
+            assert await service._resolve_feed("Blog", url, "test-agent") is None
+            entry = await service.feed_discovery_cache.get(url)
+            assert entry is not None and entry["feed_url"] is None
+        finally:
+            await runner.cleanup()
+    
+    asyncio.run(run())
+
+
+def test_unreachable_source_is_not_cached():
+    async def run():
+        service = TrendScraperService()
+        url = f"http://127.0.0.1:{free_port()}/"
+        assert await service._resolve_feed("Blog", url, "test-agent") is None
+        assert await service.feed_discovery_cache.get(url) is None
+    
+    asyncio.run(run())
@@ -0,0 +1,83 @@
+"""
+Tests for the RSS scraper's conditional GET cache.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import hashlib
+from typing import List
+
+from aiohttp import web
+
+from scrapers.rss_scraper import RSSFeedScraper
+from scrapers.seen_index import seen_index
+
+
+def rss(links: List[str]) -> bytes:
+    items = "".join(
+        f"<item><title>Post {link}</title><link>https://example.com/{link}</link>"
+        f"<description>About {link}</description></item>"
+        for link in links
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Blog</title>{items}</channel></rss>'.encode()
+
+
+class FeedServer:
+    """Serves one feed whose body can be swapped, answering 304 to a matching If-None-Match."""
+    
+    def __init__(self, body: bytes):
+        self.body = body
+        self.runner = None
+        self.url = None
+    
+    async def _feed(self, request: web.Request) -> web.Response:
+        etag = f'"{hashlib.sha256(self.body).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(body=self.body, content_type="application/rss+xml", headers={"ETag": etag})
+    
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/feed.xml", self._feed)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/feed.xml"
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+async def scrape(url: str, skip_seen: bool = False) -> List[str]:
+    async with RSSFeedScraper("Blog", "https://example.com", url, "test-agent") as scraper:
+        articles = await scraper.scrape_articles(max_articles=10, skip_seen=skip_seen)
+        await seen_index.mark_seen("Blog", scraper.unseen)
+    return [article.url.rsplit("/", 1)[-1] for article in articles]
+
+
+def test_full_scrape_after_new_only_poll_sees_changed_feed():
+    async def run():
+        async with FeedServer(rss(["a", "b"])) as server:
+            assert await scrape(server.url) == ["a", "b"]
+            
+            # A scheduler poll picks up the changed feed and stores its ETag
+            server.body = rss(["c", "a", "b"])
+            assert await scrape(server.url, skip_seen=True) == ["c"]
+            
+            # The next full scrape gets a 304 and must serve the new entries
+            assert await scrape(server.url) == ["c", "a", "b"]
+    
+    asyncio.run(run())
+
+
+def test_unchanged_feed_serves_cached_articles():
+    async def run():
+        async with FeedServer(rss(["x", "y"])) as server:
+            assert await scrape(server.url) == ["x", "y"]
+            assert await scrape(server.url, skip_seen=True) == []
+            assert await scrape(server.url) == ["x", "y"]
+    
+    asyncio.run(run())
@@ -0,0 +1,116 @@
+"""
+Tests for how TrendAnalyzer plans an analysis (single pass, clusters or
+map-reduce). Model calls are answered by a fake ``create_chat_completion``.
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+import json
+import re
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+
+from config import settings
+from services import trend_analyzer as analyzer_module
+from services.trend_analyzer import CANDIDATE_SYSTEM_PROMPT, TrendAnalyzer
+
+TOPICS = ["robotics", "chips", "agents", "regulation", "healthcare", "open models", "search", "energy"]
+
+
+def make_articles(count: int) -> List[Dict]:
+    now = datetime.utcnow()
+    articles = []
+    for i in range(count):
+        topic = TOPICS[i % len(TOPICS)]
+        articles.append({
+            "title": f"{topic.title()} update {i}",
+            "url": f"https://example.com/{i}",
+            "source": f"Source {i % 5}",
+            "published_date": (now - timedelta(hours=i)).isoformat(),
+            "summary": " ".join(f"{topic} news sentence {j} about {topic} progress." for j in range(40)),
+        })
+    return articles
+
+
+def completion(body: Dict) -> SimpleNamespace:
+    message = SimpleNamespace(content=json.dumps(body))
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def model_calls(monkeypatch) -> List[str]:
+    """Record the kind of every model call and answer it like the model would."""
+    calls = []
+    
+    async def fake_completion(timeout=None, **kwargs):
+        system, user = kwargs["messages"][0]["content"], kwargs["messages"][1]["content"]
+        if system == CANDIDATE_SYSTEM_PROMPT:
+            calls.append("map")
+            first = int(re.search(r"\[Article (\d+)\]", user).group(1))
+            return completion({"candidates": [{
+                "headline": f"Candidate from article {first}",
+                "keywords": ["ai"],
+                "trendCategory": "Technology",
+                "summary": "Something is happening.",
+                "sourceArticleNumbers": [first],
+            }]})
+        if "candidateIds" in user:
+            calls.append("reduce")
+            return completion({"trends": [{"title": "Merged", "headline": "Merged trend", "candidateIds": [1, 2]}]})
+        if "clusterIds" in user:
+            calls.append("clustered")
+            return completion({"trends": [{"title": "Clustered", "headline": "Clustered trend", "clusterIds": [1]}]})
+        calls.append("single_pass")
+        return completion({"trends": [{"title": "Single", "headline": "Single trend", "sourceArticleNumbers": [1]}]})
+    
+    monkeypatch.setattr(analyzer_module, "create_chat_completion", fake_completion)
+    return calls
+
+
+def analyze(analyzer: TrendAnalyzer, articles: List[Dict]) -> List[Dict]:
+    return asyncio.run(analyzer.analyze_articles_for_trends(articles, top_n=3, use_cache=False))
+
+
+def test_map_reduce_when_articles_exceed_budget(monkeypatch, model_calls):
+    monkeypatch.setattr(settings, "trend_clustering_enabled", False)
+    monkeypatch.setattr(settings, "trend_input_token_budget", 800)
+    analyzer = TrendAnalyzer()
+    analyzer.map_chunk_tokens = 3000
+    
+    trends = analyze(analyzer, make_articles(24))
+    
+    assert analyzer.last_run_stats["mode"] == "map_reduce"
+    assert analyzer.last_run_stats["articles_sent"] == 24
+    chunks = analyzer.last_run_stats["prompts"]
+    assert chunks > 1
+    assert model_calls == ["map"] * chunks + ["reduce"]
+    # Candidate ids resolve to the articles the candidates cited
+    assert [trend["title"] for trend in trends] == ["Merged"]
+    assert len(trends[0]["additionalSources"]) == 2
+
+
+def test_clusters_over_budget_fall_back_to_map_reduce(monkeypatch, model_calls):
+    monkeypatch.setattr(settings, "trend_clustering_enabled", True)
+    monkeypatch.setattr(settings, "trend_input_token_budget", 600)
+    analyzer = TrendAnalyzer()
+    
+    analyze(analyzer, make_articles(64))
+    
+    assert analyzer.last_run_stats["mode"] == "map_reduce"
+    assert model_calls[-1] == "reduce"
+    assert "clustered" not in model_calls
+
+
+def test_clusters_within_budget_use_one_prompt(monkeypatch, model_calls):
+    monkeypatch.setattr(settings, "trend_clustering_enabled", True)
+    monkeypatch.setattr(settings, "trend_input_token_budget", 24000)
+    analyzer = TrendAnalyzer()
+    
+    trends = analyze(analyzer, make_articles(64))
+    
+    assert analyzer.last_run_stats["mode"] == "clustered"
+    assert model_calls == ["clustered"]
+    assert trends[0]["additionalSources"]
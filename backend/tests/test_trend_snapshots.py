@@ -0,0 +1,45 @@
+"""
+Tests for trend snapshot history paging (in-memory fallback, no database).
+
+Run from the backend directory: python -m pytest tests
+"""
+import asyncio
+
+from services.pagination import decode_cursor, encode_cursor
+from services.trend_snapshots import TrendSnapshotStore
+
+# Mixed precision and suffixes: compared as strings these would misorder
+DATES = [
+    "2026-10-17T12:00:00",
+    "2026-10-17T12:00:00.500000",
+    "2026-10-17T12:00:00.0405",
+    "2026-10-17T11:59:59.999999",
+    "2026-10-17T12:00:01Z",
+    "2026-10-17T12:00:00.5",
+    None,
+]
+
+
+def test_history_pages_by_time_without_repeats():
+    async def run():
+        store = TrendSnapshotStore()
+        trends = [{"id": f"t{i}", "title": f"Trend {i}", "dateAdded": date} for i, date in enumerate(DATES)]
+        await store.save(trends)
+        
+        pages, after = [], None
+        while True:
+            page, next_key = await store.history(limit=2, after=after)
+            pages += page
+            if not next_key:
+                break
+            # Round-trip the cursor as clients do
+            after = decode_cursor(encode_cursor("dateAdded", *next_key), "dateAdded")
+        return pages
+    
+    pages = asyncio.run(run())
+    ids = [trend["id"] for trend in pages]
+    assert len(ids) == len(set(ids)) == len(DATES)
+    # Newest first: 12:00:01, the two 12:00:00.5 (tie broken by id), .040, 12:00:00, 11:59:59.999, then undated
+    assert ids == ["t4", "t5", "t1", "t2", "t0", "t3", "t6"]
+    assert pages[0]["dateAdded"] == "2026-10-17T12:00:01"
+    assert "rank" not in pages[0] and pages[0]["snapshotVersion"]
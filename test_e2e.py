@@ -351,6 +351,333 @@ def test_frontend_pages():
     return all(results)
 
 
+# ============================================================================
+# TRENDS SERVICE TESTS
+# ============================================================================
+
+def test_responsive_during_discover():
+    """Test that other endpoints keep responding while a discover is in flight"""
+    print_test("Backend Responsive During Trend Discovery")
+    
+    import threading
+    
+    discover_result = {}
+    
+    def run_discover():
+        try:
+            response = requests.post(f"{BACKEND_URL}/api/trends/discover?top_n=3", timeout=600)
+            discover_result['status'] = response.status_code
+        except Exception as e:
+            discover_result['error'] = str(e)
+    
+    try:
+        thread = threading.Thread(target=run_discover)
+        thread.start()
+        time.sleep(1)  # let the discover reach scraping/analysis
+        
+        latencies = []
+        while thread.is_alive() and len(latencies) < 20:
+            start = time.time()
+            response = requests.get(f"{BACKEND_URL}/healthz", timeout=10)
+            latencies.append((time.time() - start) * 1000)
+            if response.status_code != 200:
+                print_error(f"Health check returned {response.status_code} during discover")
+                return False
+            time.sleep(0.5)
+        
+        thread.join()
+        
+        if not latencies:
+            print_info("Discover finished before any health check ran; nothing to measure")
+            return True
+        
+        worst = max(latencies)
+        print_info(f"Health checks during discover: {len(latencies)}, worst latency {worst:.0f} ms")
+        print_info(f"Discover result: {discover_result}")
+        
+        if worst < 1000:
+            print_success("Backend stayed responsive while discover was running")
+            return True
+        else:
+            print_error("Health checks stalled while discover was running")
+            return False
+            
+    except Exception as e:
+        print_error(f"Responsiveness test error: {str(e)}")
+        return False
+
+
+def test_discover_coalescing(concurrency: int = 10):
+    """Test that concurrent identical discover requests share one scrape and one analysis"""
+    print_test(f"Discover Request Coalescing ({concurrency} concurrent callers)")
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # A top_n not used recently, so the analysis is not served from the trend cache
+    top_n = 3 + int(time.time()) % 7
+    
+    def discover():
+        response = requests.post(f"{BACKEND_URL}/api/trends/discover?top_n={top_n}&lookback_days=7", timeout=600)
+        return response.status_code, response.json()
+    
+    try:
+        before = requests.get(f"{BACKEND_URL}/api/trends/stats", timeout=10).json()
+        
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: discover(), range(concurrency)))
+        elapsed = time.time() - start
+        
+        after = requests.get(f"{BACKEND_URL}/api/trends/stats", timeout=10).json()
+        
+        def delta(section: str, key: str) -> int:
+            return after[section][key] - before[section][key]
+        
+        coalesced = delta("discover", "coalesced")
+        article_loads = delta("runs", "article_loads")
+        scrapes = delta("runs", "scrapes")
+        model_calls = delta("model_calls", "calls")
+        cache_hits = delta("trend_cache", "memory_hits") + delta("trend_cache", "store_hits")
+        
+        # With the scheduler on, articles come from the store instead of a scrape;
+        # map-reduce analysis makes one call per chunk plus the reduce call
+        expected_scrapes = 0 if after["scheduler"] is not None else 1
+        analysis = after["last_analysis"]
+        expected_calls = analysis["prompts"] + 1 if analysis.get("mode") == "map_reduce" else 1
+        
+        print_info(f"{concurrency} requests finished in {elapsed:.1f}s, {coalesced} coalesced")
+        print_info(f"Article collections: {article_loads}, scrape runs: {scrapes}, model calls: {model_calls}")
+        
+        statuses = {code for code, _ in results}
+        if statuses != {200}:
+            print_error(f"Unexpected status codes: {statuses}")
+            return False
+        if cache_hits:
+            print_error("The analysis was served from the trend cache, so model calls cannot be checked; rerun later")
+            return False
+        
+        counts = {body["count"] for _, body in results}
+        if (
+            article_loads == 1
+            and scrapes == expected_scrapes
+            and model_calls == expected_calls
+            and len(counts) == 1
+        ):
+            print_success("All callers shared a single scrape and analysis")
+            return True
+        else:
+            print_error(
+                f"Expected 1 article collection, {expected_scrapes} scrape(s) and {expected_calls} model call(s), "
+                f"got {article_loads}, {scrapes} and {model_calls}"
+            )
+            return False
+            
+    except Exception as e:
+        print_error(f"Coalescing test error: {str(e)}")
+        return False
+
+
+def test_discover_streaming():
+    """Test that streamed discovery delivers trends before the run completes"""
+    print_test("Streamed Trend Discovery")
+    
+    try:
+        start = time.time()
+        first_at = None
+        trends = []
+        with requests.post(
+            f"{BACKEND_URL}/api/trends/discover?top_n=3&lookback_days=7&stream=true",
+            stream=True,
+            timeout=600
+        ) as response:
+            if response.status_code != 200:
+                print_error(f"Unexpected status code: {response.status_code}")
+                return False
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                if first_at is None:
+                    first_at = time.time() - start
+                trends.append(json.loads(line))
+        elapsed = time.time() - start
+        
+        if not trends:
+            print_error("No trends streamed")
+            return False
+        
+        print_info(f"First trend after {first_at:.1f}s, {len(trends)} trends after {elapsed:.1f}s")
+        if all(t.get("sourceUrl") and "heatMapScores" in t for t in trends):
+            print_success("Streamed trends carry sources and scores")
+            return True
+        else:
+            print_error("Streamed trends are missing sources or scores")
+            return False
+            
+    except Exception as e:
+        print_error(f"Streaming test error: {str(e)}")
+        return False
+
+
+def test_trend_listing():
+    """Test that trends are served from the latest discover snapshot"""
+    print_test("Trend Listing From Snapshot")
+    
+    try:
+        start = time.time()
+        response = requests.get(f"{BACKEND_URL}/api/trends", timeout=10)
+        elapsed_ms = (time.time() - start) * 1000
+        if response.status_code != 200:
+            print_error(f"Unexpected status code: {response.status_code}")
+            return False
+        
+        data = response.json()
+        if not data["trends"]:
+            print_error("No published snapshot (run discover first)")
+            return False
+        print_info(f"{data['count']} trends from snapshot {data['snapshot']['version']} in {elapsed_ms:.0f}ms")
+        
+        revalidated = requests.get(
+            f"{BACKEND_URL}/api/trends",
+            headers={"If-None-Match": response.headers["ETag"]},
+            timeout=10
+        )
+        if revalidated.status_code != 304 or revalidated.content:
+            print_error(f"Expected an empty 304 for a matching ETag, got {revalidated.status_code}")
+            return False
+        
+        trend_id = data["trends"][0]["id"]
+        detail = requests.get(f"{BACKEND_URL}/api/trends/{trend_id}", timeout=10)
+        missing = requests.get(f"{BACKEND_URL}/api/trends/trend-does-not-exist", timeout=10)
+        if detail.status_code == 200 and detail.json()["id"] == trend_id and missing.status_code == 404:
+            print_success("Trend listing and detail served from snapshot")
+            return True
+        else:
+            print_error(f"Detail lookup failed: {detail.status_code}, missing trend: {missing.status_code}")
+            return False
+            
+    except Exception as e:
+        print_error(f"Trend listing test error: {str(e)}")
+        return False
+
+
+def test_discover_job(timeout: float = 600):
+    """Test that background discovery returns a job id at once and reports progress"""
+    print_test("Background Discover Job")
+    
+    try:
+        start = time.time()
+        response = requests.post(f"{BACKEND_URL}/api/trends/discover?top_n=3&lookback_days=7&background=true", timeout=10)
+        if response.status_code != 202:
+            print_error(f"Unexpected status code: {response.status_code}")
+            return False
+        submitted = response.json()
+        print_info(f"Job {submitted['job_id']} accepted in {time.time() - start:.2f}s")
+        
+        duplicate = requests.post(f"{BACKEND_URL}/api/trends/discover?top_n=3&lookback_days=7&background=true", timeout=10).json()
+        if duplicate["job_id"] != submitted["job_id"]:
+            print_error("Duplicate submission started a second job")
+            return False
+        
+        stages_seen = []
+        while time.time() - start < timeout:
+            job = requests.get(f"{BACKEND_URL}{submitted['status_url']}", timeout=10).json()
+            if job["stage"] and job["stage"] not in stages_seen:
+                stages_seen.append(job["stage"])
+                print_info(f"Stage: {job['stage']}")
+            if job["status"] in ("succeeded", "failed"):
+                break
+            time.sleep(2)
+        
+        timings = ", ".join(f"{s['name']} {s['duration_ms']}ms" for s in job["stages"])
+        print_info(f"Stage timings: {timings}")
+        if job["status"] == "succeeded":
+            print_success(f"Job finished with {job['result']['count']} trends")
+            return True
+        else:
+            print_error(f"Job did not succeed: {job['status']} {job.get('error')}")
+            return False
+            
+    except Exception as e:
+        print_error(f"Discover job test error: {str(e)}")
+        return False
+
+
+def test_article_pagination(page_size: int = 20, max_pages: int = 5):
+    """Test that cursor pages of stored articles neither overlap nor go out of order"""
+    print_test("Article Cursor Pagination")
+    
+    try:
+        urls = []
+        dates = []
+        cursor = None
+        for _ in range(max_pages):
+            params = {"limit": page_size}
+            if cursor:
+                params["cursor"] = cursor
+            start = time.time()
+            data = requests.get(f"{BACKEND_URL}/api/trends/articles", params=params, timeout=10).json()
+            print_info(f"Page of {data['count']} articles in {(time.time() - start) * 1000:.0f}ms")
+            urls.extend(a["url"] for a in data["articles"])
+            dates.extend(a.get("published_date") or "" for a in data["articles"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        if len(urls) != len(set(urls)):
+            print_error("Pages returned the same article twice")
+            return False
+        if dates != sorted(dates, reverse=True):
+            print_error("Articles are not newest first across pages")
+            return False
+        
+        invalid = requests.get(f"{BACKEND_URL}/api/trends/articles", params={"cursor": "not-a-cursor"}, timeout=10)
+        if invalid.status_code != 400:
+            print_error(f"Expected 400 for an invalid cursor, got {invalid.status_code}")
+            return False
+        
+        print_success(f"{len(urls)} articles paged without overlap")
+        return True
+            
+    except Exception as e:
+        print_error(f"Pagination test error: {str(e)}")
+        return False
+
+
+def test_scrape_pagination(page_size: int = 10, max_pages: int = 5):
+    """Test that the cursor of a limited scrape continues into stored articles without repeats"""
+    print_test("Scrape Cursor Continues Into Stored Articles")
+    
+    try:
+        response = requests.post(f"{BACKEND_URL}/api/trends/scrape", params={"limit": page_size}, timeout=300)
+        data = response.json()
+        urls = [a["url"] for a in data["articles"]]
+        cursor = data["next_cursor"]
+        print_info(f"Scrape returned {len(urls)} articles, next_cursor={'yes' if cursor else 'no'}")
+        
+        for _ in range(max_pages):
+            if not cursor:
+                break
+            page = requests.get(
+                f"{BACKEND_URL}/api/trends/articles",
+                params={"limit": page_size, "cursor": cursor},
+                timeout=10
+            ).json()
+            urls.extend(a["url"] for a in page["articles"])
+            cursor = page["next_cursor"]
+        
+        duplicates = len(urls) - len(set(urls))
+        if duplicates:
+            print_error(f"{duplicates} articles repeated across the scrape page and stored pages")
+            return False
+        
+        print_success(f"{len(urls)} articles paged from the scrape cursor without repeats")
+        return True
+            
+    except Exception as e:
+        print_error(f"Scrape pagination test error: {str(e)}")
+        return False
+
+
 # ============================================================================
 # MAIN TEST RUNNER
 # ============================================================================
@@ -402,6 +729,16 @@ def main():
             # Logout
             results.append(("User Logout", test_logout(token)))
     
+    # Phase 4: Trends Service
+    print_header("PHASE 4: TRENDS SERVICE")
+    results.append(("Responsive During Discover", test_responsive_during_discover()))
+    results.append(("Discover Coalescing", test_discover_coalescing()))
+    results.append(("Discover Streaming", test_discover_streaming()))
+    results.append(("Trend Listing", test_trend_listing()))
+    results.append(("Discover Job", test_discover_job()))
+    results.append(("Article Pagination", test_article_pagination()))
+    results.append(("Scrape Pagination", test_scrape_pagination()))
+    
     # Print Final Summary
     print_header("TEST SUMMARY")
     